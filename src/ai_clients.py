@@ -0,0 +1,68 @@
+"""
+OpenAI / Gemini 클라이언트 지연 생성
+
+SDK는 import만 해도 수백 ms가 걸리므로, 모듈 수준에서 클라이언트를 만들지 않고
+처음 필요할 때 SDK를 import해서 만든 클라이언트를 프로세스 안에서 재사용합니다.
+
+AsyncOpenAI는 커넥션이 이벤트 루프에 묶이므로 async_http와 같이 루프마다 하나씩 만듭니다.
+
+사용 방법:
+    from ai_clients import get_openai_client, get_gemini_client
+
+    response = get_openai_client().responses.create(...)
+    response = get_gemini_client().models.generate_content(...)
+    response = await get_async_openai_client().responses.create(...)
+"""
+
+import asyncio
+import threading
+
+from config import get_env
+
+_openai_client = None
+_gemini_client = None
+_async_openai_clients = {}
+_lock = threading.Lock()
+
+
+def get_openai_client():
+    """공용 OpenAI 클라이언트 반환 (처음 호출 시 생성)"""
+    global _openai_client
+    if _openai_client is None:
+        with _lock:
+            if _openai_client is None:
+                from openai import OpenAI
+                _openai_client = OpenAI(api_key=get_env("OPENAI_API_KEY"))
+    return _openai_client
+
+
+def get_gemini_client():
+    """공용 Gemini 클라이언트 반환 (처음 호출 시 생성)"""
+    global _gemini_client
+    if _gemini_client is None:
+        with _lock:
+            if _gemini_client is None:
+                from google import genai
+                _gemini_client = genai.Client(api_key=get_env("GOOGLE_API_KEY"))
+    return _gemini_client
+
+
+def get_async_openai_client():
+    """현재 이벤트 루프에서 공유하는 AsyncOpenAI 클라이언트 반환 (처음 호출 시 생성)"""
+    loop = asyncio.get_running_loop()
+    client = _async_openai_clients.get(loop)
+    if client is None:
+        # 이미 끝난 루프의 클라이언트는 정리
+        for old_loop in [l for l in _async_openai_clients if l.is_closed()]:
+            del _async_openai_clients[old_loop]
+        from openai import AsyncOpenAI
+        client = AsyncOpenAI(api_key=get_env("OPENAI_API_KEY"))
+        _async_openai_clients[loop] = client
+    return client
+
+
+async def close_async_openai_client():
+    """현재 이벤트 루프의 AsyncOpenAI 클라이언트 닫기"""
+    client = _async_openai_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
@@ -0,0 +1,82 @@
+"""
+공용 비동기 HTTP 클라이언트 (httpx)
+
+여러 요청을 동시에 보내야 할 때 사용합니다.
+http_session.py의 비동기 버전으로, 이벤트 루프마다 httpx.AsyncClient 하나를
+공유해서 커넥션을 재사용합니다.
+
+사용 방법:
+    from async_http import gather_limited, get_async_client
+
+    client = get_async_client()
+    response = await client.get(url, params=params)
+
+    # 동시 실행 개수를 10개로 제한해서 fan-out
+    results = await gather_limited(fetch, items, concurrency=10)
+"""
+
+import asyncio
+
+from lazy_import import lazy_import
+
+# httpx는 비동기 클라이언트를 처음 만들 때 import
+httpx = lazy_import('httpx')
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE = 20
+DEFAULT_CONCURRENCY = 10
+
+_clients = {}
+
+
+def create_async_client(
+    timeout=DEFAULT_TIMEOUT,
+    max_connections=DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections=DEFAULT_MAX_KEEPALIVE,
+    retries=3,
+):
+    """커넥션 풀과 연결 재시도가 설정된 httpx.AsyncClient 생성"""
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+    )
+    transport = httpx.AsyncHTTPTransport(limits=limits, retries=retries)
+    return httpx.AsyncClient(timeout=timeout, transport=transport)
+
+
+def get_async_client():
+    """현재 이벤트 루프에서 공유하는 AsyncClient 반환 (처음 호출 시 생성)
+
+    AsyncClient의 커넥션은 생성된 이벤트 루프에 묶이므로 루프별로 하나씩 만듭니다.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        # 이미 끝난 루프의 클라이언트는 정리
+        for old_loop in [l for l in _clients if l.is_closed()]:
+            del _clients[old_loop]
+        client = create_async_client()
+        _clients[loop] = client
+    return client
+
+
+async def close_async_client():
+    """현재 이벤트 루프의 공유 클라이언트 닫기"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def gather_limited(func, items, concurrency=DEFAULT_CONCURRENCY):
+    """items 각각에 대해 func(item)을 동시에 실행 (최대 concurrency개)
+
+    결과는 items와 같은 순서의 리스트로 반환합니다.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(item):
+        async with semaphore:
+            return await func(item)
+
+    return await asyncio.gather(*(run(item) for item in items))
@@ -0,0 +1,107 @@
+"""
+import 시간 벤치마크
+
+워커 프로세스가 사용하는 모듈을 새 인터프리터에서 import하는 데 걸리는 시간을
+python -X importtime 출력으로 측정합니다.
+모듈마다 따로 측정하므로 앞에서 import한 의존성이 뒤 모듈의 시간에서 빠지지 않습니다.
+
+- 모듈별: 그 모듈 하나를 import하는 데 걸린 시간 (의존성 포함)
+- 전체: 모든 모듈을 한 번에 import하는 데 걸린 시간과 가장 무거운 의존성
+
+실행 방법:
+    python src/bench_import_time.py
+    python src/bench_import_time.py --runs 10 openweathermap currncy
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent
+
+# 워커가 import하는 모듈 (import할 때 네트워크 요청이나 SDK 클라이언트 생성이 없어야 함)
+WORKER_MODULES = [
+    'openweathermap',
+    'currncy',
+    'news',
+    'github',
+    'github_batch',
+    'kakao_api',
+    'keywords',
+    'openai_text',
+    'openai_chat',
+    'openai_image',
+    'gemini_text',
+    'gemini_chat',
+    'gemini_image',
+]
+
+
+def import_times(modules):
+    """새 인터프리터에서 modules를 import하고 (모듈별 누적 ms, 의존성별 누적 ms) 반환
+
+    의존성은 modules 중 하나가 직접 import한 패키지만 포함합니다.
+    (인터프리터 시작 시 site가 import하는 패키지는 제외)
+    """
+    code = 'import ' + ', '.join(modules)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    dependencies = {}
+    pending = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        ms = int(cumulative) / 1000
+
+        # 하위 모듈이 먼저 출력되고 그 모듈을 import한 상위 모듈이 나중에 출력됨
+        if depth == 1:
+            pending[name] = ms
+        elif depth == 0:
+            if name in modules:
+                times[name] = ms
+                dependencies.update(pending)
+            pending = {}
+    return times, dependencies
+
+
+def measure(modules, runs):
+    """runs번 측정한 전체 시간의 중앙값 (파일 캐시 효과를 빼기 위해 한 번 먼저 실행)"""
+    import_times(modules)
+    samples = [import_times(modules) for _ in range(runs)]
+    total = statistics.median(sum(times.values()) for times, _ in samples)
+    return total, samples[-1][1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="import 시간 벤치마크")
+    parser.add_argument('modules', nargs='*', default=WORKER_MODULES, help="측정할 모듈")
+    parser.add_argument('--runs', type=int, default=5, help="모듈별 측정 횟수 (중앙값 사용)")
+    parser.add_argument('--top', type=int, default=10, help="출력할 무거운 의존성 수")
+    args = parser.parse_args()
+
+    print(f"--- 모듈별 import 시간 (중앙값, {args.runs}회) ---")
+    for module in args.modules:
+        total, _ = measure([module], args.runs)
+        print(f"{module:<16}: {total:7.1f} ms")
+
+    total, dependencies = measure(args.modules, args.runs)
+    print(f"\n--- 전체 import 시간: {total:.1f} ms ---")
+    print("무거운 의존성 (누적):")
+    for name, ms in sorted(dependencies.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {name:<20}: {ms:7.1f} ms")
+
+if __name__ == '__main__':
+    main()
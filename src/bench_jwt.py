@@ -0,0 +1,169 @@
+"""
+JWT 인증 처리량 벤치마크
+
+jwt_fastapi_example 서버를 uvicorn으로 띄운 뒤, 미리 발급한 토큰 여러 개로
+/protected-data를 정해진 시간 동안 계속 호출해서 초당 요청 수(RPS)를 측정합니다.
+검증 토큰 캐시를 끈 서버(JWT_CACHE_SIZE=0)와 켠 서버를 차례로 측정해서 비교하고,
+프로세스 안에서 토큰 한 개를 검증하는 시간도 함께 출력합니다.
+
+부하는 여러 프로세스(--clients)에서 httpx 비동기 클라이언트로 보냅니다.
+클라이언트가 병목이 되지 않도록 서버보다 많은 CPU를 쓰는 것이 좋습니다.
+
+실행 방법:
+    python src/bench_jwt.py
+    python src/bench_jwt.py --tokens 5000 --duration 10 --clients 4 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+SRC_DIR = Path(__file__).resolve().parent
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, cache_size, secret):
+    """uvicorn 서버를 별도 프로세스로 시작하고 요청을 받을 때까지 대기"""
+    env = {**os.environ, "JWT_SECRET_KEY": secret, "JWT_CACHE_SIZE": str(cache_size)}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "jwt_fastapi_example:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=SRC_DIR,
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/docs", timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("서버가 시작되지 않았습니다.")
+
+
+async def load(url, tokens, duration, concurrency):
+    """duration초 동안 concurrency개의 요청을 계속 보내고 (성공 수, 실패 수) 반환"""
+    ok = 0
+    failed = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=10) as client:
+        async def worker(offset):
+            nonlocal ok, failed
+            index = offset
+            while time.perf_counter() < deadline:
+                token = tokens[index % len(tokens)]
+                index += concurrency
+                response = await client.get(url, headers={"Authorization": f"Bearer {token}"})
+                if response.status_code == 200:
+                    ok += 1
+                else:
+                    failed += 1
+
+        await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+    return ok, failed
+
+
+def run_client(args):
+    url, tokens, duration, concurrency = args
+    return asyncio.run(load(url, tokens, duration, concurrency))
+
+
+def measure_rps(port, tokens, duration, clients, concurrency):
+    """여러 클라이언트 프로세스로 부하를 주고 (RPS, 실패 수) 반환"""
+    url = f"http://127.0.0.1:{port}/protected-data"
+    # 각 클라이언트가 서로 다른 순서로 토큰을 사용
+    jobs = [(url, tokens[i:] + tokens[:i], duration, concurrency) for i in range(clients)]
+    with multiprocessing.Pool(clients) as pool:
+        run_client(jobs[0][:2] + (0.5, concurrency))  # 워밍업
+        results = pool.map(run_client, jobs)
+    ok = sum(result[0] for result in results)
+    failed = sum(result[1] for result in results)
+    return ok / duration, failed
+
+
+def measure_decode(module, tokens, rounds=5):
+    """프로세스 안에서 토큰 한 개를 검증하는 평균 시간(µs): (캐시 없이, 캐시 사용)"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for token in tokens:
+            module.jwt_codec.decode(token, module.SECRET_KEY, algorithms=["HS256"])
+    uncached = (time.perf_counter() - start) / (rounds * len(tokens)) * 1e6
+
+    for token in tokens:
+        module.decode_token(token)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for token in tokens:
+            module.decode_token(token)
+    cached = (time.perf_counter() - start) / (rounds * len(tokens)) * 1e6
+    return uncached, cached
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JWT 인증 처리량 벤치마크")
+    parser.add_argument("--tokens", type=int, default=2000, help="사용할 서로 다른 토큰 수")
+    parser.add_argument("--duration", type=float, default=5.0, help="측정 시간 (초)")
+    parser.add_argument("--clients", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="부하를 보내는 프로세스 수 (기본: CPU 수의 절반)")
+    parser.add_argument("--concurrency", type=int, default=32, help="프로세스당 동시 요청 수")
+    args = parser.parse_args()
+
+    secret = secrets.token_urlsafe(32)
+    os.environ["JWT_SECRET_KEY"] = secret
+    os.environ["JWT_CACHE_SIZE"] = str(args.tokens)
+    # 서버의 토큰 취소 목록은 임시 파일과 벤치마크 전용 공유 메모리 사용
+    workdir = tempfile.TemporaryDirectory()
+    os.environ["JWT_REVOCATION_PATH"] = str(Path(workdir.name) / "revoked.sqlite3")
+    os.environ["JWT_REVOCATION_SHM"] = f"jwt_revocation_bench_{secrets.token_hex(4)}"
+    import jwt_fastapi_example
+
+    tokens = [
+        jwt_fastapi_example.generate_token({"id": i, "email": f"user{i}@example.com", "role": "user"})
+        for i in range(args.tokens)
+    ]
+    uncached_us, cached_us = measure_decode(jwt_fastapi_example, tokens)
+
+    results = {}
+    for label, cache_size in (("캐시 없음", 0), ("캐시 사용", args.tokens)):
+        port = free_port()
+        server = start_server(port, cache_size, secret)
+        try:
+            results[label] = measure_rps(port, tokens, args.duration, args.clients, args.concurrency)
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"--- JWT 인증 벤치마크 (토큰 {args.tokens}개, {args.duration:.0f}초, "
+          f"클라이언트 {args.clients}개 x 동시 {args.concurrency}) ---")
+    print(f"토큰 검증 (프로세스 안): 캐시 없음 {uncached_us:.1f} µs, 캐시 사용 {cached_us:.1f} µs")
+    for label, (rps, failed) in results.items():
+        print(f"/protected-data {label}: {rps:,.0f} req/s (실패 {failed})")
+    print(f"속도 향상: {results['캐시 사용'][0] / results['캐시 없음'][0]:.2f}x")
+
+    # 서버가 비정상 종료했더라도 벤치마크 전용 공유 메모리는 남기지 않음
+    from jwt_revocation import close_revocation_list, remove_shared_memory
+    close_revocation_list()
+    remove_shared_memory(os.environ["JWT_REVOCATION_SHM"])
+    workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+설정(환경 변수) 지연 로딩
+
+.env 파일은 설정값이 처음 필요할 때 한 번만 읽습니다.
+모듈을 import하는 것만으로는 파일을 읽지 않으므로,
+여러 모듈을 import하는 워커 프로세스도 빠르게 시작합니다.
+
+사용 방법:
+    from config import get_env
+    api_key = get_env('OPENWEATHER_API_KEY')
+"""
+
+import os
+import threading
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_env():
+    """.env 파일을 읽어서 환경 변수에 반영 (처음 호출할 때만)"""
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if not _loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _loaded = True
+
+
+def get_env(name, default=None):
+    """환경 변수 값 (필요하면 먼저 .env 파일을 읽음)"""
+    load_env()
+    return os.getenv(name, default)
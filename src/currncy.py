@@ -1,34 +1,178 @@
-import requests
+import asyncio
+import time
 from datetime import datetime
+from lazy_import import lazy_import
+from async_http import DEFAULT_CONCURRENCY, gather_limited, get_async_client
+from http_session import get_session
+from single_flight import SingleFlight
+from ttl_cache import TTLCache
+
+# import 비용이 큰 패키지는 처음 사용할 때 import
+requests = lazy_import('requests')
+httpx = lazy_import('httpx')
+np = lazy_import('numpy')
+
+# 업스트림이 다음 갱신 시각을 알려주지 않을 때 사용할 캐시 유효 시간 (초)
+DEFAULT_RATES_TTL = 3600
+# 다음 갱신 시각이 이미 지났더라도 최소한 이 시간 동안은 다시 요청하지 않음 (초)
+MIN_RATES_TTL = 60
+
+# 같은 기준 통화의 동시 조회를 하나로 합치는 그룹 (모든 CurrencyConverter가 공유)
+rates_flight = SingleFlight()
+
+
+def rates_expires_at(data):
+    """환율 응답의 다음 갱신 시각(unix)을 캐시 만료 시각으로 사용"""
+    next_update = data.get('time_next_update_unix', data.get('time_next_update'))
+    if not isinstance(next_update, (int, float)):
+        return None
+    return max(next_update, time.time() + MIN_RATES_TTL)
+
+
+class RateTable:
+    """기준 통화 하나의 환율표를 NumPy 벡터로 보관하고 교차 환율 계산
+
+    values[i]는 '1 기준 통화 = values[i] codes[i]'이므로
+    A→B 환율은 values[B] / values[A]로 구할 수 있습니다.
+    rates_for()로 만든 기준 통화별 환율 정보는 표가 바뀔 때까지 재사용합니다.
+    """
+    
+    def __init__(self, rates_data):
+        self.source = rates_data
+        self.base = rates_data.get('base')
+        self.date = rates_data.get('date')
+        self.codes = list(rates_data['rates'])
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.values = np.array(
+            [rates_data['rates'][code] for code in self.codes], dtype=np.float64
+        )
+        self.rows = {}  # 기준 통화 -> rates_for() 결과
+    
+    def __contains__(self, code):
+        return code in self.index
+    
+    def rate(self, from_currency, to_currency):
+        """1 from_currency = ? to_currency (알 수 없는 통화면 None)"""
+        if from_currency not in self.index or to_currency not in self.index:
+            return None
+        return float(self.values[self.index[to_currency]] / self.values[self.index[from_currency]])
+    
+    def rates_for(self, base):
+        """base 기준 환율 정보 (get_rates()와 같은 형식, 여러 호출이 공유하므로 수정하지 말 것)"""
+        row = self.rows.get(base)
+        if row is not None:
+            return row
+        if base not in self.index:
+            return None
+        rates = self.values / self.values[self.index[base]]
+        row = {
+            'base': base,
+            'date': self.date,
+            'rates': dict(zip(self.codes, rates.tolist())),
+        }
+        self.rows[base] = row
+        return row
+    
+    def lookup_indices(self, codes):
+        """통화 코드 배열 → 인덱스 배열 (알 수 없는 코드는 -1)
+
+        고유 코드만 딕셔너리로 찾고 나머지는 역인덱스로 펼치므로
+        행이 수백만 개여도 파이썬 루프는 통화 종류 수만큼만 돕니다.
+        """
+        unique_codes, inverse = np.unique(np.asarray(codes), return_inverse=True)
+        unique_indices = np.array(
+            [self.index.get(code, -1) for code in unique_codes.tolist()], dtype=np.intp
+        )
+        return unique_indices[inverse.reshape(-1)]
+    
+    def convert_many(self, amounts, from_codes, to_codes):
+        """금액 배열을 한 번에 변환 (알 수 없는 통화가 있는 행은 NaN)"""
+        amounts = np.asarray(amounts, dtype=np.float64)
+        from_indices = self.lookup_indices(from_codes)
+        to_indices = self.lookup_indices(to_codes)
+        
+        converted = amounts * self.values[to_indices] / self.values[from_indices]
+        converted[(from_indices < 0) | (to_indices < 0)] = np.nan
+        return converted
+
 
 class CurrencyConverter:
-    def __init__(self):
+    def __init__(self, cache=None, cross_rate=False, pivot='USD', single_flight=None):
         # 무료 API: exchangerate-api.com
         self.base_url = 'https://api.exchangerate-api.com/v4/latest'
-        self.cache = {}
+        # 기준 통화별 환율 캐시 (get_or_load()를 가진 객체면 다른 캐시로 교체 가능)
+        self.cache = cache if cache is not None else TTLCache(
+            maxsize=64, default_ttl=DEFAULT_RATES_TTL
+        )
+        # 교차 환율 모드: pivot 통화 환율표 하나로 모든 통화쌍을 계산
+        self.cross_rate = cross_rate
+        self.pivot = pivot
+        self.rate_table = None
+        self.single_flight = single_flight or rates_flight
     
     def get_rates(self, base='USD'):
-        """환율 정보 조회 (캐싱 포함)"""
-        # 캐시 확인
-        if base in self.cache:
-            return self.cache[base]
-        
+        """환율 정보 조회 (캐싱 포함)
+
+        캐시가 만료됐으면 이전 값을 바로 반환하고 백그라운드에서 갱신합니다.
+        교차 환율 모드에서는 pivot 환율표에서 계산하므로 추가 요청이 없습니다.
+        """
+        if self.cross_rate:
+            return self.rates_from_table(self.get_rate_table(), base)
+        return self.cache.get_or_load(base, lambda: self.load_rates(base))
+    
+    def get_rate_table(self):
+        """pivot 통화 환율표 (캐시된 응답이 바뀌었을 때만 다시 생성)"""
+        rates_data = self.cache.get_or_load(self.pivot, lambda: self.load_rates(self.pivot))
+        return self.table_for(rates_data)
+    
+    def table_for(self, rates_data):
+        if not rates_data:
+            return None
+        if self.rate_table is None or self.rate_table.source is not rates_data:
+            self.rate_table = RateTable(rates_data)
+        return self.rate_table
+    
+    def rates_from_table(self, table, base):
+        if table is None:
+            return None
+        rates_data = table.rates_for(base)
+        if rates_data is None:
+            print(f'{base} 환율 정보 없음')
+        return rates_data
+    
+    def convert_many(self, amounts, from_codes, to_codes):
+        """여러 건을 한 번에 변환 (pivot 환율표 한 번만 조회)
+
+        amounts, from_codes, to_codes는 같은 길이의 배열이며
+        결과는 NumPy 배열입니다. 환율 정보가 없는 행은 NaN입니다.
+        """
+        table = self.get_rate_table()
+        if table is None:
+            return None
+        return table.convert_many(amounts, from_codes, to_codes)
+    
+    def load_rates(self, base):
+        """API에서 환율 정보 조회 (같은 기준 통화를 동시에 조회하면 요청은 한 번만 보냄)"""
+        return self.single_flight.do(f'{self.base_url}/{base}', lambda: self.fetch_rates(base))
+    
+    def fetch_rates(self, base):
+        """API에서 환율 정보 조회 → (데이터, 캐시 만료 시각)"""
         try:
-            response = requests.get(f'{self.base_url}/{base}')
+            response = get_session().get(f'{self.base_url}/{base}')
             response.raise_for_status()
             data = response.json()
-            
-            # 캐시 저장
-            self.cache[base] = data
-            return data
+            return data, rates_expires_at(data)
         except requests.RequestException as e:
             print(f'환율 정보 조회 실패: {e}')
-            return None
+            return None, None
     
     def convert(self, amount, from_currency, to_currency):
         """통화 변환"""
         rates_data = self.get_rates(from_currency)
-        
+        return self.convert_with_rates(amount, from_currency, to_currency, rates_data)
+    
+    def convert_with_rates(self, amount, from_currency, to_currency, rates_data):
+        """조회해 둔 환율 정보로 통화 변환"""
         if not rates_data:
             return None
         
@@ -57,6 +201,77 @@ class CurrencyConverter:
         for target in targets:
             result = self.convert(amount, base, target)
 
+
+class AsyncCurrencyConverter(CurrencyConverter):
+    """여러 기준 통화의 환율을 동시에 조회하는 비동기 버전"""
+    
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, cache=None, cross_rate=False, pivot='USD',
+                 single_flight=None):
+        super().__init__(
+            cache=cache, cross_rate=cross_rate, pivot=pivot, single_flight=single_flight
+        )
+        self.concurrency = concurrency
+    
+    async def get_rates(self, base='USD'):
+        """환율 정보 조회 (캐싱 포함)
+
+        캐시가 만료됐으면 이전 값을 바로 반환하고 백그라운드 태스크에서 갱신합니다.
+        """
+        if self.cross_rate:
+            return self.rates_from_table(await self.get_rate_table(), base)
+        return await self.cache.aget_or_load(base, lambda: self.load_rates(base))
+    
+    async def get_rate_table(self):
+        """pivot 통화 환율표 (캐시된 응답이 바뀌었을 때만 다시 생성)"""
+        rates_data = await self.cache.aget_or_load(
+            self.pivot, lambda: self.load_rates(self.pivot)
+        )
+        return self.table_for(rates_data)
+    
+    async def convert_many(self, amounts, from_codes, to_codes):
+        """여러 건을 한 번에 변환 (pivot 환율표 한 번만 조회)"""
+        table = await self.get_rate_table()
+        if table is None:
+            return None
+        return table.convert_many(amounts, from_codes, to_codes)
+    
+    async def load_rates(self, base):
+        """API에서 환율 정보 조회 (같은 기준 통화를 동시에 조회하면 요청은 한 번만 보냄)"""
+        return await self.single_flight.do_async(
+            f'{self.base_url}/{base}', lambda: self.fetch_rates(base)
+        )
+    
+    async def fetch_rates(self, base):
+        """API에서 환율 정보 조회 → (데이터, 캐시 만료 시각)"""
+        try:
+            response = await get_async_client().get(f'{self.base_url}/{base}')
+            response.raise_for_status()
+            data = response.json()
+            return data, rates_expires_at(data)
+        except httpx.HTTPError as e:
+            print(f'환율 정보 조회 실패: {e}')
+            return None, None
+    
+    async def get_rates_many(self, bases):
+        """여러 기준 통화의 환율을 동시에 조회 (bases와 같은 순서)"""
+        return await gather_limited(self.get_rates, bases, self.concurrency)
+    
+    async def convert(self, amount, from_currency, to_currency):
+        """통화 변환"""
+        rates_data = await self.get_rates(from_currency)
+        return self.convert_with_rates(amount, from_currency, to_currency, rates_data)
+    
+    async def compare_currencies(self, amount, base, targets):
+        """여러 통화로 동시 변환 (기준 통화 환율은 한 번만 조회)"""
+        print(f"\n💰 {amount} {base} →")
+        print(f"{'='*40}")
+        
+        rates_data = await self.get_rates(base)
+        return [
+            self.convert_with_rates(amount, base, target, rates_data)
+            for target in targets
+        ]
+
 # 사용 예시
 if __name__ == '__main__':
     converter = CurrencyConverter()
@@ -69,4 +284,21 @@ if __name__ == '__main__':
         amount=1000000,
         base='KRW',
         targets=['USD', 'EUR', 'JPY', 'CNY']
-    )
\ No newline at end of file
+    )
+    print(f"캐시 통계: {converter.cache.stats()}")
+    
+    # 교차 환율 모드: USD 환율표 한 번으로 모든 통화쌍 변환
+    cross_converter = CurrencyConverter(cross_rate=True)
+    converted = cross_converter.convert_many(
+        [10000, 500, 1200],
+        ['KRW', 'EUR', 'JPY'],
+        ['USD', 'KRW', 'CNY'],
+    )
+    print(f"일괄 변환 결과: {converted}")
+    
+    # 여러 기준 통화 환율 동시 조회 (비동기)
+    bases = ['USD', 'EUR', 'JPY', 'CNY']
+    rates_list = asyncio.run(AsyncCurrencyConverter().get_rates_many(bases))
+    for base, rates_data in zip(bases, rates_list):
+        if rates_data:
+            print(f"1 {base} = {rates_data['rates']['KRW']:,.2f} KRW")
\ No newline at end of file
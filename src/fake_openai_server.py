@@ -0,0 +1,263 @@
+"""
+OpenAI API 로컬 대체 서버 (시험용)
+
+실제 API 키와 비용 없이 openai_runner.py, openai_batch.py를 시험할 수 있도록
+Responses API와 Files/Batches API의 일부를 흉내 냅니다.
+모델은 입력을 그대로 되돌려 주는 echo 모델입니다.
+
+- POST /v1/responses            : 바로 응답 (--fail-rate 비율로 429/500, stream=true면 단어별 SSE 이벤트)
+- POST /v1/files                : 파일 업로드 (multipart)
+- GET  /v1/files/{id}/content   : 파일 내용
+- POST /v1/batches              : 배치 생성
+- GET  /v1/batches/{id}         : 배치 상태 (--batch-delay초 뒤에 completed)
+
+배치 요청도 --fail-rate 비율로 실패(500 또는 batch_expired)하며, 실패한 요청은 에러 파일에 기록됩니다.
+
+실행 방법:
+    python src/fake_openai_server.py --port 8089 --fail-rate 0.1
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=test \\
+        python src/openai_batch.py prompts.txt -o results.jsonl --workdir /tmp/batch --poll-interval 1
+"""
+
+import argparse
+import email
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def echo_response(body):
+    """요청 본문에 대한 echo 모델의 Responses API 응답"""
+    text = body.get('input')
+    if not isinstance(text, str):
+        text = json.dumps(text, ensure_ascii=False)
+    input_tokens = len(text.encode('utf-8')) // 4 + 1
+    return {
+        'id': f'resp_{random.getrandbits(48):x}',
+        'object': 'response',
+        'created_at': int(time.time()),
+        'model': body.get('model'),
+        'status': 'completed',
+        'output': [{
+            'type': 'message',
+            'id': f'msg_{random.getrandbits(48):x}',
+            'role': 'assistant',
+            'status': 'completed',
+            'content': [{'type': 'output_text', 'text': text, 'annotations': []}],
+        }],
+        'usage': {
+            'input_tokens': input_tokens,
+            'output_tokens': input_tokens,
+            'total_tokens': input_tokens * 2,
+            'input_tokens_details': {'cached_tokens': 0},
+            'output_tokens_details': {'reasoning_tokens': 0},
+        },
+        'parallel_tool_calls': True,
+        'tool_choice': 'auto',
+        'tools': [],
+    }
+
+
+class FakeOpenAI:
+    """업로드된 파일과 배치를 메모리에 보관"""
+
+    def __init__(self, fail_rate=0.0, batch_delay=1.0):
+        self.fail_rate = fail_rate
+        self.batch_delay = batch_delay
+        self.files = {}
+        self.batches = {}
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def new_id(self, prefix):
+        with self.lock:
+            return f'{prefix}_{next(self.ids)}'
+
+    def add_file(self, content, filename='file.jsonl', purpose='batch'):
+        file_id = self.new_id('file')
+        self.files[file_id] = content
+        return {
+            'id': file_id,
+            'object': 'file',
+            'bytes': len(content),
+            'created_at': int(time.time()),
+            'filename': filename,
+            'purpose': purpose,
+            'status': 'processed',
+        }
+
+    def create_batch(self, params):
+        batch_id = self.new_id('batch')
+        lines = self.files[params['input_file_id']].decode('utf-8').splitlines()
+        self.batches[batch_id] = {
+            'id': batch_id,
+            'object': 'batch',
+            'endpoint': params['endpoint'],
+            'input_file_id': params['input_file_id'],
+            'completion_window': params['completion_window'],
+            'status': 'in_progress',
+            'created_at': int(time.time()),
+            'output_file_id': None,
+            'error_file_id': None,
+            'request_counts': {'total': len(lines), 'completed': 0, 'failed': 0},
+        }
+        return self.batches[batch_id]
+
+    def get_batch(self, batch_id):
+        batch = self.batches[batch_id]
+        if batch['status'] == 'in_progress' and time.time() - batch['created_at'] >= self.batch_delay:
+            self.finish_batch(batch)
+        return batch
+
+    def finish_batch(self, batch):
+        """입력 파일의 요청을 처리해서 결과/에러 파일 생성"""
+        outputs = []
+        errors = []
+        for line in self.files[batch['input_file_id']].decode('utf-8').splitlines():
+            request = json.loads(line)
+            result = {'id': self.new_id('batch_req'), 'custom_id': request['custom_id']}
+            if random.random() < self.fail_rate / 2:
+                errors.append({**result, 'response': None,
+                               'error': {'code': 'batch_expired', 'message': 'not processed in time'}})
+            elif random.random() < self.fail_rate / 2:
+                errors.append({**result, 'error': None, 'response': {
+                    'status_code': 500,
+                    'body': {'error': {'message': 'internal error', 'code': 'server_error'}},
+                }})
+            else:
+                outputs.append({**result, 'error': None, 'response': {
+                    'status_code': 200,
+                    'body': echo_response(request['body']),
+                }})
+
+        def to_file(records):
+            content = ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records)
+            return self.add_file(content.encode('utf-8'), purpose='batch_output')['id']
+
+        batch['status'] = 'completed'
+        batch['output_file_id'] = to_file(outputs) if outputs else None
+        batch['error_file_id'] = to_file(errors) if errors else None
+        batch['request_counts'].update(completed=len(outputs), failed=len(errors))
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    api = None  # FakeOpenAI
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, data, status=200, headers=None):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_stream(self, response, delay=0.05):
+        """Responses API 스트리밍 이벤트를 SSE로 전송 (출력 텍스트를 단어별 delta로 나눔)"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        text = response['output'][0]['content'][0]['text']
+        deltas = [word + ' ' for word in text.split(' ')]
+        deltas[-1] = deltas[-1].rstrip(' ')
+        events = [{'type': 'response.created', 'response': {**response, 'status': 'in_progress', 'output': []}}]
+        events += [
+            {'type': 'response.output_text.delta', 'item_id': response['output'][0]['id'],
+             'output_index': 0, 'content_index': 0, 'delta': delta, 'logprobs': []}
+            for delta in deltas
+        ]
+        events.append({'type': 'response.completed', 'response': response})
+        for number, event in enumerate(events):
+            event['sequence_number'] = number
+            data = json.dumps(event, ensure_ascii=False)
+            self.wfile.write(f"event: {event['type']}\ndata: {data}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            time.sleep(delay)
+
+    def read_body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length', 0)))
+
+    def do_POST(self):
+        if self.path == '/v1/responses':
+            body = json.loads(self.read_body())
+            if random.random() < self.api.fail_rate / 2:
+                return self.send_json({'error': {'message': 'rate limited', 'type': 'rate_limit'}},
+                                      status=429, headers={'Retry-After': '0.5'})
+            if random.random() < self.api.fail_rate / 2:
+                return self.send_json({'error': {'message': 'internal error', 'type': 'server_error'}}, status=500)
+            if body.get('stream'):
+                return self.send_stream(echo_response(body))
+            return self.send_json(echo_response(body))
+
+        if self.path == '/v1/files':
+            # multipart/form-data를 email 파서로 분리
+            message = email.message_from_bytes(
+                b'Content-Type: ' + self.headers['Content-Type'].encode() + b'\r\n\r\n' + self.read_body()
+            )
+            fields = {}
+            for part in message.get_payload():
+                name = part.get_param('name', header='content-disposition')
+                fields[name] = (part.get_filename(), part.get_payload(decode=True))
+            filename, content = fields['file']
+            return self.send_json(self.api.add_file(content, filename, fields['purpose'][1].decode()))
+
+        if self.path == '/v1/batches':
+            return self.send_json(self.api.create_batch(json.loads(self.read_body())))
+
+        self.send_json({'error': {'message': 'not found'}}, status=404)
+
+    def do_GET(self):
+        parts = self.path.strip('/').split('/')
+        if parts[:2] == ['v1', 'batches'] and len(parts) == 3 and parts[2] in self.api.batches:
+            return self.send_json(self.api.get_batch(parts[2]))
+
+        if parts[:2] == ['v1', 'files'] and len(parts) == 4 and parts[3] == 'content':
+            content = self.api.files.get(parts[2])
+            if content is not None:
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/octet-stream')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+                return
+
+        self.send_json({'error': {'message': 'not found'}}, status=404)
+
+
+def start_server(port=0, fail_rate=0.0, batch_delay=1.0):
+    """백그라운드 스레드에서 대체 서버 시작 → (서버, base_url)"""
+    handler = type('Handler', (FakeOpenAIHandler,), {'api': FakeOpenAI(fail_rate, batch_delay)})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}/v1'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI API 로컬 대체 서버 (시험용)")
+    parser.add_argument('--port', type=int, default=8089, help="포트")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="실패시킬 요청 비율 (0~1)")
+    parser.add_argument('--batch-delay', type=float, default=1.0, help="배치가 완료되기까지 걸리는 시간 (초)")
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.port, args.fail_rate, args.batch_delay)
+    print(f"OPENAI_BASE_URL={base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,8 @@
-import os                                                                               
-from dotenv import load_dotenv
-from google import genai
-
-load_dotenv()
-api_key = os.getenv("GOOGLE_API_KEY")
-client = genai.Client(api_key=api_key)
+from ai_clients import get_gemini_client
+from streaming import print_stream
 
 def start_chat():
-    chat = client.chats.create(model="gemini-2.5-flash")
+    chat = get_gemini_client().chats.create(model="gemini-2.5-flash")
     
     # 첫 번째 질문
     response1 = chat.send_message("안녕! 나는 파이썬 개발자야.")
@@ -17,4 +12,31 @@ def start_chat():
     response2 = chat.send_message("내가 방금 나를 누구라고 소개했었지?")
     print(f"AI: {response2.text}")
 
-start_chat()
+def create_chat(messages=None, model="gemini-2.5-flash"):
+    """OpenAI 형식의 대화 기록({"role", "content"} 목록)으로 채팅 세션 생성"""
+    history = [
+        {
+            # Gemini는 assistant 대신 model 역할을 사용
+            "role": "model" if message["role"] == "assistant" else "user",
+            "parts": [{"text": message["content"]}],
+        }
+        for message in messages or []
+    ]
+    return get_gemini_client().chats.create(model=model, history=history)
+
+def stream_message(chat, message):
+    """채팅 세션에 메시지를 보내고 답변을 생성되는 대로 조각씩 생성"""
+    for chunk in chat.send_message_stream(message):
+        if chunk.text:
+            yield chunk.text
+
+def start_chat_stream():
+    """start_chat()과 같은 대화를 답변이 생성되는 대로 출력"""
+    chat = create_chat()
+    
+    print_stream(stream_message(chat, "안녕! 나는 파이썬 개발자야."), prefix="AI: ")
+    print_stream(stream_message(chat, "내가 방금 나를 누구라고 소개했었지?"), prefix="AI: ")
+
+if __name__ == "__main__":
+    start_chat()
+    start_chat_stream()
@@ -1,23 +1,23 @@
-import os
 from pathlib import Path
-from dotenv import load_dotenv
-from google import genai
-from PIL import Image
-
-load_dotenv()
-api_key = os.getenv("GOOGLE_API_KEY")
-client = genai.Client(api_key=api_key)
+from ai_clients import get_gemini_client
+from image_prep import prepare_image
 
 def analyze_image():
-    # 이미지 파일 로드
+    from google.genai import types
+    
+    # 긴 변을 줄이고 다시 인코딩한 이미지 (같은 이미지는 캐시 사용)
     image_path = Path(__file__).resolve().parent / "sample_image.jpg"
-    img = Image.open(image_path)
+    image = prepare_image(image_path)
     
-    response = client.models.generate_content(
+    response = get_gemini_client().models.generate_content(
         model="gemini-2.5-flash",
-        contents=["이 사진의 분위기와 주요 사물을 설명해줘.", img]
+        contents=[
+            "이 사진의 분위기와 주요 사물을 설명해줘.",
+            types.Part.from_bytes(data=image.data, mime_type=image.mime_type),
+        ]
     )
     print("--- 이미지 분석 결과 ---")
     print(response.text)
 
-analyze_image()
+if __name__ == "__main__":
+    analyze_image()
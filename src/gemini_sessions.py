@@ -0,0 +1,305 @@
+"""
+Gemini 채팅 세션 관리자
+
+사용자(세션 ID)별 채팅 객체를 서버 프로세스 하나에서 관리합니다.
+
+- 최근에 사용한 채팅만 메모리에 둡니다. (최대 maxsize개, LRU)
+- idle_ttl초 동안 사용하지 않았거나 maxsize를 넘으면 대화 기록을 디스크(SQLite)에 저장하고
+  메모리에서 내립니다. 기록은 텍스트 위주의 JSON을 zlib으로 압축해서 저장합니다.
+- 내려간 세션으로 다시 요청이 오면 그때 디스크에서 기록을 읽어 채팅을 다시 만듭니다.
+  같은 세션을 동시에 다시 불러와도 디스크는 한 번만 읽습니다. (single_flight)
+- 같은 세션의 메시지는 세션별 잠금으로 한 번에 하나씩 처리합니다.
+
+메모리에 있는 세션의 최근 대화는 내려갈 때 저장되므로, 종료 전에 close()를 호출하세요.
+저장 파일 위치는 환경 변수 GEMINI_SESSION_PATH로 바꿀 수 있습니다.
+
+사용 방법:
+    manager = GeminiSessionManager(maxsize=1000, idle_ttl=1800)
+    reply = manager.send('user-42', '안녕! 나는 파이썬 개발자야.')
+    for delta in manager.stream('user-42', '내가 누구라고 했지?'):
+        print(delta, end='')
+    manager.close()
+"""
+
+import contextlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+from ai_clients import get_gemini_client
+from config import get_env
+from single_flight import SingleFlight
+
+DEFAULT_SESSION_PATH = '.cache/gemini_sessions.sqlite3'
+DEFAULT_MODEL = 'gemini-2.5-flash'
+# 디스크에 저장한 세션을 보관할 기간 (초)
+DEFAULT_MAX_AGE = 30 * 24 * 3600
+# 몇 번 저장할 때마다 오래된 세션을 정리할지
+PURGE_EVERY = 100
+
+
+def dump_history(history):
+    """채팅 기록(Content 목록) → 압축한 JSON 바이트"""
+    data = [content.model_dump(mode='json', exclude_none=True) for content in history]
+    return zlib.compress(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def load_history(blob):
+    """dump_history()의 결과 → Content 목록"""
+    from google.genai import types
+    return [types.Content.model_validate(item) for item in json.loads(zlib.decompress(blob))]
+
+
+class SessionArchive:
+    """메모리에서 내린 세션의 대화 기록을 저장하는 SQLite 저장소 (여러 프로세스가 공유 가능)"""
+
+    def __init__(self, path=DEFAULT_SESSION_PATH, max_age=DEFAULT_MAX_AGE, timeout=30):
+        self.path = Path(path)
+        self.max_age = max_age
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connect().execute(
+            'CREATE TABLE IF NOT EXISTS sessions ('
+            ' session_id TEXT PRIMARY KEY,'
+            ' model TEXT NOT NULL,'
+            ' history BLOB NOT NULL,'
+            ' updated_at REAL NOT NULL)'
+        )
+
+    def _connect(self):
+        """스레드마다 별도의 연결 사용"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def load(self, session_id):
+        """(모델, Content 목록) 반환, 저장된 세션이 없으면 None"""
+        row = self._connect().execute(
+            'SELECT model, history, updated_at FROM sessions WHERE session_id = ?', (session_id,)
+        ).fetchone()
+        if row is None or row[2] < time.time() - self.max_age:
+            return None
+        return row[0], load_history(row[1])
+
+    def save(self, session_id, model, history):
+        self._connect().execute(
+            'INSERT OR REPLACE INTO sessions (session_id, model, history, updated_at) VALUES (?, ?, ?, ?)',
+            (session_id, model, dump_history(history), time.time()),
+        )
+        with self._lock:
+            self._writes += 1
+            should_purge = self._writes % PURGE_EVERY == 0
+        if should_purge:
+            self.purge()
+
+    def delete(self, session_id):
+        self._connect().execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+
+    def purge(self):
+        """max_age보다 오래된 세션 삭제"""
+        self._connect().execute(
+            'DELETE FROM sessions WHERE updated_at < ?', (time.time() - self.max_age,)
+        )
+
+    def stats(self):
+        count, size = self._connect().execute(
+            'SELECT COUNT(*), COALESCE(SUM(LENGTH(history)), 0) FROM sessions'
+        ).fetchone()
+        return {'sessions': count, 'bytes': size}
+
+
+class _Session:
+    """메모리에 있는 채팅 하나"""
+
+    def __init__(self, chat, model):
+        self.chat = chat
+        self.model = model
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self.deleted = False  # delete()로 삭제됐으면 디스크에 다시 저장하지 않음
+
+
+class GeminiSessionManager:
+    """세션 ID별 Gemini 채팅을 LRU + idle TTL로 관리하고, 내린 세션은 디스크에서 다시 불러옴"""
+
+    def __init__(self, maxsize=1000, idle_ttl=1800, model=DEFAULT_MODEL, archive=None, client=None):
+        self.maxsize = maxsize
+        self.idle_ttl = idle_ttl
+        self.model = model
+        self.archive = archive or SessionArchive(get_env('GEMINI_SESSION_PATH', DEFAULT_SESSION_PATH))
+        self.client = client
+        self._live = OrderedDict()  # session_id -> _Session (오래 사용하지 않은 순서)
+        self._evicting = {}  # 디스크에 저장 중인 세션
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.created = 0
+        self.rehydrated = 0
+        self.evicted = 0
+
+    def get_client(self):
+        return self.client or get_gemini_client()
+
+    def _load(self, session_id):
+        """디스크에 저장된 기록으로 채팅을 다시 만들거나, 없으면 새 채팅 생성"""
+        saved = self.archive.load(session_id)
+        if saved is None:
+            model, history = self.model, []
+        else:
+            model, history = saved
+        session = _Session(self.get_client().chats.create(model=model, history=history), model)
+
+        with self._lock:
+            # 불러오는 동안 다른 스레드가 먼저 등록했으면 그 세션 사용
+            existing = self._live.get(session_id)
+            if existing is not None:
+                return existing
+            self._live[session_id] = session
+            if saved is None:
+                self.created += 1
+            else:
+                self.rehydrated += 1
+        return session
+
+    def get_session(self, session_id):
+        """세션 ID의 _Session 반환 (메모리에 없으면 디스크에서 불러옴)"""
+        with self._lock:
+            session = self._live.get(session_id)
+            if session is None:
+                # 디스크에 저장하는 중이면 저장이 끝나기를 기다리지 않고 그대로 다시 사용
+                session = self._evicting.get(session_id)
+                if session is not None:
+                    self._live[session_id] = session
+            if session is not None:
+                self._live.move_to_end(session_id)
+                session.last_used = time.monotonic()
+                self.hits += 1
+
+        if session is None:
+            session = self._flight.do(session_id, lambda: self._load(session_id))
+        self.evict()
+        return session
+
+    def get(self, session_id):
+        """세션 ID의 채팅 객체 반환"""
+        return self.get_session(session_id).chat
+
+    def _is_current(self, session_id, session):
+        """session이 아직 관리 중인 세션이면 True (내려가서 저장이 끝났거나 삭제됐으면 False)"""
+        with self._lock:
+            return not session.deleted and (
+                self._live.get(session_id) is session or self._evicting.get(session_id) is session
+            )
+
+    @contextlib.contextmanager
+    def _locked_session(self, session_id):
+        """세션 잠금을 잡은 상태로 _Session 제공
+
+        get_session()과 잠금 사이에 세션이 내려가서 저장이 끝났으면 그 채팅에 보낸 대화는
+        저장되지 않으므로, 잠금을 잡은 뒤 확인해서 다시 불러옵니다.
+        (_evicting에 있는 세션은 _persist()가 이 잠금을 기다렸다가 새 대화까지 저장함)
+        """
+        while True:
+            session = self.get_session(session_id)
+            with session.lock:
+                if not self._is_current(session_id, session):
+                    continue
+                yield session
+                session.last_used = time.monotonic()
+                return
+
+    def send(self, session_id, message):
+        """세션에 메시지를 보내고 답변 텍스트 반환"""
+        with self._locked_session(session_id) as session:
+            response = session.chat.send_message(message)
+        return response.text
+
+    def stream(self, session_id, message):
+        """세션에 메시지를 보내고 답변을 생성되는 대로 조각씩 생성"""
+        with self._locked_session(session_id) as session:
+            for chunk in session.chat.send_message_stream(message):
+                if chunk.text:
+                    yield chunk.text
+
+    def evict(self):
+        """maxsize를 넘었거나 idle_ttl 동안 사용하지 않은 세션을 디스크에 저장하고 메모리에서 내림"""
+        now = time.monotonic()
+        victims = []
+        with self._lock:
+            while self._live:
+                session_id, session = next(iter(self._live.items()))
+                if len(self._live) <= self.maxsize and now - session.last_used < self.idle_ttl:
+                    break
+                del self._live[session_id]
+                self._evicting[session_id] = session
+                victims.append((session_id, session))
+
+        for session_id, session in victims:
+            self._persist(session_id, session)
+
+    def _persist(self, session_id, session):
+        try:
+            # 진행 중인 메시지가 끝난 뒤의 기록을 저장
+            with session.lock:
+                if not session.deleted:
+                    self.archive.save(session_id, session.model, session.chat.get_history(curated=True))
+        finally:
+            with self._lock:
+                if self._evicting.get(session_id) is session:
+                    del self._evicting[session_id]
+                self.evicted += 1
+
+    def delete(self, session_id):
+        """세션을 메모리와 디스크에서 모두 삭제 (진행 중인 메시지가 있으면 끝날 때까지 기다림)"""
+        with self._lock:
+            sessions = [self._live.pop(session_id, None), self._evicting.pop(session_id, None)]
+        for session in sessions:
+            if session is not None:
+                # 저장 중이던 _persist()가 끝난 뒤에 표시하므로 아래의 삭제보다 늦게 저장되지 않음
+                with session.lock:
+                    session.deleted = True
+        self.archive.delete(session_id)
+
+    def close(self):
+        """메모리에 있는 모든 세션을 디스크에 저장"""
+        with self._lock:
+            sessions = list(self._live.items())
+            self._live.clear()
+            self._evicting.update(sessions)
+        for session_id, session in sessions:
+            self._persist(session_id, session)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'live': len(self._live),
+                'hits': self.hits,
+                'created': self.created,
+                'rehydrated': self.rehydrated,
+                'evicted': self.evicted,
+            }
+
+
+if __name__ == '__main__':
+    manager = GeminiSessionManager(maxsize=1, idle_ttl=600)
+
+    print(f"AI: {manager.send('alice', '안녕! 나는 파이썬 개발자야.')}")
+    print(f"AI: {manager.send('bob', '안녕! 나는 데이터 분석가야.')}")  # alice는 디스크로 내려감
+
+    # alice의 대화 기록을 디스크에서 다시 불러와서 이어서 대화
+    print(f"AI: {manager.send('alice', '내가 방금 나를 누구라고 소개했었지?')}")
+
+    print(manager.stats(), manager.archive.stats())
+    manager.close()
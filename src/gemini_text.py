@@ -1,17 +1,24 @@
-import os
-from dotenv import load_dotenv
-from google import genai
-
-load_dotenv()
-client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+from ai_clients import get_gemini_client
+from streaming import print_stream
 
 def generate_text():
-    response = client.models.generate_content(
+    response = get_gemini_client().models.generate_content(
         model="gemini-2.5-flash",
         contents="인공지능의 미래에 대해 짧게 설명해줘."
     )
     print("--- 텍스트 생성 결과 ---")
     print(response.text)
 
+def stream_text(prompt, model="gemini-2.5-flash"):
+    """응답 텍스트를 생성되는 대로 조각씩 생성"""
+    for chunk in get_gemini_client().models.generate_content_stream(model=model, contents=prompt):
+        if chunk.text:
+            yield chunk.text
+
+def generate_text_stream():
+    print("--- 텍스트 생성 결과 (스트리밍) ---")
+    print_stream(stream_text("인공지능의 미래에 대해 짧게 설명해줘."))
+
 if __name__ == "__main__":
-    generate_text()
\ No newline at end of file
+    generate_text()
+    generate_text_stream()
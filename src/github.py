@@ -1,14 +1,167 @@
-import requests
-import os
-from dotenv import load_dotenv
-from collections import Counter
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+from config import get_env
+from lazy_import import lazy_import
+from async_http import DEFAULT_CONCURRENCY, gather_limited, get_async_client
+from http_session import get_rate_limited_session
+from rate_limiter import AUTHENTICATED_LIMIT, UNAUTHENTICATED_LIMIT, RateLimiter
+from ttl_cache import TTLCache
+
+# import 비용이 큰 패키지는 처음 사용할 때 import
+requests = lazy_import('requests')
+httpx = lazy_import('httpx')
+np = lazy_import('numpy')
+
+
+class RepoSnapshot:
+    """한 사용자의 레포지토리 목록을 열 단위 배열로 보관
+
+    API 응답(레포당 수십 개 필드의 dict)에서 분석에 필요한 값만 남겨서
+    이름, 언어 코드, 스타 수, 포크 수를 각각 NumPy 배열로 저장합니다.
+    언어는 languages 목록의 인덱스로 저장하고 언어 정보가 없으면 -1입니다.
+    """
+    
+    def __init__(self, username, names, languages, language_codes, stars, forks,
+                 descriptions, fetched_at=None):
+        self.username = username
+        self.names = names
+        self.languages = languages
+        self.language_codes = language_codes
+        self.stars = stars
+        self.forks = forks
+        self.descriptions = descriptions
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+    
+    @classmethod
+    def from_repos(cls, username, repos):
+        """API 응답 목록으로 스냅샷 생성"""
+        languages = []
+        language_index = {}
+        language_codes = np.empty(len(repos), dtype=np.int32)
+        for i, repo in enumerate(repos):
+            language = repo['language']
+            if not language:
+                language_codes[i] = -1
+                continue
+            if language not in language_index:
+                language_index[language] = len(languages)
+                languages.append(language)
+            language_codes[i] = language_index[language]
+        
+        return cls(
+            username,
+            names=np.array([repo['name'] for repo in repos], dtype=str),
+            languages=languages,
+            language_codes=language_codes,
+            stars=np.array([repo['stargazers_count'] for repo in repos], dtype=np.int64),
+            forks=np.array([repo['forks_count'] for repo in repos], dtype=np.int64),
+            descriptions=[repo['description'] or '' for repo in repos],
+        )
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def save(self, path):
+        """스냅샷을 .npz 파일로 저장"""
+        np.savez_compressed(
+            path,
+            username=np.array(self.username),
+            names=self.names,
+            languages=np.array(self.languages, dtype=str),
+            language_codes=self.language_codes,
+            stars=self.stars,
+            forks=self.forks,
+            descriptions=np.array(self.descriptions, dtype=str),
+            fetched_at=np.array(self.fetched_at),
+        )
+    
+    @classmethod
+    def load(cls, path):
+        """save()로 저장한 스냅샷 불러오기"""
+        with np.load(path) as data:
+            return cls(
+                str(data['username']),
+                names=data['names'],
+                languages=data['languages'].tolist(),
+                language_codes=data['language_codes'],
+                stars=data['stars'],
+                forks=data['forks'],
+                descriptions=data['descriptions'].tolist(),
+                fetched_at=float(data['fetched_at']),
+            )
+    
+    def language_counts(self, top_n=10):
+        """언어별 레포지토리 수 상위 top_n개 [(언어, 개수), ...]"""
+        known = self.language_codes[self.language_codes >= 0]
+        counts = np.bincount(known, minlength=len(self.languages))
+        # 개수가 같으면 먼저 등장한 언어가 앞에 오도록 안정 정렬
+        order = np.argsort(-counts, kind='stable')[:top_n]
+        return [(self.languages[i], int(counts[i])) for i in order if counts[i] > 0]
+    
+    def known_language_count(self):
+        """언어 정보가 있는 레포지토리 수"""
+        return int(np.count_nonzero(self.language_codes >= 0))
+    
+    def top_by_stars(self, top_n=5):
+        """스타 수 상위 top_n개 레포지토리의 인덱스 (많은 순)
+
+        전체 정렬 대신 np.argpartition으로 상위 top_n개만 고른 뒤 그 안에서만 정렬합니다.
+        """
+        if top_n <= 0:
+            return np.array([], dtype=np.intp)
+        if top_n < len(self):
+            candidates = np.argpartition(-self.stars, top_n - 1)[:top_n]
+        else:
+            candidates = np.arange(len(self))
+        # 스타 수가 같으면 원래 순서(최근 업데이트 순) 유지
+        return candidates[np.lexsort((candidates, -self.stars[candidates]))]
+    
+    def language_of(self, index):
+        code = self.language_codes[index]
+        return self.languages[code] if code >= 0 else None
+    
+    def summary(self, top_n=5):
+        """분석 결과를 JSON으로 저장할 수 있는 dict로 반환"""
+        return {
+            'username': self.username,
+            'repo_count': len(self),
+            'languages': self.language_counts(10),
+            'top_repos': [
+                {
+                    'name': str(self.names[i]),
+                    'stars': int(self.stars[i]),
+                    'forks': int(self.forks[i]),
+                    'language': self.language_of(i),
+                }
+                for i in self.top_by_stars(top_n)
+            ],
+            'total_stars': int(self.stars.sum()),
+            'total_forks': int(self.forks.sum()),
+            'fetched_at': self.fetched_at,
+        }
 
-# .env 파일에서 환경 변수 로드
-load_dotenv()
 
 class GitHubAnalyzer:
-    def __init__(self):
-        self.token = os.getenv('GITHUB_PERSONAL_ACCESS_TOKEN')
+    def __init__(self, max_workers=8, page_cache_size=4096,
+                 snapshot_max_age=600, snapshot_dir=None,
+                 rate_limiter=None, max_rate_limit_retries=3):
+        # 두 번째 페이지부터 동시에 가져올 때 사용할 스레드 수
+        self.max_workers = max_workers
+        # (사용자, 페이지)별 ETag/Last-Modified와 응답 데이터
+        # 304 응답은 rate limit에 포함되지 않으므로 저장해 둔 데이터를 재사용합니다.
+        # 만료 없이 LRU로만 크기를 제한합니다.
+        self.page_cache = TTLCache(
+            maxsize=page_cache_size, default_ttl=float('inf'), max_stale=None
+        )
+        # 사용자별 RepoSnapshot (snapshot_max_age초 동안 재사용)
+        # snapshot_dir을 지정하면 디스크에도 저장해서 프로세스를 다시 시작해도 재사용합니다.
+        self.snapshot_max_age = snapshot_max_age
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self.snapshots = TTLCache(maxsize=256, default_ttl=snapshot_max_age, max_stale=0)
+        self.token = get_env('GITHUB_PERSONAL_ACCESS_TOKEN')
         self.base_url = 'https://api.github.com'
         self.headers = {
             'Accept': 'application/vnd.github.v3+json'
@@ -21,123 +174,363 @@ class GitHubAnalyzer:
         else:
             print("⚠️  환경 변수 GITHUB_PERSONAL_ACCESS_TOKEN이 설정되지 않았습니다.")
             print("   토큰 없이도 사용 가능하지만 시간당 60회로 제한됩니다.")
+        
+        # 모든 요청이 거쳐 가는 rate limit 스케줄러
+        # 여러 분석기가 같은 토큰을 쓴다면 하나의 RateLimiter를 넘겨서 공유하세요.
+        if rate_limiter is None:
+            limit = AUTHENTICATED_LIMIT if self.token else UNAUTHENTICATED_LIMIT
+            rate_limiter = RateLimiter(limit=limit)
+        self.rate_limiter = rate_limiter
+        self.max_rate_limit_retries = max_rate_limit_retries
     
-    def get_user_repos(self, username):
-        """사용자의 모든 레포지토리 조회"""
-        repos = []
-        page = 1
-        
-        while True:
-            url = f'{self.base_url}/users/{username}/repos'
-            params = {
-                'page': page,
-                'per_page': 100,
-                'sort': 'updated'
-            }
-            
+    def build_params(self, page):
+        """레포지토리 목록 요청 파라미터"""
+        return {
+            'page': page,
+            'per_page': 100,
+            'sort': 'updated'
+        }
+    
+    def print_error(self, response, username):
+        """API 에러 응답 출력"""
+        print(f"❌ API 요청 실패: HTTP {response.status_code}")
+        if response.status_code == 401:
+            print("   토큰이 유효하지 않습니다. .env 파일의 토큰을 확인하세요.")
+        elif response.status_code == 403:
+            print("   API 사용량 제한 초과")
+            print(f"   남은 요청: {response.headers.get('X-RateLimit-Remaining')}")
+        elif response.status_code == 404:
+            print(f"   사용자 '{username}'를 찾을 수 없습니다.")
+    
+    def conditional_headers(self, entry):
+        """저장된 페이지(entry)의 ETag/Last-Modified로 조건부 요청 헤더 생성"""
+        headers = dict(self.headers)
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def last_page_number(self, response, page):
+        """Link 헤더의 rel="last"에서 마지막 페이지 번호 추출 (없으면 현재 페이지)"""
+        last = response.links.get('last')
+        if not last:
+            return page
+        query = parse_qs(urlparse(str(last['url'])).query)
+        return int(query.get('page', [page])[0])
+    
+    def parse_page(self, username, page, response, entry=None):
+        """페이지 응답 → (레포지토리 목록, 마지막 페이지 번호), 실패하면 None
+
+        entry는 조건부 요청 헤더를 만들 때 사용한 저장 페이지입니다.
+        요청하는 동안 LRU에서 밀려나도 304 응답에는 이 데이터를 그대로 사용합니다.
+        """
+        key = (username, page)
+        
+        # 변경 없음: 저장해 둔 데이터 재사용 (밀려났으면 다시 저장)
+        if response.status_code == 304 and entry:
+            self.page_cache.set(key, entry)
+            return entry['data'], entry['last_page']
+        
+        # 에러 처리
+        if response.status_code != 200:
+            self.print_error(response, username)
+            return None
+        
+        data = response.json()
+        last_page = self.last_page_number(response, page)
+        
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self.page_cache.set(key, {
+                'etag': etag,
+                'last_modified': last_modified,
+                'data': data,
+                'last_page': last_page,
+            })
+        
+        return data, last_page
+    
+    def fetch_page(self, username, page):
+        """레포지토리 목록 한 페이지 조회"""
+        url = f'{self.base_url}/users/{username}/repos'
+        # 304를 받았을 때 사용할 데이터를 헤더와 함께 붙잡아 둠
+        entry, _ = self.page_cache.lookup((username, page))
+        
+        for _ in range(self.max_rate_limit_retries + 1):
+            self.rate_limiter.acquire()
             try:
-                response = requests.get(url, headers=self.headers, params=params)
-                
-                # 에러 처리
-                if response.status_code != 200:
-                    print(f"❌ API 요청 실패: HTTP {response.status_code}")
-                    if response.status_code == 401:
-                        print("   토큰이 유효하지 않습니다. .env 파일의 토큰을 확인하세요.")
-                    elif response.status_code == 403:
-                        print("   API 사용량 제한 초과")
-                        print(f"   남은 요청: {response.headers.get('X-RateLimit-Remaining')}")
-                    elif response.status_code == 404:
-                        print(f"   사용자 '{username}'를 찾을 수 없습니다.")
-                    return []
-                
-                data = response.json()
-                
-                if not data:
-                    break
-                
-                repos.extend(data)
-                page += 1
-                
-                # 100개 미만이면 마지막 페이지
-                if len(data) < 100:
-                    break
-                
+                response = get_rate_limited_session().get(
+                    url,
+                    headers=self.conditional_headers(entry),
+                    params=self.build_params(page)
+                )
             except requests.exceptions.RequestException as e:
                 print(f"❌ 요청 오류: {e}")
-                return []
+                return None
+            
+            self.rate_limiter.update(response)
+            # rate limit으로 거절됐으면 스케줄러가 정한 시각까지 기다렸다가 재시도
+            if not self.rate_limiter.should_retry(response):
+                break
+        
+        return self.parse_page(username, page, response, entry)
+    
+    def get_user_repos(self, username):
+        """사용자의 모든 레포지토리 조회
+
+        첫 페이지 응답의 Link 헤더로 마지막 페이지를 알아낸 뒤
+        나머지 페이지는 동시에 가져옵니다.
+        레포지토리가 없으면 빈 목록, 가져오지 못했으면 None을 반환합니다.
+        """
+        first = self.fetch_page(username, 1)
+        if first is None:
+            return None
         
+        data, last_page = first
+        repos = list(data)
+        if last_page <= 1:
+            return repos
+        
+        pages = range(2, last_page + 1)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pages))) as executor:
+            results = list(executor.map(lambda page: self.fetch_page(username, page), pages))
+        
+        if any(result is None for result in results):
+            return None
+        
+        for data, _ in results:
+            repos.extend(data)
         return repos
     
+    def snapshot_path(self, username):
+        return self.snapshot_dir / f'{username}.npz'
+    
+    def load_snapshot(self, username):
+        """디스크에 저장된 스냅샷이 snapshot_max_age 이내면 불러오기"""
+        if self.snapshot_dir is None:
+            return None
+        path = self.snapshot_path(username)
+        if not path.exists():
+            return None
+        if time.time() - path.stat().st_mtime > self.snapshot_max_age:
+            return None
+        try:
+            return RepoSnapshot.load(path)
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def save_snapshot(self, snapshot):
+        if self.snapshot_dir is None:
+            return
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        snapshot.save(self.snapshot_path(snapshot.username))
+    
+    def build_snapshot(self, username, repos):
+        """레포지토리 목록으로 스냅샷 생성 → (스냅샷, 캐시 만료 시각)
+
+        목록을 가져오지 못했으면(None) 캐시하지 않도록 (None, None)을 반환합니다.
+        레포지토리가 없는 사용자는 빈 스냅샷을 만들어서 다른 사용자처럼 캐시합니다.
+        """
+        if repos is None:
+            return None, None
+        snapshot = RepoSnapshot.from_repos(username, repos)
+        self.save_snapshot(snapshot)
+        return snapshot, snapshot.fetched_at + self.snapshot_max_age
+    
+    def fetch_snapshot(self, username):
+        snapshot = self.load_snapshot(username)
+        if snapshot is not None:
+            return snapshot, snapshot.fetched_at + self.snapshot_max_age
+        return self.build_snapshot(username, self.get_user_repos(username))
+    
+    def get_snapshot(self, username):
+        """사용자의 RepoSnapshot (한 번 가져오면 snapshot_max_age 동안 재사용)"""
+        return self.snapshots.get_or_load(username, lambda: self.fetch_snapshot(username))
+    
     def analyze_languages(self, username):
         """사용 언어 통계 분석"""
-        repos = self.get_user_repos(username)
-        
-        if not repos:
+        self.print_languages(username, self.get_snapshot(username))
+    
+    def print_languages(self, username, snapshot):
+        """언어 통계 출력"""
+        if snapshot is None:
             print(f"\n❌ '{username}'의 레포지토리를 가져올 수 없습니다.")
             return
         
         # 언어별 레포지토리 수 집계
-        languages = [repo['language'] for repo in repos if repo['language']]
-        language_counts = Counter(languages)
+        language_counts = snapshot.language_counts(10)
         
         print(f"\n👤 {username}의 언어 사용 통계")
         print(f"{'='*40}")
-        print(f"총 레포지토리 수: {len(repos)}")
-        print(f"언어 정보 있는 레포지토리: {len(languages)}")
+        print(f"총 레포지토리 수: {len(snapshot)}")
+        print(f"언어 정보 있는 레포지토리: {snapshot.known_language_count()}")
         
         if language_counts:
             print(f"\n사용 언어 순위:")
-            for lang, count in language_counts.most_common(10):
-                percentage = (count / len(repos)) * 100
+            for lang, count in language_counts:
+                percentage = (count / len(snapshot)) * 100
                 print(f"  {lang:15s}: {count:3d}개 ({percentage:5.1f}%)")
         else:
             print("\n⚠️  언어 정보가 없습니다.")
     
     def get_popular_repos(self, username, top_n=5):
         """인기 레포지토리 조회 (스타 수 기준)"""
-        repos = self.get_user_repos(username)
-        
-        if not repos:
+        self.print_popular_repos(username, self.get_snapshot(username), top_n)
+    
+    def print_popular_repos(self, username, snapshot, top_n=5):
+        """인기 레포지토리 출력"""
+        if snapshot is None:
             print(f"\n❌ '{username}'의 레포지토리를 가져올 수 없습니다.")
             return
         
-        # 스타 수로 정렬
-        sorted_repos = sorted(
-            repos,
-            key=lambda x: x['stargazers_count'],
-            reverse=True
-        )[:top_n]
-        
         print(f"\n⭐ 인기 레포지토리 Top {top_n}")
         print(f"{'='*40}")
         
-        for i, repo in enumerate(sorted_repos, 1):
-            print(f"\n{i}. {repo['name']}")
-            print(f"   ⭐ Stars: {repo['stargazers_count']:,}")
-            print(f"   🍴 Forks: {repo['forks_count']:,}")
-            print(f"   📝 언어: {repo['language'] or 'N/A'}")
+        for i, index in enumerate(snapshot.top_by_stars(top_n), 1):
+            description = snapshot.descriptions[index]
+            print(f"\n{i}. {snapshot.names[index]}")
+            print(f"   ⭐ Stars: {snapshot.stars[index]:,}")
+            print(f"   🍴 Forks: {snapshot.forks[index]:,}")
+            print(f"   📝 언어: {snapshot.language_of(index) or 'N/A'}")
             
-            if repo['description']:
-                desc = repo['description'][:80]
-                print(f"   📄 {desc}{'...' if len(repo['description']) > 80 else ''}")
+            if description:
+                desc = description[:80]
+                print(f"   📄 {desc}{'...' if len(description) > 80 else ''}")
     
     def get_contribution_stats(self, username):
         """기여 통계"""
-        repos = self.get_user_repos(username)
-        
-        if not repos:
+        self.print_contribution_stats(username, self.get_snapshot(username))
+    
+    def print_contribution_stats(self, username, snapshot):
+        """기여 통계 출력"""
+        if snapshot is None:
             print(f"\n❌ '{username}'의 레포지토리를 가져올 수 없습니다.")
             return
         
-        total_stars = sum(repo['stargazers_count'] for repo in repos)
-        total_forks = sum(repo['forks_count'] for repo in repos)
+        total_stars = int(snapshot.stars.sum())
+        total_forks = int(snapshot.forks.sum())
         
         print(f"\n📊 기여 통계")
         print(f"{'='*40}")
-        print(f"총 레포지토리: {len(repos):,}")
+        print(f"총 레포지토리: {len(snapshot):,}")
         print(f"총 스타 수: {total_stars:,}")
         print(f"총 포크 수: {total_forks:,}")
-        print(f"평균 스타/레포: {total_stars/len(repos):.1f}")
+        if len(snapshot):
+            print(f"평균 스타/레포: {total_stars/len(snapshot):.1f}")
+
+
+class AsyncGitHubAnalyzer(GitHubAnalyzer):
+    """여러 사용자를 동시에 분석하는 비동기 버전"""
+    
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, page_cache_size=4096,
+                 snapshot_max_age=600, snapshot_dir=None,
+                 rate_limiter=None, max_rate_limit_retries=3):
+        super().__init__(
+            page_cache_size=page_cache_size,
+            snapshot_max_age=snapshot_max_age,
+            snapshot_dir=snapshot_dir,
+            rate_limiter=rate_limiter,
+            max_rate_limit_retries=max_rate_limit_retries,
+        )
+        self.concurrency = concurrency
+        # 사용자별 동시 조회와 페이지별 동시 조회가 겹쳐도 동시에 보내는 요청은 concurrency개까지
+        self.request_slots = asyncio.Semaphore(concurrency)
+    
+    async def fetch_page(self, username, page):
+        """레포지토리 목록 한 페이지 조회"""
+        url = f'{self.base_url}/users/{username}/repos'
+        # 304를 받았을 때 사용할 데이터를 헤더와 함께 붙잡아 둠
+        entry, _ = self.page_cache.lookup((username, page))
+        
+        for _ in range(self.max_rate_limit_retries + 1):
+            await self.rate_limiter.acquire_async()
+            try:
+                async with self.request_slots:
+                    response = await get_async_client().get(
+                        url,
+                        headers=self.conditional_headers(entry),
+                        params=self.build_params(page)
+                    )
+            except httpx.HTTPError as e:
+                print(f"❌ 요청 오류: {e}")
+                return None
+            
+            self.rate_limiter.update(response)
+            # rate limit으로 거절됐으면 스케줄러가 정한 시각까지 기다렸다가 재시도
+            if not self.rate_limiter.should_retry(response):
+                break
+        
+        return self.parse_page(username, page, response, entry)
+    
+    async def get_user_repos(self, username):
+        """사용자의 모든 레포지토리 조회
+
+        첫 페이지 응답의 Link 헤더로 마지막 페이지를 알아낸 뒤
+        나머지 페이지는 동시에 가져옵니다.
+        레포지토리가 없으면 빈 목록, 가져오지 못했으면 None을 반환합니다.
+        """
+        first = await self.fetch_page(username, 1)
+        if first is None:
+            return None
+        
+        data, last_page = first
+        repos = list(data)
+        if last_page <= 1:
+            return repos
+        
+        async def fetch(page):
+            return await self.fetch_page(username, page)
+        
+        results = await gather_limited(fetch, range(2, last_page + 1), self.concurrency)
+        
+        if any(result is None for result in results):
+            return None
+        
+        for data, _ in results:
+            repos.extend(data)
+        return repos
+    
+    async def get_many_user_repos(self, usernames):
+        """여러 사용자의 레포지토리를 동시에 조회 (usernames와 같은 순서)"""
+        return await gather_limited(self.get_user_repos, usernames, self.concurrency)
+    
+    async def fetch_snapshot(self, username):
+        snapshot = self.load_snapshot(username)
+        if snapshot is not None:
+            return snapshot, snapshot.fetched_at + self.snapshot_max_age
+        return self.build_snapshot(username, await self.get_user_repos(username))
+    
+    async def get_snapshot(self, username):
+        """사용자의 RepoSnapshot (한 번 가져오면 snapshot_max_age 동안 재사용)"""
+        return await self.snapshots.aget_or_load(username, lambda: self.fetch_snapshot(username))
+    
+    async def get_many_snapshots(self, usernames):
+        """여러 사용자의 스냅샷을 동시에 조회 (usernames와 같은 순서)"""
+        return await gather_limited(self.get_snapshot, usernames, self.concurrency)
+    
+    async def analyze_languages(self, username):
+        """사용 언어 통계 분석"""
+        self.print_languages(username, await self.get_snapshot(username))
+    
+    async def get_popular_repos(self, username, top_n=5):
+        """인기 레포지토리 조회 (스타 수 기준)"""
+        self.print_popular_repos(username, await self.get_snapshot(username), top_n)
+    
+    async def get_contribution_stats(self, username):
+        """기여 통계"""
+        self.print_contribution_stats(username, await self.get_snapshot(username))
+    
+    async def analyze_users(self, usernames, top_n=5):
+        """여러 사용자를 동시에 조회한 뒤 사용자별 리포트 출력"""
+        snapshots = await self.get_many_snapshots(usernames)
+        
+        for username, snapshot in zip(usernames, snapshots):
+            self.print_languages(username, snapshot)
+            self.print_popular_repos(username, snapshot, top_n)
+            self.print_contribution_stats(username, snapshot)
 
 # 사용 예시
 if __name__ == '__main__':
@@ -145,6 +538,10 @@ if __name__ == '__main__':
     
     username = 'torvalds'  # 분석할 GitHub 사용자명
     
+    # 세 리포트는 같은 스냅샷을 사용하므로 레포지토리 목록은 한 번만 조회됩니다.
     analyzer.analyze_languages(username)
     analyzer.get_popular_repos(username, top_n=5)
-    analyzer.get_contribution_stats(username)
\ No newline at end of file
+    analyzer.get_contribution_stats(username)
+    
+    # 여러 사용자 동시 분석 (비동기)
+    asyncio.run(AsyncGitHubAnalyzer().analyze_users(['torvalds', 'gvanrossum']))
\ No newline at end of file
@@ -0,0 +1,188 @@
+"""
+GitHub 사용자 일괄 분석 (JSON Lines 출력)
+
+사용자명 목록 파일(한 줄에 하나)을 읽어서 여러 사용자를 동시에 분석하고,
+끝나는 대로 한 줄씩 JSON Lines로 출력합니다.
+--checkpoint를 지정하면 분석을 마친 사용자를 기록해 두므로,
+중간에 중단되더라도 같은 명령을 다시 실행하면 남은 사용자만 처리합니다.
+결과 파일에 이미 기록된 사용자도 건너뛰므로, 결과를 쓰고 체크포인트를 쓰기 전에
+중단되더라도 같은 사용자가 두 번 기록되지 않습니다.
+
+실행 방법:
+    python src/github_batch.py usernames.txt -o report.jsonl
+    python src/github_batch.py usernames.txt -o report.jsonl --checkpoint report.done
+    cat usernames.txt | python src/github_batch.py - -o - > report.jsonl
+
+출력 예시 (한 줄):
+    {"username": "torvalds", "repo_count": 8, "languages": [["C", 5], ...], ...}
+
+조회에 실패한 사용자는 {"username": ..., "error": "..."}로 출력되며,
+체크포인트에 기록되지 않으므로 다시 실행하면 재시도합니다.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import sys
+
+from async_http import DEFAULT_CONCURRENCY, close_async_client
+from github import AsyncGitHubAnalyzer
+
+
+def read_usernames(path):
+    """사용자명을 한 줄씩 읽기 (빈 줄과 #으로 시작하는 줄은 무시)"""
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        for line in stream:
+            username = line.strip()
+            if username and not username.startswith('#'):
+                yield username
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def load_output(path):
+    """이미 결과 파일에 성공으로 기록된 사용자명 집합
+
+    중단되면서 마지막 줄이 끝까지 쓰이지 않았으면 그 줄을 잘라냅니다.
+    (그대로 두면 이어서 쓰는 결과와 한 줄로 붙음)
+    """
+    if not path or path == '-':
+        return set()
+    usernames = set()
+    try:
+        with open(path, 'rb+') as f:
+            complete = 0
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                complete += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if 'error' not in record and record.get('username'):
+                    usernames.add(record['username'])
+            f.truncate(complete)
+    except FileNotFoundError:
+        pass
+    return usernames
+
+
+def load_checkpoint(path):
+    """이미 분석을 마친 사용자명 집합"""
+    if not path:
+        return set()
+    try:
+        with open(path, encoding='utf-8') as f:
+            return {line.strip() for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+async def run_batch(analyzer, usernames, output, checkpoint=None, done=None,
+                    concurrency=DEFAULT_CONCURRENCY, top_n=5):
+    """usernames를 concurrency개씩 동시에 분석하고 결과를 output에 한 줄씩 기록
+
+    사용자명은 필요한 만큼만 읽으므로 목록 전체를 메모리에 올리지 않습니다.
+    다만 목록에 중복된 사용자를 건너뛰기 위해 읽은 사용자명은 done에 모아 둡니다.
+    사용자 한 명의 분석에서 예외가 나면 그 사용자만 실패로 기록하고 계속 진행합니다.
+    반환값은 (성공 수, 실패 수)입니다.
+    """
+    if done is None:
+        done = set()
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    counts = {'ok': 0, 'failed': 0}
+
+    async def worker():
+        while True:
+            username = await queue.get()
+            if username is None:
+                return
+            try:
+                snapshot = await analyzer.get_snapshot(username)
+            except Exception as e:
+                # 워커가 죽으면 큐가 비워지지 않아 생산자가 멈추므로 사용자 단위로 처리
+                snapshot = None
+                error = f'{type(e).__name__}: {e}'
+            else:
+                error = 'fetch_failed'
+
+            if snapshot is not None:
+                record = snapshot.summary(top_n)
+                counts['ok'] += 1
+            else:
+                record = {'username': username, 'error': error}
+                counts['failed'] += 1
+
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            output.flush()
+            if snapshot is not None and checkpoint is not None:
+                checkpoint.write(username + '\n')
+                checkpoint.flush()
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        for username in usernames:
+            if username in done:
+                continue
+            done.add(username)  # 목록에 중복된 사용자는 한 번만 분석
+            await queue.put(username)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+
+    return counts['ok'], counts['failed']
+
+
+async def main_async(args, stdout):
+    done = load_checkpoint(args.checkpoint) | load_output(args.output)
+    skipped = len(done)
+    # ETag 페이지 캐시는 같은 프로세스에서 다시 조회할 때만 쓸모가 있으므로 끔
+    analyzer = AsyncGitHubAnalyzer(concurrency=args.concurrency, page_cache_size=0)
+
+    output = stdout if args.output == '-' else open(args.output, 'a', encoding='utf-8')
+    checkpoint = open(args.checkpoint, 'a', encoding='utf-8') if args.checkpoint else None
+    try:
+        ok, failed = await run_batch(
+            analyzer,
+            read_usernames(args.input),
+            output,
+            checkpoint=checkpoint,
+            done=done,
+            concurrency=args.concurrency,
+            top_n=args.top_n,
+        )
+    finally:
+        await close_async_client()
+        if output is not stdout:
+            output.close()
+        if checkpoint is not None:
+            checkpoint.close()
+
+    print(f"✅ 완료: 성공 {ok}명, 실패 {failed}명, 체크포인트로 건너뜀 {skipped}명", file=sys.stderr)
+    print(f"   rate limit: {analyzer.rate_limiter.stats()}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GitHub 사용자 일괄 분석 (JSON Lines 출력)")
+    parser.add_argument('input', help="사용자명 목록 파일 (한 줄에 하나, '-'이면 표준 입력)")
+    parser.add_argument('-o', '--output', default='-', help="결과 파일 ('-'이면 표준 출력, 기존 파일에는 이어서 기록)")
+    parser.add_argument('--checkpoint', help="분석을 마친 사용자명을 기록할 파일 (재실행 시 건너뜀)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help="동시에 분석할 사용자 수")
+    parser.add_argument('--top-n', type=int, default=5, help="사용자별 인기 레포지토리 수")
+    args = parser.parse_args()
+
+    # 결과를 표준 출력으로 보낼 때는 분석기의 안내/에러 메시지를 표준 에러로 돌림
+    stdout = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr if args.output == '-' else stdout):
+        asyncio.run(main_async(args, stdout))
+
+
+if __name__ == '__main__':
+    main()
@@ -12,24 +12,121 @@ Google OAuth 2.0 로그인 예제 (FastAPI)
 3. 다음 명령어로 서버를 실행합니다:
    python src/google_oauth.py
 4. 브라우저에서 http://localhost:8000/login 으로 접속합니다.
+
+콜백은 비동기로 처리합니다.
+- 토큰 교환은 공용 비동기 HTTP 클라이언트(async_http)로 보내므로 스레드 풀을 차지하지 않습니다.
+- openid 범위로 받은 id_token을 Google 공개 키(JWKS)로 직접 검증해서 사용자 정보를 얻으므로
+  userinfo API를 따로 호출하지 않습니다. (콜백당 업스트림 요청 1번)
+- Google의 discovery 문서와 JWKS는 응답의 Cache-Control max-age 동안 메모리에 캐시하고,
+  만료되면 기존 값을 쓰면서 백그라운드에서 갱신합니다. (ttl_cache)
 """
 
-import requests
-import os
+import re
+import time
+import urllib.parse
+
+import jwt
 from fastapi import FastAPI, Request
 from fastapi.responses import RedirectResponse, JSONResponse
-import urllib.parse
-from dotenv import load_dotenv
 
-# .env 파일에서 환경 변수 로드
-load_dotenv()
+from async_http import get_async_client
+from config import get_env
+from lazy_import import lazy_import
+from single_flight import SingleFlight
+from ttl_cache import TTLCache
+
+httpx = lazy_import('httpx')
 
 app = FastAPI(title="Google OAuth 2.0 예제", description="FastAPI를 사용한 Google 로그인 예제")
 
 # 환경 변수에서 설정 로드
-GOOGLE_CLIENT_ID = os.getenv('GOOGLE_CLIENT_ID')
-GOOGLE_CLIENT_SECRET = os.getenv('GOOGLE_CLIENT_SECRET')
-REDIRECT_URI = os.getenv('GOOGLE_REDIRECT_URI', 'http://localhost:8000/callback')
+GOOGLE_CLIENT_ID = get_env('GOOGLE_CLIENT_ID')
+GOOGLE_CLIENT_SECRET = get_env('GOOGLE_CLIENT_SECRET')
+REDIRECT_URI = get_env('GOOGLE_REDIRECT_URI', 'http://localhost:8000/callback')
+
+DISCOVERY_URL = 'https://accounts.google.com/.well-known/openid-configuration'
+USERINFO_URL = 'https://www.googleapis.com/oauth2/v2/userinfo'
+GOOGLE_ISSUERS = ['https://accounts.google.com', 'accounts.google.com']
+# Cache-Control이 없을 때 캐시할 시간 (초)
+DEFAULT_CACHE_TTL = 3600
+# 서버와 시계가 조금 달라도 방금 발급된 id_token을 거절하지 않도록 허용하는 오차 (초)
+CLOCK_SKEW = 60
+
+# URL → JSON 응답 (discovery 문서, JWKS)
+documents = TTLCache(maxsize=16, default_ttl=DEFAULT_CACHE_TTL, max_stale=86400)
+# 캐시가 비어 있을 때 동시에 들어온 콜백이 같은 문서를 한 번만 받도록 합침
+flight = SingleFlight()
+
+
+def cache_expiry(response):
+    """응답의 Cache-Control max-age(에서 Age를 뺀 값)로 만료 시각 계산, 없으면 None"""
+    match = re.search(r'max-age=(\d+)', response.headers.get('cache-control', ''))
+    if not match:
+        return None
+    age = int(response.headers.get('age', '0') or 0)
+    return time.time() + max(0, int(match.group(1)) - age)
+
+
+async def fetch_document(url):
+    """JSON 문서를 가져와서 (데이터, 만료 시각) 반환"""
+    response = await get_async_client().get(url)
+    response.raise_for_status()
+    return response.json(), cache_expiry(response)
+
+
+async def get_document(url):
+    """캐시된 JSON 문서 반환 (없으면 가져오고, 만료됐으면 백그라운드에서 갱신)"""
+    return await documents.aget_or_load(url, lambda: flight.do_async(url, lambda: fetch_document(url)))
+
+
+async def get_signing_key(id_token):
+    """id_token 헤더의 kid에 해당하는 Google 공개 키 반환"""
+    kid = jwt.get_unverified_header(id_token).get('kid')
+    jwks_uri = (await get_document(DISCOVERY_URL))['jwks_uri']
+
+    jwks = jwt.PyJWKSet.from_dict(await get_document(jwks_uri))
+    for key in jwks.keys:
+        if key.key_id == kid:
+            return key
+
+    # 키가 교체된 직후일 수 있으므로 JWKS를 한 번만 새로 받아서 다시 찾음 (동시 요청은 합침)
+    async def refresh():
+        data, expires_at = await fetch_document(jwks_uri)
+        documents.set(jwks_uri, data, expires_at)
+        return data
+
+    jwks = jwt.PyJWKSet.from_dict(await flight.do_async(f'refresh:{jwks_uri}', refresh))
+    for key in jwks.keys:
+        if key.key_id == kid:
+            return key
+    raise jwt.InvalidTokenError(f'알 수 없는 서명 키입니다: {kid}')
+
+
+async def verify_id_token(id_token):
+    """Google id_token의 서명, 발급자, 대상(client_id), 만료 시각을 검증하고 클레임 반환"""
+    key = await get_signing_key(id_token)
+    return jwt.decode(
+        id_token,
+        key.key,
+        algorithms=['RS256'],
+        audience=GOOGLE_CLIENT_ID,
+        issuer=GOOGLE_ISSUERS,
+        leeway=CLOCK_SKEW,
+    )
+
+
+def user_from_claims(claims):
+    """id_token 클레임을 userinfo(v2) 응답과 같은 형식으로 변환"""
+    user = {
+        'id': claims['sub'],
+        'email': claims.get('email'),
+        'verified_email': claims.get('email_verified'),
+        'name': claims.get('name'),
+        'given_name': claims.get('given_name'),
+        'family_name': claims.get('family_name'),
+        'picture': claims.get('picture'),
+    }
+    return {key: value for key, value in user.items() if value is not None}
 
 
 @app.get("/")
@@ -57,7 +154,8 @@ def login_with_google():
             status_code=500
         )
     
-    scope = 'profile email'
+    # openid: 토큰 교환 응답에 id_token을 포함시켜 userinfo 호출을 생략
+    scope = 'openid profile email'
     
     params = {
         'client_id': GOOGLE_CLIENT_ID,
@@ -71,12 +169,12 @@ def login_with_google():
 
 
 @app.get('/callback')
-def handle_callback(request: Request):
+async def handle_callback(request: Request):
     """
     OAuth 콜백 처리
     
-    Google에서 리다이렉트된 인증 코드를 받아 액세스 토큰으로 교환하고,
-    사용자 정보를 가져옵니다.
+    Google에서 리다이렉트된 인증 코드를 토큰으로 교환하고,
+    함께 받은 id_token을 로컬에서 검증해서 사용자 정보를 얻습니다.
     """
     if not all([GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET]):
         return JSONResponse(
@@ -102,8 +200,9 @@ def handle_callback(request: Request):
     }
     
     try:
-        token_response = requests.post(
-            'https://oauth2.googleapis.com/token',
+        discovery = await get_document(DISCOVERY_URL)
+        token_response = await get_async_client().post(
+            discovery['token_endpoint'],
             data=token_data
         )
         
@@ -116,29 +215,39 @@ def handle_callback(request: Request):
                 status_code=token_response.status_code
             )
         
-        access_token = token_response.json()['access_token']
+        tokens = token_response.json()
         
-        # 액세스 토큰으로 사용자 정보 조회
-        user_info_response = requests.get(
-            'https://www.googleapis.com/oauth2/v2/userinfo',
-            headers={'Authorization': f'Bearer {access_token}'}
-        )
-        
-        if user_info_response.status_code != 200:
-            return JSONResponse(
-                content={
-                    "error": "사용자 정보 조회 실패",
-                    "details": user_info_response.text
-                },
-                status_code=user_info_response.status_code
+        if 'id_token' in tokens:
+            # id_token을 직접 검증하므로 userinfo 요청이 필요 없음
+            user = user_from_claims(await verify_id_token(tokens['id_token']))
+        else:
+            # openid 범위 없이 발급된 경우에만 userinfo 조회
+            user_info_response = await get_async_client().get(
+                USERINFO_URL,
+                headers={'Authorization': f"Bearer {tokens['access_token']}"}
             )
+            
+            if user_info_response.status_code != 200:
+                return JSONResponse(
+                    content={
+                        "error": "사용자 정보 조회 실패",
+                        "details": user_info_response.text
+                    },
+                    status_code=user_info_response.status_code
+                )
+            
+            user = user_info_response.json()
         
-        user = user_info_response.json()
         print(f"로그인 성공: {user.get('email', 'N/A')}")
         
         return JSONResponse(content=user)
     
-    except requests.exceptions.RequestException as e:
+    except jwt.InvalidTokenError as e:
+        return JSONResponse(
+            content={"error": "id_token 검증 실패", "details": str(e)},
+            status_code=401
+        )
+    except httpx.HTTPError as e:
         return JSONResponse(
             content={"error": "API 요청 중 오류 발생", "details": str(e)},
             status_code=500
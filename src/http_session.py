@@ -0,0 +1,150 @@
+"""
+공용 HTTP 세션 (커넥션 풀)
+
+requests.get()/requests.post()를 그대로 호출하면 매 요청마다
+새 TCP 연결과 TLS 핸드셰이크가 발생합니다.
+이 모듈은 커넥션 풀을 가진 requests.Session 하나를 모든 REST 클라이언트가
+공유하도록 해서 연결을 재사용(keep-alive)합니다.
+
+사용 방법:
+    from http_session import get_session
+
+    response = get_session().get(url, params=params)
+
+    # RateLimiter가 429를 직접 처리하는 호출 (429는 재시도하지 않고 바로 반환)
+    response = get_rate_limited_session().get(url)
+
+설정 가능한 항목:
+- pool_connections : 호스트별로 유지할 커넥션 풀 개수
+- pool_maxsize     : 풀 하나당 최대 커넥션 수
+- timeout          : 요청에 timeout을 지정하지 않았을 때 사용할 기본값 (초)
+- retries          : 연결 오류/일시적 서버 오류 시 재시도 횟수
+- backoff_factor   : 재시도 간 대기 시간 계수 (0.5 → 0.5s, 1s, 2s ...)
+- status_forcelist : 재시도할 HTTP 상태 코드
+"""
+
+import functools
+import threading
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 20
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# 429는 RateLimiter가 응답 헤더를 보고 직접 기다렸다가 재시도하므로 세션에서는 재시도하지 않음
+RATE_LIMITED_RETRY_STATUS_CODES = tuple(code for code in RETRY_STATUS_CODES if code != 429)
+
+
+@functools.cache
+def pooled_session_class():
+    """기본 timeout을 적용하는 requests.Session 하위 클래스
+
+    requests는 import 비용이 크므로 모듈을 import할 때가 아니라 세션을 처음 만들 때 정의합니다.
+    """
+    import requests
+
+    class PooledSession(requests.Session):
+        def __init__(self, timeout=DEFAULT_TIMEOUT):
+            super().__init__()
+            self.default_timeout = timeout
+
+        def request(self, method, url, **kwargs):
+            kwargs.setdefault("timeout", self.default_timeout)
+            return super().request(method, url, **kwargs)
+
+    return PooledSession
+
+
+def create_session(
+    pool_connections=DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize=DEFAULT_POOL_MAXSIZE,
+    timeout=DEFAULT_TIMEOUT,
+    retries=DEFAULT_RETRIES,
+    backoff_factor=DEFAULT_BACKOFF_FACTOR,
+    keep_alive=True,
+    status_forcelist=RETRY_STATUS_CODES,
+):
+    """커넥션 풀과 재시도 정책이 설정된 세션 생성"""
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = pooled_session_class()(timeout=timeout)
+
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=status_forcelist,
+        # POST(토큰 교환 등)는 멱등이 아니므로 재시도하지 않음
+        allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),
+        respect_retry_after_header=True,
+        # 상태 코드 재시도가 끝나면 예외 대신 마지막 응답을 그대로 반환
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+
+    return session
+
+
+_session = None
+_rate_limited_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """모든 클라이언트가 공유하는 세션 반환 (처음 호출 시 생성)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def get_rate_limited_session():
+    """RateLimiter로 속도를 조절하는 호출용 공유 세션 (429를 재시도하지 않음)
+
+    429 응답은 urllib3 안에서 재시도하지 않고 그대로 돌려주므로
+    RateLimiter.update()/should_retry()가 모든 응답의 헤더를 보고 재시도 시각을 정합니다.
+    """
+    global _rate_limited_session
+    if _rate_limited_session is None:
+        with _session_lock:
+            if _rate_limited_session is None:
+                _rate_limited_session = create_session(status_forcelist=RATE_LIMITED_RETRY_STATUS_CODES)
+    return _rate_limited_session
+
+
+def configure_session(**kwargs):
+    """공유 세션을 새 설정으로 교체 (create_session()과 같은 인자 사용)"""
+    global _session
+    with _session_lock:
+        old_session = _session
+        _session = create_session(**kwargs)
+    if old_session is not None:
+        old_session.close()
+    return _session
+
+
+def close_session():
+    """공유 세션의 커넥션을 모두 닫기"""
+    global _session, _rate_limited_session
+    with _session_lock:
+        old_sessions = [_session, _rate_limited_session]
+        _session = None
+        _rate_limited_session = None
+    for old_session in old_sessions:
+        if old_session is not None:
+            old_session.close()
@@ -0,0 +1,209 @@
+"""
+비전 API용 이미지 전처리
+
+이미지를 원본 그대로 올리면 업로드 용량, 응답 시간, 이미지 토큰 비용이 모두 커집니다.
+요청 전에 이미지를 한 번 줄이고 다시 인코딩해서 openai_image.py, gemini_image.py가 같이 사용합니다.
+
+- 가장 긴 변을 max_edge 픽셀 이하로 줄입니다. (기본 1536)
+  JPEG은 Image.draft()로 디코딩 단계에서부터 작게 읽으므로 큰 사진도 빠릅니다.
+- EXIF 회전 정보를 적용한 뒤 JPEG(투명 배경이 있으면 WEBP)으로 다시 인코딩하고,
+  실제 형식에 맞는 MIME 타입을 함께 돌려줍니다.
+  이미 충분히 작은 JPEG/PNG/WEBP 원본이 다시 인코딩한 결과보다 작으면 원본을 그대로 씁니다.
+- 결과는 원본 내용의 SHA-256 해시로 메모리(LRU)와 디스크에 캐시하므로
+  같은 이미지를 여러 번 보내도 인코딩은 한 번만 합니다.
+
+디스크 캐시 위치는 환경 변수 IMAGE_CACHE_DIR로 바꿀 수 있습니다.
+
+사용 방법:
+    image = prepare_image('photo.jpg')
+    image.mime_type, len(image.data), image.size
+    image_url = image.to_data_url()               # OpenAI input_image
+    part = types.Part.from_bytes(data=image.data, mime_type=image.mime_type)   # Gemini
+"""
+
+import base64
+import hashlib
+import io
+import threading
+from pathlib import Path
+
+from config import get_env
+from single_flight import SingleFlight
+from ttl_cache import TTLCache
+
+DEFAULT_MAX_EDGE = 1536
+DEFAULT_QUALITY = 85
+DEFAULT_CACHE_DIR = '.cache/images'
+# 다시 인코딩하지 않고 원본을 그대로 보내도 되는 형식
+PASSTHROUGH_FORMATS = {'JPEG': 'image/jpeg', 'PNG': 'image/png', 'WEBP': 'image/webp'}
+MIME_TYPES = {'JPEG': 'image/jpeg', 'WEBP': 'image/webp'}
+EXTENSIONS = {'image/jpeg': '.jpg', 'image/png': '.png', 'image/webp': '.webp'}
+
+
+class PreparedImage:
+    """전처리한 이미지 (인코딩된 바이트, MIME 타입, 크기)"""
+
+    def __init__(self, data, mime_type, size, digest):
+        self.data = data
+        self.mime_type = mime_type
+        self.size = size  # (가로, 세로)
+        self.digest = digest
+
+    def to_data_url(self):
+        encoded = base64.b64encode(self.data).decode('utf-8')
+        return f'data:{self.mime_type};base64,{encoded}'
+
+    def __repr__(self):
+        return f'PreparedImage({self.mime_type}, {self.size[0]}x{self.size[1]}, {len(self.data)} bytes)'
+
+
+def read_source(source):
+    """파일 경로 또는 바이트 → 원본 바이트"""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    return Path(source).read_bytes()
+
+
+def encode_image(raw, max_edge=DEFAULT_MAX_EDGE, quality=DEFAULT_QUALITY):
+    """원본 바이트를 줄이고 다시 인코딩 → (바이트, MIME 타입, 크기)"""
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(raw)) as img:
+        original_format = img.format
+        original_size = img.size
+        rotated = img.getexif().get(0x0112, 1) != 1
+        # JPEG은 디코딩할 때부터 1/2, 1/4, 1/8 크기로 읽음 (max_edge보다 작아지지는 않음)
+        img.draft('RGB', (max_edge, max_edge))
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+        has_alpha = img.mode in ('RGBA', 'LA', 'PA') or (img.mode == 'P' and 'transparency' in img.info)
+        if has_alpha:
+            output_format = 'WEBP'
+            img = img.convert('RGBA')
+        else:
+            output_format = 'JPEG'
+            img = img.convert('RGB')
+
+        buffer = io.BytesIO()
+        if output_format == 'JPEG':
+            img.save(buffer, 'JPEG', quality=quality, optimize=True, progressive=True)
+        else:
+            img.save(buffer, 'WEBP', quality=quality, method=4)
+        data = buffer.getvalue()
+        size = img.size
+
+    # 줄이거나 회전할 필요가 없었고 원본이 더 작으면 원본 사용
+    if (
+        size == original_size
+        and not rotated
+        and original_format in PASSTHROUGH_FORMATS
+        and len(raw) <= len(data)
+    ):
+        return raw, PASSTHROUGH_FORMATS[original_format], size
+    return data, MIME_TYPES[output_format], size
+
+
+class ImagePreprocessor:
+    """원본 내용 해시로 전처리 결과를 캐시하는 이미지 전처리기"""
+
+    def __init__(self, max_edge=DEFAULT_MAX_EDGE, quality=DEFAULT_QUALITY,
+                 cache_dir=DEFAULT_CACHE_DIR, maxsize=64):
+        self.max_edge = max_edge
+        self.quality = quality
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.memory = TTLCache(maxsize=maxsize, default_ttl=24 * 3600, max_stale=0)
+        self._flight = SingleFlight()
+        self.encoded = 0
+        self.disk_hits = 0
+
+    def cache_key(self, raw):
+        digest = hashlib.sha256(raw).hexdigest()
+        return f'{digest[:32]}-{self.max_edge}-{self.quality}'
+
+    def _disk_path(self, key, mime_type):
+        return self.cache_dir / f'{key}{EXTENSIONS[mime_type]}'
+
+    def _load_disk(self, key):
+        if self.cache_dir is None:
+            return None
+        for mime_type, extension in EXTENSIONS.items():
+            path = self.cache_dir / f'{key}{extension}'
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                continue
+            from PIL import Image
+            with Image.open(io.BytesIO(data)) as img:
+                size = img.size
+            return PreparedImage(data, mime_type, size, key)
+        return None
+
+    def _save_disk(self, image):
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._disk_path(image.digest, image.mime_type)
+            # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓰고 이름 변경
+            temp = path.with_suffix(path.suffix + f'.{threading.get_ident()}.tmp')
+            temp.write_bytes(image.data)
+            temp.replace(path)
+        except OSError as e:
+            print(f'이미지 캐시 저장 실패: {e}')
+
+    def prepare(self, source):
+        """파일 경로 또는 바이트 → PreparedImage"""
+        raw = read_source(source)
+        key = self.cache_key(raw)
+
+        def load():
+            image = self._load_disk(key)
+            if image is not None:
+                self.disk_hits += 1
+                return image, None
+            data, mime_type, size = encode_image(raw, self.max_edge, self.quality)
+            image = PreparedImage(data, mime_type, size, key)
+            self.encoded += 1
+            self._save_disk(image)
+            return image, None
+
+        # 같은 이미지를 동시에 요청해도 인코딩은 한 번만
+        return self.memory.get_or_load(key, lambda: self._flight.do(key, load))
+
+    def stats(self):
+        return {**self.memory.stats(), 'disk_hits': self.disk_hits, 'encoded': self.encoded}
+
+
+_preprocessor = None
+_preprocessor_lock = threading.Lock()
+
+
+def get_image_preprocessor():
+    """공용 이미지 전처리기 반환 (처음 호출 시 생성)"""
+    global _preprocessor
+    if _preprocessor is None:
+        with _preprocessor_lock:
+            if _preprocessor is None:
+                _preprocessor = ImagePreprocessor(cache_dir=get_env('IMAGE_CACHE_DIR', DEFAULT_CACHE_DIR))
+    return _preprocessor
+
+
+def prepare_image(source):
+    """공용 전처리기로 이미지 전처리 (파일 경로 또는 바이트)"""
+    return get_image_preprocessor().prepare(source)
+
+
+if __name__ == '__main__':
+    import time
+
+    image_path = Path(__file__).resolve().parent / 'sample_image.jpg'
+    original = image_path.stat().st_size
+
+    for attempt in range(2):
+        start = time.perf_counter()
+        image = prepare_image(image_path)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f'{image} ← 원본 {original} bytes ({elapsed:.1f} ms)')
+
+    print(get_image_preprocessor().stats())
@@ -3,6 +3,14 @@ JWT 인증 예제 (FastAPI)
 
 이 예제는 JWT 토큰을 발급하고 보호된 API를 호출하는 기본 흐름을 보여줍니다.
 
+- 검증에 성공한 토큰은 토큰 해시를 키로 exp까지 메모리(LRU)에 보관하므로,
+  같은 토큰으로 다시 요청하면 서명 검증과 JSON 파싱을 건너뜁니다.
+  캐시 크기는 환경 변수 JWT_CACHE_SIZE로 바꿀 수 있습니다. (0이면 캐시 사용 안 함)
+- 토큰의 JSON 인코딩/디코딩은 orjson을 사용합니다.
+- 인증 경로는 CPU 작업만 하므로 스레드 풀을 거치지 않도록 async 함수로 둡니다.
+- 토큰마다 고유한 jti를 넣어 발급하고, /logout으로 토큰을 취소할 수 있습니다.
+  취소 여부는 워커들이 공유하는 Bloom 필터로 먼저 확인합니다. (jwt_revocation.py)
+
 사용 방법:
 1. .env 파일에 다음 환경 변수를 설정합니다:
    - JWT_SECRET_KEY
@@ -11,46 +19,114 @@ JWT 인증 예제 (FastAPI)
    - openssl rand -hex 32
 3. 다음 명령어로 서버를 실행합니다:
    python src/jwt_fastapi_example.py
+4. 인증 처리량 벤치마크 (캐시 사용/미사용 비교):
+   python src/bench_jwt.py
 """
 
-import os
-from datetime import datetime, timedelta
+import hashlib
+import secrets
+import time
+from contextlib import asynccontextmanager
 
 import jwt
-import requests
+import orjson
 import uvicorn
-from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import Body, Depends, FastAPI, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-load_dotenv()
+from config import get_env
+from jwt_revocation import close_revocation_list, get_revocation_list
+from ttl_cache import TTLCache
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # 다른 프로세스에서 취소한 토큰을 주기적으로 반영
+    revocations = get_revocation_list()
+    revocations.start()
+    yield
+    # 마지막으로 종료하는 워커가 공유 메모리를 삭제
+    close_revocation_list()
 
-app = FastAPI()
 
-SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+app = FastAPI(lifespan=lifespan)
+
+SECRET_KEY = get_env("JWT_SECRET_KEY")
 
 if not SECRET_KEY:
     raise ValueError("환경 변수 JWT_SECRET_KEY가 설정되지 않았습니다.")
 
+TOKEN_LIFETIME = 3600
+# 검증한 토큰을 보관할 최대 개수 (0이면 캐시 사용 안 함)
+TOKEN_CACHE_SIZE = int(get_env("JWT_CACHE_SIZE", "10000"))
+
 security = HTTPBearer()
 
 
+class OrjsonJWT(jwt.PyJWT):
+    """클레임 JSON 인코딩/디코딩에 orjson을 사용하는 PyJWT
+
+    PyJWT의 내부 메서드를 덮어쓰므로 requirements.txt에서 버전 범위를 고정하고,
+    tests/test_jwt_fastapi_example.py에서 인코딩/검증이 그대로 동작하는지 확인합니다.
+    """
+
+    def _encode_payload(self, payload, headers=None, json_encoder=None):
+        return orjson.dumps(payload)
+
+    def _decode_payload(self, decoded):
+        try:
+            payload = orjson.loads(decoded["payload"])
+        except orjson.JSONDecodeError as e:
+            raise jwt.DecodeError(f"Invalid payload string: {e}") from e
+        if not isinstance(payload, dict):
+            raise jwt.DecodeError("Invalid payload string: must be a json object")
+        return payload
+
+
+jwt_codec = OrjsonJWT()
+# 토큰 해시 → 검증한 클레임 (항목마다 토큰의 exp에 만료)
+verified_tokens = TTLCache(maxsize=TOKEN_CACHE_SIZE, default_ttl=TOKEN_LIFETIME, max_stale=0)
+
+
+def token_digest(token):
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
 def generate_token(user):
     payload = {
         "user_id": user["id"],
         "email": user["email"],
         "role": user["role"],
-        "exp": datetime.utcnow() + timedelta(hours=1),
+        "jti": secrets.token_urlsafe(16),
+        # datetime 변환 없이 바로 unix 시각
+        "exp": int(time.time()) + TOKEN_LIFETIME,
     }
-    return jwt.encode(payload, SECRET_KEY, algorithm="HS256")
+    return jwt_codec.encode(payload, SECRET_KEY, algorithm="HS256")
+
+
+def decode_token(token):
+    """토큰 검증 (캐시에 있으면 캐시된 클레임 반환)"""
+    if not TOKEN_CACHE_SIZE:
+        return jwt_codec.decode(token, SECRET_KEY, algorithms=["HS256"])
+
+    key = token_digest(token)
+    claims, fresh = verified_tokens.lookup(key)
+    if fresh:
+        return claims
+
+    claims = jwt_codec.decode(token, SECRET_KEY, algorithms=["HS256"])
+    # exp가 지나면 캐시에서도 만료되므로 만료된 토큰을 캐시로 통과시키지 않음
+    exp = claims.get("exp")
+    verified_tokens.set(key, claims, exp if isinstance(exp, (int, float)) else None)
+    return claims
 
 
-def verify_token(
+async def verify_token(
     credentials=Depends(security),
 ):
     token = credentials.credentials
     try:
-        return jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+        claims = decode_token(token)
     except jwt.ExpiredSignatureError as exc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,9 +138,17 @@ def verify_token(
             detail="유효하지 않은 토큰입니다.",
         ) from exc
 
+    # 캐시에 있는 토큰도 취소 여부는 매번 확인 (필터에 걸리면 SQLite 조회는 스레드에서)
+    if await get_revocation_list().ais_revoked(claims.get("jti")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="취소된 토큰입니다.",
+        )
+    return claims
+
 
 @app.post("/login")
-def login(payload):
+def login(payload=Body()):
     email = payload.get("email")
     password = payload.get("password")
 
@@ -76,23 +160,24 @@ def login(payload):
     return {"token": token}
 
 
+@app.post("/logout")
+def logout(user=Depends(verify_token)):
+    if user.get("jti"):
+        get_revocation_list().revoke(user["jti"], user.get("exp") or time.time() + TOKEN_LIFETIME)
+    return {"message": "로그아웃되었습니다."}
+
+
 @app.get("/protected-data")
-def protected_data(user=Depends(verify_token)):
+async def protected_data(user=Depends(verify_token)):
     return {"message": "인증 성공!", "user": user}
 
 
 def login_and_use_api(email, password):
-    login_response = requests.post(
-        "https://api.example.com/login",
-        json={"email": email, "password": password},
-    )
-    token = login_response.json()["token"]
-
-    data_response = requests.get(
-        "https://api.example.com/protected-data",
-        headers={"Authorization": f"Bearer {token}"},
-    )
-    return data_response.json()
+    # 토큰을 재사용하므로 매번 /login을 호출하지 않음 (만료가 가까우면 미리 갱신)
+    from jwt_login_client import get_token_manager
+
+    manager = get_token_manager(email, password, base_url="https://api.example.com")
+    return manager.get("/protected-data")
 
 
 if __name__ == "__main__":
@@ -1,21 +1,47 @@
 """
 JWT 로그인 클라이언트 예제
 
+보호된 API를 호출할 때마다 /login을 다시 호출하지 않도록 TokenManager가 토큰을 재사용합니다.
+
+- 토큰의 exp는 서명 검증 없이 로컬에서 읽습니다. (검증은 서버가 함)
+- 만료 refresh_margin초 전부터는 현재 토큰을 그대로 쓰면서 백그라운드에서 새 토큰을 받습니다.
+  백그라운드 갱신이 실패하면 REFRESH_BACKOFF초부터 두 배씩(최대 MAX_REFRESH_BACKOFF초) 기다렸다가
+  다시 시도하므로, 로그인 서버가 장애일 때 요청마다 /login을 호출하지 않습니다.
+- 이미 만료됐거나 토큰이 없으면 새 토큰을 받을 때까지 기다립니다.
+  여러 스레드/코루틴이 동시에 요청해도 /login은 한 번만 호출합니다. (single_flight)
+- 401을 받으면 토큰을 버리고 새 토큰으로 정확히 한 번만 다시 요청합니다.
+- 요청은 공용 풀 세션(http_session)과 비동기 클라이언트(async_http)로 보냅니다.
+
 사용 방법:
 1) 서버 실행: python src/jwt_fastapi_example.py
 2) 클라이언트 실행: python src/jwt_login_client.py
+
+    manager = TokenManager("test@example.com", "pass1234")
+    data = manager.get("/protected-data")
+    data = await manager.aget("/protected-data")
 """
 
+import asyncio
+import base64
 import json
+import threading
+import time
 
-import requests
+from async_http import get_async_client
+from http_session import get_session
+from single_flight import SingleFlight
 
 BASE_URL = "http://localhost:8000"
+# 만료 몇 초 전부터 새 토큰을 받을지
+DEFAULT_REFRESH_MARGIN = 60
+# 백그라운드 갱신이 실패했을 때 다시 시도하기까지 기다릴 시간 (초, 실패할 때마다 두 배)
+REFRESH_BACKOFF = 1
+MAX_REFRESH_BACKOFF = 30
 
 
-def login(email, password):
-    response = requests.post(
-        f"{BASE_URL}/login",
+def login(email, password, base_url=BASE_URL):
+    response = get_session().post(
+        f"{base_url}/login",
         json={"email": email, "password": password},
         timeout=10,
     )
@@ -23,9 +49,9 @@ def login(email, password):
     return response.json()["token"]
 
 
-def fetch_protected_data(token):
-    response = requests.get(
-        f"{BASE_URL}/protected-data",
+def fetch_protected_data(token, base_url=BASE_URL):
+    response = get_session().get(
+        f"{base_url}/protected-data",
         headers={"Authorization": f"Bearer {token}"},
         timeout=10,
     )
@@ -33,11 +59,186 @@ def fetch_protected_data(token):
     return response.json()
 
 
+def token_expiry(token):
+    """서명 검증 없이 토큰의 exp(unix 시각)를 읽음, 없거나 읽을 수 없으면 None"""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenManager:
+    """토큰을 재사용하고 만료 전에 미리 갱신하는 로그인 세션 (스레드/코루틴 안전)"""
+
+    def __init__(self, email, password, base_url=BASE_URL, refresh_margin=DEFAULT_REFRESH_MARGIN):
+        self.email = email
+        self.password = password
+        self.base_url = base_url
+        self.refresh_margin = refresh_margin
+        self._token = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._refreshing = False
+        # 백그라운드 갱신 연속 실패 횟수와 다음 시도 가능 시각
+        self._refresh_failures = 0
+        self._next_refresh_at = 0.0
+        self.logins = 0
+        self.retries = 0
+        self.refresh_errors = 0
+
+    def _login(self):
+        token = login(self.email, self.password, self.base_url)
+        # exp가 없는 토큰은 401을 받을 때까지 사용
+        expires_at = token_expiry(token) or float("inf")
+        with self._lock:
+            self._token = token
+            self._expires_at = expires_at
+            self._refresh_failures = 0
+            self._next_refresh_at = 0.0
+            self.logins += 1
+        return token
+
+    def _refresh(self, stale_token):
+        """stale_token 대신 쓸 새 토큰 반환 (진행 중인 로그인이 있으면 그 결과를 같이 사용)"""
+        def refresh():
+            with self._lock:
+                # 기다리는 동안 다른 호출이 이미 새 토큰을 받았으면 그대로 사용
+                if self._token is not None and self._token != stale_token and time.time() < self._expires_at:
+                    return self._token
+            return self._login()
+
+        return self._flight.do("login", refresh)
+
+    def _refresh_in_background(self, stale_token):
+        with self._lock:
+            if self._refreshing or time.time() < self._next_refresh_at:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self._refresh(stale_token)
+            except Exception as e:
+                print(f"토큰 갱신 실패: {e}")
+                with self._lock:
+                    self._refresh_failures += 1
+                    self.refresh_errors += 1
+                    backoff = min(REFRESH_BACKOFF * 2 ** (self._refresh_failures - 1), MAX_REFRESH_BACKOFF)
+                    self._next_refresh_at = time.time() + backoff
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def get_token(self):
+        """사용할 토큰 반환 (필요하면 로그인)"""
+        with self._lock:
+            token, remaining = self._token, self._expires_at - time.time()
+        if token is None or remaining <= 0:
+            return self._refresh(token)
+        if remaining <= self.refresh_margin:
+            # 아직 유효하므로 현재 토큰을 쓰고 새 토큰은 백그라운드에서
+            self._refresh_in_background(token)
+        return token
+
+    async def aget_token(self):
+        """get_token()의 비동기 버전 (로그인은 스레드에서 실행해서 이벤트 루프를 막지 않음)"""
+        with self._lock:
+            token, remaining = self._token, self._expires_at - time.time()
+        if token is None or remaining <= 0:
+            return await asyncio.to_thread(self._refresh, token)
+        if remaining <= self.refresh_margin:
+            self._refresh_in_background(token)
+        return token
+
+    def invalidate(self, token):
+        """서버가 거절한 토큰 버리기 (그 사이 다른 호출이 받은 새 토큰은 유지)"""
+        with self._lock:
+            if self._token == token:
+                self._token = None
+                self._expires_at = 0.0
+
+    def request(self, method, path, **kwargs):
+        """인증 헤더를 붙여 요청하고 JSON 응답 반환 (401이면 새 토큰으로 한 번 재시도)"""
+        headers = kwargs.pop("headers", {})
+        for attempt in range(2):
+            token = self.get_token()
+            response = get_session().request(
+                method, f"{self.base_url}{path}",
+                headers={**headers, "Authorization": f"Bearer {token}"}, **kwargs
+            )
+            if response.status_code != 401 or attempt:
+                break
+            self.invalidate(token)
+            with self._lock:
+                self.retries += 1
+        response.raise_for_status()
+        return response.json()
+
+    async def arequest(self, method, path, **kwargs):
+        """request()의 비동기 버전"""
+        headers = kwargs.pop("headers", {})
+        for attempt in range(2):
+            token = await self.aget_token()
+            response = await get_async_client().request(
+                method, f"{self.base_url}{path}",
+                headers={**headers, "Authorization": f"Bearer {token}"}, **kwargs
+            )
+            if response.status_code != 401 or attempt:
+                break
+            self.invalidate(token)
+            with self._lock:
+                self.retries += 1
+        response.raise_for_status()
+        return response.json()
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    async def aget(self, path, **kwargs):
+        return await self.arequest("GET", path, **kwargs)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "logins": self.logins,
+                "retries": self.retries,
+                "refresh_errors": self.refresh_errors,
+                "expires_at": self._expires_at,
+            }
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_token_manager(email, password, base_url=BASE_URL):
+    """같은 계정과 서버에 대해 공유하는 TokenManager 반환"""
+    key = (base_url, email)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None or manager.password != password:
+            manager = TokenManager(email, password, base_url)
+            _managers[key] = manager
+    return manager
+
+
 def main():
-    token = login("test@example.com", "pass1234")
-    data = fetch_protected_data(token)
+    from concurrent.futures import ThreadPoolExecutor
+
+    manager = get_token_manager("test@example.com", "pass1234")
+    data = manager.get("/protected-data")
     print(json.dumps(data, ensure_ascii=False, indent=2))
 
+    # 동시에 여러 번 호출해도 토큰은 재사용
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: manager.get("/protected-data"), range(20)))
+    print(manager.stats())
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,490 @@
+"""
+JWT 취소 목록 (Bloom 필터 + SQLite)
+
+토큰마다 고유한 jti를 넣어 발급하고, 취소한 jti를 SQLite 파일에 기록합니다.
+요청마다 DB를 조회하지 않도록 취소된 jti를 메모리의 Bloom 필터로 먼저 확인합니다.
+
+- Bloom 필터에 없으면 취소되지 않은 토큰입니다. (대부분의 요청, 약 1µs)
+- 필터에 있다고 나올 때만 SQLite의 정확한 목록을 조회해서 오탐을 걸러냅니다.
+- 필터의 비트 배열은 공유 메모리에 두므로 같은 서버의 uvicorn 워커들이 하나를 같이 사용합니다.
+  한 워커에서 취소하면 다른 워커에도 바로 반영됩니다.
+- 백그라운드 스레드가 sync_interval초마다 SQLite에서 새로 취소된 jti를 필터에 추가합니다.
+  (관리 스크립트 등 다른 프로세스에서 취소한 경우)
+  rebuild_interval마다 만료된 jti를 뺀 필터를 다시 만들어서 오탐률이 늘어나지 않게 합니다.
+
+취소 목록 파일 위치는 환경 변수 JWT_REVOCATION_PATH로,
+공유 메모리 이름은 JWT_REVOCATION_SHM으로 바꿀 수 있습니다.
+
+공유 메모리는 연결한 프로세스 수를 기록해 두고, 마지막으로 close()하는 프로세스가 삭제합니다.
+(서버는 lifespan 종료 시 close_revocation_list()를 호출)
+필터에는 만든 취소 목록 파일이 기록되어 있어서, 다른 JWT_REVOCATION_PATH로 시작하면 다시 만듭니다.
+프로세스가 강제 종료되어 공유 메모리가 남았다면 서버를 멈춘 뒤 직접 삭제하세요:
+    python src/jwt_revocation.py unlink
+
+사용 방법:
+    revocations = get_revocation_list()
+    revocations.start()                      # 백그라운드 동기화 시작
+    revocations.revoke(claims['jti'], claims['exp'])
+    if revocations.is_revoked(claims['jti']):
+        ...
+    close_revocation_list()                  # 종료 시 (마지막 프로세스면 공유 메모리 삭제)
+"""
+
+import argparse
+import asyncio
+import atexit
+import contextlib
+import hashlib
+import math
+import os
+import sqlite3
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from config import get_env
+
+DEFAULT_STORE_PATH = '.cache/revoked_tokens.sqlite3'
+DEFAULT_SHM_NAME = 'jwt_revocation'
+# 필터에 넣을 최대 jti 수와 목표 오탐률
+DEFAULT_CAPACITY = 100_000
+DEFAULT_ERROR_RATE = 0.001
+DEFAULT_SYNC_INTERVAL = 5
+DEFAULT_REBUILD_INTERVAL = 3600
+
+# 공유 메모리 앞부분: 식별자, 비트 수, 해시 함수 수, 마지막으로 다시 만든 시각,
+# 취소 목록 파일 식별자, 연결한 프로세스 수
+HEADER = struct.Struct('<8sQQd8sq')
+MAGIC = b'JWTBLOM2'
+REBUILT_AT = struct.Struct('<d')
+REBUILT_AT_OFFSET = 24
+ATTACHED = struct.Struct('<q')
+ATTACHED_OFFSET = 40
+HASH_SEED = 0x9E3779B9
+# 프로세스마다 revoked_at을 기록하는 시점과 커밋 시점이 달라서 동기화할 때 이만큼(초) 겹쳐서 다시 읽음
+SYNC_OVERLAP = 2
+
+
+class RevocationStore:
+    """취소한 jti의 정확한 목록 (SQLite, 여러 프로세스가 공유)"""
+
+    def __init__(self, path=DEFAULT_STORE_PATH, timeout=30):
+        self.path = Path(path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS revoked ('
+            ' jti TEXT PRIMARY KEY,'
+            ' expires_at REAL NOT NULL,'
+            ' revoked_at REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS revoked_revoked_at ON revoked (revoked_at)')
+
+    def _connect(self):
+        """스레드마다 별도의 연결 사용"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def add(self, jti, expires_at):
+        """jti를 토큰의 만료 시각(expires_at)까지 취소 목록에 기록"""
+        self._connect().execute(
+            'INSERT OR REPLACE INTO revoked (jti, expires_at, revoked_at) VALUES (?, ?, ?)',
+            (jti, expires_at, time.time()),
+        )
+
+    def contains(self, jti):
+        row = self._connect().execute(
+            'SELECT expires_at FROM revoked WHERE jti = ?', (jti,)
+        ).fetchone()
+        return row is not None and row[0] >= time.time()
+
+    def changes_since(self, revoked_at):
+        """revoked_at 이후에 취소된 (jti, revoked_at) 목록"""
+        return self._connect().execute(
+            'SELECT jti, revoked_at FROM revoked WHERE revoked_at > ? AND expires_at >= ?',
+            (revoked_at, time.time()),
+        ).fetchall()
+
+    def purge(self):
+        """이미 만료된 토큰은 취소 목록에 둘 필요가 없으므로 삭제"""
+        self._connect().execute('DELETE FROM revoked WHERE expires_at < ?', (time.time(),))
+
+    def count(self):
+        (count,) = self._connect().execute('SELECT COUNT(*) FROM revoked').fetchone()
+        return count
+
+
+class BloomFilter:
+    """bytearray 또는 공유 메모리 버퍼 위의 Bloom 필터 (비트를 지우지는 않음)"""
+
+    def __init__(self, size, hashes, buffer=None):
+        self.size = size  # 비트 수
+        self.hashes = hashes
+        self.bits = buffer if buffer is not None else bytearray((size + 7) // 8)
+
+    @staticmethod
+    def optimal(capacity, error_rate):
+        """capacity개를 넣었을 때 오탐률이 error_rate가 되는 (비트 수, 해시 함수 수)"""
+        size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        hashes = max(1, round(size / capacity * math.log(2)))
+        return size, hashes
+
+    @staticmethod
+    def _hashes(item):
+        # 시드가 다른 CRC32 두 개로 k개의 위치를 만듦 (double hashing: h1 + i * h2)
+        # jti는 서버가 만든 난수이고 서명을 검증한 뒤에만 확인하므로 암호학적 해시가 필요 없음
+        data = item.encode('utf-8')
+        return zlib.crc32(data), zlib.crc32(data, HASH_SEED) | 1
+
+    def add(self, item):
+        h1, h2 = self._hashes(item)
+        bits = self.bits
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % self.size
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        # 요청마다 실행되므로 함수 호출 없이 계산하고, 0인 비트를 만나면 바로 종료
+        data = item.encode('utf-8')
+        h1 = zlib.crc32(data)
+        h2 = zlib.crc32(data, HASH_SEED) | 1
+        bits = self.bits
+        size = self.size
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % size
+            if not bits[position >> 3] >> (position & 7) & 1:
+                return False
+        return True
+
+    def clear(self):
+        self.bits[:] = bytes(len(self.bits))
+
+
+def open_shared_memory(name, create=False, size=0):
+    """자동 정리(resource_tracker)에서 제외한 SharedMemory 열기
+
+    워커 하나가 끝날 때 다른 워커가 쓰는 공유 메모리를 지우지 않도록 삭제는 직접 관리합니다.
+    """
+    from multiprocessing import resource_tracker, shared_memory
+
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+    if os.name == 'posix':
+        # 3.12 이하에는 track 인자가 없으므로 등록을 해제 (POSIX에서 등록 이름은 '/' + 이름)
+        resource_tracker.unregister(f'/{shm.name}', 'shared_memory')
+    return shm
+
+
+def unlink_shared_memory(shm):
+    """open_shared_memory()로 연 공유 메모리 삭제 (이미 삭제됐으면 False)"""
+    tracked = sys.version_info < (3, 13) and os.name == 'posix'
+    if tracked:
+        # 3.12 이하의 unlink()는 자동 정리 목록에서 빼려고 하므로 먼저 등록
+        from multiprocessing import resource_tracker
+        resource_tracker.register(f'/{shm.name}', 'shared_memory')
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        # 관리 명령 등으로 이미 삭제된 경우
+        if tracked:
+            resource_tracker.unregister(f'/{shm.name}', 'shared_memory')
+        return False
+    return True
+
+
+def attach_shared_memory(name, size):
+    """이름이 name인 공유 메모리를 만들거나 이미 있으면 연결 → (SharedMemory, 새로 만들었는지)"""
+    try:
+        return open_shared_memory(name, create=True, size=size), True
+    except FileExistsError:
+        return open_shared_memory(name), False
+
+
+def remove_shared_memory(name):
+    """이름이 name인 공유 메모리 삭제 (없으면 False)"""
+    with shared_memory_lock(name):
+        try:
+            shm = open_shared_memory(name)
+        except FileNotFoundError:
+            return False
+        shm.close()
+        return unlink_shared_memory(shm)
+
+
+@contextlib.contextmanager
+def shared_memory_lock(name):
+    """같은 공유 메모리에 연결하고 닫는 프로세스들 사이의 잠금 (fcntl이 없으면 잠그지 않음)"""
+    try:
+        import fcntl
+    except ImportError:
+        # Windows는 마지막 핸들이 닫히면 공유 메모리가 자동으로 삭제되므로 연결 수를 셀 필요가 없음
+        yield
+        return
+    with open(Path(tempfile.gettempdir()) / f'{name}.lock', 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class RevocationList:
+    """Bloom 필터로 먼저 확인하고, 필터에 걸린 jti만 SQLite에서 정확히 확인하는 취소 목록"""
+
+    def __init__(self, store=None, capacity=DEFAULT_CAPACITY, error_rate=DEFAULT_ERROR_RATE,
+                 sync_interval=DEFAULT_SYNC_INTERVAL, rebuild_interval=DEFAULT_REBUILD_INTERVAL,
+                 shm_name=None):
+        self.store = store or RevocationStore(get_env('JWT_REVOCATION_PATH', DEFAULT_STORE_PATH))
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self._shm = None
+        self._synced_at = 0.0  # 필터에 반영한 마지막 revoked_at
+        self._local_rebuilt_at = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.positives = 0
+        self.false_positives = 0
+
+        size, hashes = BloomFilter.optimal(capacity, error_rate)
+        buffer = None
+        reused = False
+        if shm_name:
+            # 다른 취소 목록 파일로 만든 필터는 다시 사용하지 않음
+            store_id = hashlib.blake2b(str(self.store.path.resolve()).encode('utf-8'), digest_size=8).digest()
+            try:
+                with shared_memory_lock(shm_name):
+                    self._shm, created = attach_shared_memory(shm_name, HEADER.size + (size + 7) // 8)
+                    magic, shm_size, shm_hashes, _, shm_store_id, attached = HEADER.unpack_from(self._shm.buf)
+                    reused = not created and magic == MAGIC and shm_store_id == store_id
+                    if reused:
+                        # 먼저 시작한 워커가 만든 필터의 크기를 그대로 사용
+                        size, hashes = shm_size, shm_hashes
+                    if self._shm.size < HEADER.size + (size + 7) // 8:
+                        raise ValueError(
+                            f'공유 메모리 {shm_name}의 크기가 필터보다 작습니다. '
+                            f'서버를 멈추고 python src/jwt_revocation.py unlink로 삭제하세요.'
+                        )
+                    if not reused:
+                        attached = 0
+                        HEADER.pack_into(self._shm.buf, 0, MAGIC, size, hashes, 0.0, store_id, attached)
+                    ATTACHED.pack_into(self._shm.buf, ATTACHED_OFFSET, attached + 1)
+                    buffer = self._shm.buf[HEADER.size:HEADER.size + (size + 7) // 8]
+            except (OSError, ValueError) as e:
+                print(f'공유 메모리 연결 실패, 프로세스 메모리 사용: {e}')
+                if self._shm is not None:
+                    self._shm.close()
+                    self._shm = None
+                reused = False
+        self.bloom = BloomFilter(size, hashes, buffer)
+
+        if not reused:
+            self.rebuild()
+        else:
+            self.sync()
+
+    def _set_rebuilt_at(self, timestamp):
+        if self._shm is not None:
+            REBUILT_AT.pack_into(self._shm.buf, REBUILT_AT_OFFSET, timestamp)
+
+    def _rebuilt_at(self):
+        if self._shm is None:
+            return self._local_rebuilt_at
+        return REBUILT_AT.unpack_from(self._shm.buf, REBUILT_AT_OFFSET)[0]
+
+    def rebuild(self):
+        """만료되지 않은 취소 jti로 필터를 새로 만듦"""
+        started_at = time.time()
+        self.store.purge()
+        fresh = BloomFilter(self.bloom.size, self.bloom.hashes)
+        for jti, _ in self.store.changes_since(0):
+            fresh.add(jti)
+
+        with self._lock:
+            # 바이트 단위로 덮어쓰므로 읽는 쪽은 항상 이전 필터 또는 새 필터의 바이트를 봄
+            # (두 필터 모두 현재 유효한 취소 jti를 포함하므로 놓치는 jti가 없음)
+            self.bloom.bits[:] = fresh.bits
+            self._local_rebuilt_at = started_at
+            self._set_rebuilt_at(started_at)
+            # 새 필터를 만드는 동안 취소된 jti는 덮어쓰면서 빠졌을 수 있으므로 다시 반영
+            self._synced_at = started_at
+        self.sync()
+
+    def sync(self):
+        """SQLite에서 마지막 동기화 이후에 취소된 jti를 필터에 추가"""
+        rows = self.store.changes_since(self._synced_at - SYNC_OVERLAP)
+        if not rows:
+            return 0
+        with self._lock:
+            for jti, revoked_at in rows:
+                self.bloom.add(jti)
+                self._synced_at = max(self._synced_at, revoked_at)
+        return len(rows)
+
+    def revoke(self, jti, expires_at):
+        """jti 취소 (토큰의 만료 시각까지 기록)
+
+        다른 워커가 같은 바이트의 비트를 동시에 바꿔서 비트가 빠지더라도,
+        각 워커가 다음 sync()에서 SQLite의 기록으로 다시 추가합니다.
+        """
+        self.store.add(jti, expires_at)
+        with self._lock:
+            self.bloom.add(jti)
+
+    def is_revoked(self, jti):
+        """취소된 jti면 True (필터에 걸린 경우에만 SQLite 조회)"""
+        if jti is None or jti not in self.bloom:
+            return False
+        return self._confirm(jti)
+
+    async def ais_revoked(self, jti):
+        """is_revoked()의 비동기 버전 (필터에 걸렸을 때의 SQLite 조회는 스레드에서 실행)"""
+        if jti is None or jti not in self.bloom:
+            return False
+        return await asyncio.to_thread(self._confirm, jti)
+
+    def _confirm(self, jti):
+        """필터에 걸린 jti를 SQLite의 정확한 목록으로 확인"""
+        self.positives += 1
+        if self.store.contains(jti):
+            return True
+        self.false_positives += 1
+        return False
+
+    def _run(self):
+        while not self._stop.wait(self.sync_interval):
+            try:
+                if time.time() - self._rebuilt_at() >= self.rebuild_interval:
+                    self.rebuild()
+                else:
+                    self.sync()
+            except Exception as e:
+                print(f'취소 목록 동기화 실패: {e}')
+
+    def start(self):
+        """백그라운드 동기화 스레드 시작"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self, unlink=False):
+        """동기화를 멈추고 공유 메모리 연결을 닫음
+
+        마지막으로 연결을 닫는 프로세스이거나 unlink=True면 공유 메모리를 삭제합니다.
+        """
+        self.stop()
+        if self._shm is None:
+            return
+        with shared_memory_lock(self._shm.name):
+            (attached,) = ATTACHED.unpack_from(self._shm.buf, ATTACHED_OFFSET)
+            attached = max(0, attached - 1)
+            ATTACHED.pack_into(self._shm.buf, ATTACHED_OFFSET, attached)
+            # 공유 메모리를 가리키는 버퍼를 놓아야 연결을 닫을 수 있으므로 필터는 복사본으로 교체
+            shared = self.bloom.bits
+            self.bloom = BloomFilter(self.bloom.size, self.bloom.hashes, bytearray(shared))
+            shared.release()
+            self._shm.close()
+            if unlink or attached == 0:
+                unlink_shared_memory(self._shm)
+        self._shm = None
+
+    def stats(self):
+        return {
+            'revoked': self.store.count(),
+            'bits': self.bloom.size,
+            'hashes': self.bloom.hashes,
+            'shared': self._shm is not None,
+            'positives': self.positives,
+            'false_positives': self.false_positives,
+        }
+
+
+_revocations = None
+_revocations_lock = threading.Lock()
+
+
+def get_revocation_list():
+    """공용 취소 목록 반환 (처음 호출 시 생성, 워커들이 공유 메모리의 필터를 함께 사용)"""
+    global _revocations
+    if _revocations is None:
+        with _revocations_lock:
+            if _revocations is None:
+                _revocations = RevocationList(shm_name=get_env('JWT_REVOCATION_SHM', DEFAULT_SHM_NAME))
+                # close_revocation_list()를 호출하지 않고 끝나도 연결 수를 줄이도록 종료할 때 정리
+                atexit.register(_revocations.close)
+    return _revocations
+
+
+def close_revocation_list():
+    """공용 취소 목록을 닫음 (마지막으로 닫는 프로세스면 공유 메모리 삭제)"""
+    global _revocations
+    with _revocations_lock:
+        revocations = _revocations
+        _revocations = None
+    if revocations is not None:
+        revocations.close()
+
+
+def demo():
+    import secrets
+
+    with tempfile.TemporaryDirectory() as workdir:
+        store = RevocationStore(Path(workdir) / 'revoked.sqlite3')
+        revocations = RevocationList(store, shm_name=f'jwt_revocation_demo_{secrets.token_hex(4)}')
+
+        expires_at = time.time() + 3600
+        revoked = [secrets.token_urlsafe(16) for _ in range(10_000)]
+        for jti in revoked:
+            revocations.revoke(jti, expires_at)
+
+        active = [secrets.token_urlsafe(16) for _ in range(100_000)]
+        start = time.perf_counter()
+        for jti in active:
+            revocations.is_revoked(jti)
+        elapsed = (time.perf_counter() - start) / len(active) * 1e6
+
+        print(f'취소되지 않은 토큰 확인: {elapsed:.2f} µs/회')
+        print(f'취소된 토큰 확인: {all(revocations.is_revoked(jti) for jti in revoked[:100])}')
+        print(revocations.stats())
+        revocations.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JWT 취소 목록 (Bloom 필터 + SQLite)")
+    parser.add_argument('command', nargs='?', choices=['demo', 'unlink'], default='demo',
+                        help="demo: 성능 확인, unlink: 남아 있는 공유 메모리 삭제 (서버를 멈춘 뒤 실행)")
+    parser.add_argument('--shm', default=get_env('JWT_REVOCATION_SHM', DEFAULT_SHM_NAME),
+                        help="공유 메모리 이름 (기본: JWT_REVOCATION_SHM)")
+    args = parser.parse_args()
+
+    if args.command == 'unlink':
+        if remove_shared_memory(args.shm):
+            print(f'공유 메모리 {args.shm}을 삭제했습니다.')
+        else:
+            print(f'공유 메모리 {args.shm}이 없습니다.')
+    else:
+        demo()
+
+
+if __name__ == '__main__':
+    main()
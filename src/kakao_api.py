@@ -1,26 +1,30 @@
-import os
+import asyncio
 
-import requests
-from dotenv import load_dotenv
+from async_http import DEFAULT_CONCURRENCY, gather_limited, get_async_client
+from config import get_env
+from http_session import get_session
+from lazy_import import lazy_import
 
-# .env 파일에서 환경 변수 로드
-load_dotenv()
+# import 비용이 큰 패키지는 처음 사용할 때 import
+httpx = lazy_import("httpx")
+requests = lazy_import("requests")
 
-KAKAO_API_KEY = os.getenv("KAKAO_REST_API_KEY")
+KAKAO_ADDRESS_URL = "https://dapi.kakao.com/v2/local/search/address.json"
 
 
 def search_address(query):
     """카카오 로컬 주소 검색 API 호출"""
-    if not KAKAO_API_KEY:
+    api_key = get_env("KAKAO_REST_API_KEY")
+    if not api_key:
         print("환경 변수 KAKAO_REST_API_KEY가 설정되지 않았습니다.")
         return None
 
-    url = "https://dapi.kakao.com/v2/local/search/address.json"
-    headers = {"Authorization": f"KakaoAK {KAKAO_API_KEY}"}
+    url = KAKAO_ADDRESS_URL
+    headers = {"Authorization": f"KakaoAK {api_key}"}
     params = {"query": query}
 
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = get_session().get(url, headers=headers, params=params, timeout=10)
         response.raise_for_status()
     except requests.RequestException as exc:
         print(f"API 요청 실패: {exc}")
@@ -30,7 +34,39 @@ def search_address(query):
     return data.get("documents", [])
 
 
+async def search_address_async(query):
+    """카카오 로컬 주소 검색 API 호출 (비동기)"""
+    api_key = get_env("KAKAO_REST_API_KEY")
+    if not api_key:
+        print("환경 변수 KAKAO_REST_API_KEY가 설정되지 않았습니다.")
+        return None
+
+    headers = {"Authorization": f"KakaoAK {api_key}"}
+    params = {"query": query}
+
+    try:
+        response = await get_async_client().get(
+            KAKAO_ADDRESS_URL, headers=headers, params=params, timeout=10
+        )
+        response.raise_for_status()
+    except httpx.HTTPError as exc:
+        print(f"API 요청 실패: {exc}")
+        return None
+
+    data = response.json()
+    return data.get("documents", [])
+
+
+async def search_addresses_async(queries, concurrency=DEFAULT_CONCURRENCY):
+    """여러 주소를 동시에 검색 (queries와 같은 순서)"""
+    return await gather_limited(search_address_async, queries, concurrency)
+
+
 if __name__ == "__main__":
     results = search_address("서울시 강남구 테헤란로")
     if results:
         print(results)
+
+    queries = ["서울시 강남구 테헤란로", "부산시 해운대구 우동"]
+    for query, documents in zip(queries, asyncio.run(search_addresses_async(queries))):
+        print(query, documents)
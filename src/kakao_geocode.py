@@ -0,0 +1,321 @@
+"""
+카카오 주소 일괄 지오코딩
+
+고객 주소 파일(CSV 또는 JSON Lines)의 주소를 카카오 로컬 주소 검색 API로 좌표로 바꿉니다.
+수십만 줄짜리 파일도 메모리에 모두 올리지 않고 한 줄씩 읽습니다.
+
+- 주소를 정규화합니다. 공백, 쉼표, 괄호 안의 참고 항목, 동/호/층 같은 상세 주소,
+  '번지', 시도 이름의 여러 표기(서울특별시/서울시/서울 등)를 하나로 맞추므로
+  표기만 다른 주소는 같은 키가 됩니다.
+- 파일을 먼저 한 번 읽어서 중복을 제거한 뒤, 캐시에 없는 주소만 요청합니다.
+- 요청은 동시에 보내되 초당 요청 수(--qps)를 넘지 않게 조절합니다. (rate_limiter)
+  429를 받으면 잠시 기다렸다가 다시 요청합니다.
+- 결과는 디스크 캐시(SQLite)에 저장하므로, 같은 파일을 다시 실행하면 바뀐 줄만 요청합니다.
+  요청에 실패한 주소는 캐시하지 않으므로 다시 실행하면 재시도합니다.
+
+캐시 파일 위치는 환경 변수 KAKAO_GEOCODE_CACHE_PATH로 바꿀 수 있습니다.
+
+실행 방법:
+    python src/kakao_geocode.py customers.csv -o geocoded.csv --column address
+    python src/kakao_geocode.py customers.jsonl -o geocoded.jsonl --column addr --qps 20
+
+출력은 입력의 각 줄에 다음 항목을 덧붙입니다:
+    geocode_query, geocode_status (ok / not_found / error), x, y, address_name, road_address_name
+"""
+
+import argparse
+import asyncio
+import contextlib
+import csv
+import json
+import random
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+from async_http import close_async_client, get_async_client
+from config import get_env
+from kakao_api import KAKAO_ADDRESS_URL
+from lazy_import import lazy_import
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache
+
+httpx = lazy_import("httpx")
+
+DEFAULT_CACHE_PATH = ".cache/geocode.sqlite3"
+DEFAULT_QPS = 10
+DEFAULT_CONCURRENCY = 8
+# 주소 좌표는 거의 바뀌지 않으므로 오래 보관하고, 찾지 못한 주소는 짧게 보관
+GEOCODE_CACHE_TTL = 180 * 24 * 3600
+NOT_FOUND_CACHE_TTL = 7 * 24 * 3600
+CACHE_MAX_ENTRIES = 2_000_000
+# 결과를 몇 개씩 모아서 캐시에 저장할지 (한 트랜잭션)
+CACHE_WRITE_BATCH = 500
+MAX_RETRIES = 3
+OUTPUT_FIELDS = ["geocode_query", "geocode_status", "x", "y", "address_name", "road_address_name"]
+
+# 시도 이름의 여러 표기 → 짧은 이름
+PROVINCE_ALIASES = {
+    "서울": ["서울특별시", "서울시"],
+    "부산": ["부산광역시", "부산시"],
+    "대구": ["대구광역시", "대구시"],
+    "인천": ["인천광역시", "인천시"],
+    # 광주시는 경기도 광주시와 겹치므로 제외
+    "광주": ["광주광역시"],
+    "대전": ["대전광역시", "대전시"],
+    "울산": ["울산광역시", "울산시"],
+    "세종": ["세종특별자치시", "세종시"],
+    "경기": ["경기도"],
+    "강원": ["강원특별자치도", "강원도"],
+    "충북": ["충청북도"],
+    "충남": ["충청남도"],
+    "전북": ["전북특별자치도", "전라북도"],
+    "전남": ["전라남도"],
+    "경북": ["경상북도"],
+    "경남": ["경상남도"],
+    "제주": ["제주특별자치도", "제주도"],
+}
+PROVINCES = {alias: short for short, aliases in PROVINCE_ALIASES.items() for alias in aliases}
+
+# 건물 번호 뒤의 상세 주소 (101동 1001호, 3층, 1001호)
+DETAIL_PATTERN = re.compile(r"\s+(\d+\s*동\s*)?\d+\s*(호|층)(\s.*)?$")
+PARENTHESES_PATTERN = re.compile(r"\([^)]*\)")
+# 123 - 4 → 123-4, 123번지 → 123
+LOT_DASH_PATTERN = re.compile(r"(\d)\s*-\s*(\d)")
+LOT_SUFFIX_PATTERN = re.compile(r"(\d)\s*번지")
+
+
+def normalize_address(address):
+    """표기만 다른 주소가 같은 문자열이 되도록 정규화 (빈 주소는 빈 문자열)"""
+    text = unicodedata.normalize("NFKC", address or "")
+    text = PARENTHESES_PATTERN.sub(" ", text)
+    text = text.replace(",", " ")
+    text = LOT_DASH_PATTERN.sub(r"\1-\2", text)
+    text = LOT_SUFFIX_PATTERN.sub(r"\1", text)
+    text = " ".join(text.split())
+    text = DETAIL_PATTERN.sub("", text)
+
+    parts = text.split(" ", 1)
+    if parts[0] in PROVINCES:
+        parts[0] = PROVINCES[parts[0]]
+    return " ".join(parts)
+
+
+def compact_result(documents):
+    """검색 결과 중 첫 번째 주소의 좌표와 주소 이름만 남김 (없으면 None)"""
+    if not documents:
+        return None
+    first = documents[0]
+    road = first.get("road_address") or {}
+    return {
+        "x": first.get("x"),
+        "y": first.get("y"),
+        "address_name": first.get("address_name"),
+        "road_address_name": road.get("address_name"),
+    }
+
+
+def detect_format(path, format=None):
+    if format:
+        return format
+    return "csv" if Path(path).suffix.lower() == ".csv" else "jsonl"
+
+
+def read_rows(path, format=None):
+    """CSV 또는 JSON Lines 파일을 한 줄씩 dict로 읽기"""
+    with open(path, encoding="utf-8-sig", newline="") as file:
+        if detect_format(path, format) == "csv":
+            yield from csv.DictReader(file)
+        else:
+            for line in file:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+class BulkGeocoder:
+    """정규화 → 중복 제거 → 캐시 확인 → 초당 요청 수 안에서 동시 요청"""
+
+    def __init__(self, qps=DEFAULT_QPS, concurrency=DEFAULT_CONCURRENCY, cache=None):
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(limit=qps, window=1, burst=max(1, qps))
+        self.cache = cache or ResponseCache(
+            get_env("KAKAO_GEOCODE_CACHE_PATH", DEFAULT_CACHE_PATH), max_entries=CACHE_MAX_ENTRIES
+        )
+        self.rows = 0
+        self.unique = 0
+        self.cached = 0
+        self.requested = 0
+        self.failed = 0
+
+    async def fetch(self, query, api_key):
+        """주소 하나 검색 → 압축한 결과, 찾지 못하면 {}, 실패하면 None"""
+        headers = {"Authorization": f"KakaoAK {api_key}"}
+        for attempt in range(MAX_RETRIES + 1):
+            await self.limiter.acquire_async()
+            try:
+                response = await get_async_client().get(
+                    KAKAO_ADDRESS_URL, headers=headers, params={"query": query}, timeout=10
+                )
+            except httpx.HTTPError as exc:
+                error = exc
+            else:
+                self.limiter.update(response)
+                if response.status_code == 200:
+                    return compact_result(response.json().get("documents")) or {}
+                error = f"HTTP {response.status_code}"
+                if response.status_code != 429 and response.status_code < 500:
+                    break
+            if attempt < MAX_RETRIES:
+                await asyncio.sleep(random.uniform(0, 2 ** attempt))
+
+        print(f"API 요청 실패 ({query}): {error}")
+        return None
+
+    def lookup_cached(self, queries):
+        """캐시에서 찾은 결과 {주소: 결과}와 캐시에 없는 주소 목록"""
+        results = {}
+        missing = []
+        for query in queries:
+            cached = self.cache.get("kakao_geocode", {"query": query})
+            if cached is None:
+                missing.append(query)
+            else:
+                results[query] = cached
+        return results, missing
+
+    async def geocode(self, queries):
+        """정규화한 주소 집합 → {주소: 결과} (캐시에 없는 주소만 요청)"""
+        results, missing = await asyncio.to_thread(self.lookup_cached, queries)
+        self.cached += len(results)
+
+        if not missing:
+            return results
+        api_key = get_env("KAKAO_REST_API_KEY")
+        if not api_key:
+            print("환경 변수 KAKAO_REST_API_KEY가 설정되지 않았습니다.")
+            return results
+
+        queue = asyncio.Queue()
+        for query in missing:
+            queue.put_nowait(query)
+        started = time.monotonic()
+        pending = []
+        writes = set()
+
+        def flush():
+            # SQLite 쓰기는 이벤트 루프를 막지 않도록 스레드에서 한 트랜잭션으로
+            batch = pending[:]
+            pending.clear()
+            task = asyncio.create_task(asyncio.to_thread(self.cache.set_many, "kakao_geocode", batch))
+            writes.add(task)
+            task.add_done_callback(writes.discard)
+
+        async def worker():
+            while not queue.empty():
+                query = queue.get_nowait()
+                result = await self.fetch(query, api_key)
+                self.requested += 1
+                if result is None:
+                    self.failed += 1
+                    continue
+                ttl = GEOCODE_CACHE_TTL if result else NOT_FOUND_CACHE_TTL
+                pending.append(({"query": query}, result, ttl))
+                results[query] = result
+                if len(pending) >= CACHE_WRITE_BATCH:
+                    flush()
+                if self.requested % 1000 == 0:
+                    elapsed = time.monotonic() - started
+                    print(f"  {self.requested}/{len(missing)} 요청 ({self.requested / elapsed:.1f}건/초)",
+                          file=sys.stderr)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        finally:
+            # 중단되더라도 받은 결과는 저장해서 다시 실행할 때 요청하지 않도록
+            if pending:
+                flush()
+            await asyncio.gather(*writes)
+        return results
+
+    async def run(self, input_path, output, column, format=None):
+        """입력 파일을 지오코딩해서 output(파일 객체)에 같은 형식으로 기록"""
+        try:
+            await self._run(input_path, output, column, format)
+        finally:
+            await close_async_client()
+
+    async def _run(self, input_path, output, column, format):
+        # 1) 주소만 읽어서 중복 제거
+        queries = set()
+        for row in read_rows(input_path, format):
+            self.rows += 1
+            query = normalize_address(row.get(column))
+            if query:
+                queries.add(query)
+        self.unique = len(queries)
+        print(f"{self.rows}줄, 서로 다른 주소 {self.unique}개", file=sys.stderr)
+
+        # 2) 캐시에 없는 주소만 요청
+        results = await self.geocode(queries)
+
+        # 3) 입력을 다시 읽으면서 결과를 붙여서 기록
+        format = detect_format(input_path, format)
+        writer = None
+        for row in read_rows(input_path, format):
+            query = normalize_address(row.get(column))
+            result = results.get(query)
+            if result is None:
+                status = "error" if query else "not_found"
+            else:
+                status = "ok" if result else "not_found"
+            row.update({"geocode_query": query, "geocode_status": status, **dict.fromkeys(OUTPUT_FIELDS[2:])})
+            row.update(result or {})
+
+            if format == "csv":
+                if writer is None:
+                    writer = csv.DictWriter(output, fieldnames=list(row))
+                    writer.writeheader()
+                writer.writerow(row)
+            else:
+                output.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def stats(self):
+        return {
+            "rows": self.rows,
+            "unique": self.unique,
+            "cached": self.cached,
+            "requested": self.requested,
+            "failed": self.failed,
+            "rate_limit": self.limiter.stats(),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="카카오 주소 일괄 지오코딩 (CSV / JSON Lines)")
+    parser.add_argument("input", help="입력 파일 (.csv 또는 .jsonl)")
+    parser.add_argument("-o", "--output", default="-", help="결과 파일 ('-'이면 표준 출력)")
+    parser.add_argument("--column", default="address", help="주소가 들어 있는 열(키) 이름")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="입력 형식 (기본: 확장자로 판단)")
+    parser.add_argument("--qps", type=int, default=DEFAULT_QPS, help="초당 최대 요청 수")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시에 보낼 요청 수")
+    args = parser.parse_args()
+
+    geocoder = BulkGeocoder(qps=args.qps, concurrency=args.concurrency)
+    stdout = sys.stdout
+    output = stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        # 결과를 표준 출력으로 내보낼 때는 진행 메시지를 표준 에러로
+        with contextlib.redirect_stdout(sys.stderr if output is stdout else stdout):
+            asyncio.run(geocoder.run(args.input, output, args.column, args.format))
+    finally:
+        if output is not stdout:
+            output.close()
+
+    print(f"✅ 완료: {geocoder.stats()}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
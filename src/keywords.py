@@ -0,0 +1,144 @@
+"""
+스트리밍 키워드 집계
+
+기사를 한 건씩 토큰화해서 빈도를 누적합니다.
+모든 기사를 하나의 문자열로 합치거나 단어 목록을 따로 만들지 않으므로
+기사 수가 늘어나도 텍스트를 메모리에 쌓아 두지 않습니다.
+
+- KeywordCounter       : 정확한 빈도 (collections.Counter). 어휘 수만큼 메모리 사용
+- SketchKeywordCounter : Count-Min sketch + 상위 K개 후보.
+                         어휘가 아무리 많아도 메모리가 일정 (빈도는 근사값)
+
+두 클래스 모두 같은 방법으로 사용합니다:
+    counter = KeywordCounter()
+    for article in articles:
+        counter.add_article(article)
+    counter.merge(other_counter)   # 다른 페이지/검색어 결과 합치기
+    counter.most_common(15)
+"""
+
+import hashlib
+import heapq
+import re
+from collections import Counter
+
+from lazy_import import lazy_import
+
+# numpy는 SketchKeywordCounter를 사용할 때만 import
+np = lazy_import('numpy')
+
+# 한글 2글자 이상, 영문 3글자 이상
+WORD_PATTERN = re.compile(r'[가-힣]{2,}|[a-zA-Z]{3,}')
+
+# 불용어 (간단한 예시)
+STOPWORDS = frozenset({'그리고', '하지만', '그래서', '있다', '되다', '하다'})
+
+
+def tokenize(text):
+    """텍스트에서 불용어를 제외한 단어를 하나씩 생성"""
+    for match in WORD_PATTERN.finditer(text):
+        word = match.group()
+        if word not in STOPWORDS:
+            yield word
+
+
+def article_text(article):
+    """기사에서 키워드 분석 대상 텍스트 (제목 + 설명)"""
+    return (article.get('title') or '') + ' ' + (article.get('description') or '')
+
+
+class KeywordCounter:
+    """정확한 단어 빈도 누적"""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.articles = 0
+
+    def add_text(self, text):
+        self.counts.update(tokenize(text))
+
+    def add_article(self, article):
+        self.add_text(article_text(article))
+        self.articles += 1
+
+    def add_articles(self, articles):
+        for article in articles:
+            self.add_article(article)
+        return self
+
+    def merge(self, other):
+        """다른 KeywordCounter의 빈도를 합침"""
+        self.counts.update(other.counts)
+        self.articles += other.articles
+        return self
+
+    def most_common(self, top_n=10):
+        return self.counts.most_common(top_n)
+
+
+class SketchKeywordCounter:
+    """Count-Min sketch로 빈도를 근사하고 상위 top_k개 후보만 보관
+
+    빈도는 depth x width 크기의 고정 배열에 기록하므로 메모리가 일정합니다.
+    추정값은 실제 빈도보다 작아지지 않으며, width가 클수록 오차가 줄어듭니다.
+    merge()는 width, depth가 같은 sketch끼리만 가능합니다.
+    """
+
+    def __init__(self, top_k=100, width=2 ** 16, depth=4):
+        self.top_k = top_k
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.rows = np.arange(depth)
+        # 상위 후보: 단어 -> 추정 빈도 (top_k의 두 배를 넘으면 정리)
+        self.candidates = {}
+        self.articles = 0
+
+    def _columns(self, word):
+        """단어의 행별 열 위치 (프로세스가 달라도 같은 값이 나오도록 blake2b 사용)"""
+        digest = hashlib.blake2b(word.encode('utf-8'), digest_size=8 * self.depth).digest()
+        hashes = np.frombuffer(digest, dtype=np.uint64)
+        return (hashes % self.width).astype(np.intp)
+
+    def estimate(self, word):
+        return int(self.table[self.rows, self._columns(word)].min())
+
+    def add_word(self, word, count=1):
+        columns = self._columns(word)
+        self.table[self.rows, columns] += count
+        self.candidates[word] = int(self.table[self.rows, columns].min())
+        if len(self.candidates) > self.top_k * 2:
+            self._prune()
+
+    def _prune(self):
+        """추정 빈도 상위 top_k개 후보만 남김"""
+        self.candidates = dict(
+            heapq.nlargest(self.top_k, self.candidates.items(), key=lambda item: item[1])
+        )
+
+    def add_text(self, text):
+        for word in tokenize(text):
+            self.add_word(word)
+
+    def add_article(self, article):
+        self.add_text(article_text(article))
+        self.articles += 1
+
+    def add_articles(self, articles):
+        for article in articles:
+            self.add_article(article)
+        return self
+
+    def merge(self, other):
+        """다른 SketchKeywordCounter의 빈도를 합침"""
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("width와 depth가 같은 sketch끼리만 합칠 수 있습니다.")
+        self.table += other.table
+        self.articles += other.articles
+        words = set(self.candidates) | set(other.candidates)
+        self.candidates = {word: self.estimate(word) for word in words}
+        self._prune()
+        return self
+
+    def most_common(self, top_n=10):
+        return heapq.nlargest(top_n, self.candidates.items(), key=lambda item: item[1])
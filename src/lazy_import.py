@@ -0,0 +1,38 @@
+"""
+모듈 지연 import
+
+requests, httpx, numpy처럼 import 비용이 큰 패키지를 모듈 수준에서 바로 import하지 않고,
+처음 속성에 접근할 때 import합니다.
+코드에서는 평소처럼 requests.get, np.array 등으로 사용하면 됩니다.
+
+사용 방법:
+    from lazy_import import lazy_import
+
+    np = lazy_import('numpy')
+    np.zeros(3)  # 이때 numpy를 import
+"""
+
+import importlib
+
+
+class LazyModule:
+    """처음 속성에 접근할 때 실제 모듈을 import하는 대리 객체"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        # import_module은 모듈별 import 잠금을 사용하므로 여러 스레드가 동시에 접근해도 안전
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f'<LazyModule {self._name!r} ({state})>'
+
+
+def lazy_import(name):
+    """name 모듈을 처음 사용할 때 import하는 LazyModule 반환"""
+    return LazyModule(name)
@@ -1,69 +1,186 @@
-import requests
-import os
-from collections import Counter
+import asyncio
+import hashlib
+import itertools
+import math
 import re
-from dotenv import load_dotenv
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from config import get_env
+from lazy_import import lazy_import
+from async_http import DEFAULT_CONCURRENCY, gather_limited, get_async_client
+from http_session import get_session
+from keywords import KeywordCounter, article_text
+from response_cache import get_response_cache
 
-# .env 파일에서 환경 변수 로드
-load_dotenv()
+# import 비용이 큰 패키지는 처음 사용할 때 import
+requests = lazy_import('requests')
+httpx = lazy_import('httpx')
 
-class NewsAnalyzer:
+# NewsAPI /everything의 최대 pageSize
+MAX_PAGE_SIZE = 100
+# 뉴스 검색 응답 캐시 유효 시간 (초)
+NEWS_CACHE_TTL = 900
+
+
+class ArticleDeduplicator:
+    """URL과 본문 해시로 중복 기사(통신사 기사 재배포 등)를 걸러냄
+
+    기사 전체가 아니라 URL과 8바이트 해시만 기억합니다.
+    """
+    
+    whitespace = re.compile(r'\s+')
+    
     def __init__(self):
-        self.api_key = os.getenv('NEWS_API_KEY')
+        self.urls = set()
+        self.hashes = set()
+        self.duplicates = 0
+    
+    def content_hash(self, article):
+        """제목 + 설명을 정규화(소문자, 공백 정리)한 해시"""
+        text = self.whitespace.sub(' ', article_text(article)).strip().lower()
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+    
+    def is_new(self, article):
+        url = article.get('url')
+        digest = self.content_hash(article)
+        if (url and url in self.urls) or digest in self.hashes:
+            self.duplicates += 1
+            return False
+        if url:
+            self.urls.add(url)
+        self.hashes.add(digest)
+        return True
+    
+    def filter(self, articles):
+        for article in articles:
+            if self.is_new(article):
+                yield article
+
+
+class NewsAnalyzer:
+    def __init__(self, response_cache=None, use_cache=True):
+        self.api_key = get_env('NEWS_API_KEY')
         self.base_url = 'https://newsapi.org/v2'
+        # 디스크 응답 캐시 (use_cache=False면 항상 API 호출)
+        self.response_cache = response_cache
+        self.use_cache = use_cache
         
         if not self.api_key:
             raise ValueError("환경 변수 NEWS_API_KEY가 설정되지 않았습니다.")
     
-    def search_news(self, query, language='ko', page_size=100):
-        """뉴스 검색"""
-        url = f'{self.base_url}/everything'
-        params = {
+    def get_cache(self):
+        """응답 캐시 (지정하지 않았으면 공유 캐시 사용)"""
+        if not self.use_cache:
+            return None
+        if self.response_cache is None:
+            self.response_cache = get_response_cache()
+        return self.response_cache
+    
+    def build_params(self, query, language='ko', page_size=100, page=1):
+        """뉴스 검색 요청 파라미터"""
+        return {
             'q': query,
             'language': language,
             'pageSize': page_size,
+            'page': page,
             'apiKey': self.api_key
         }
+    
+    def search_news(self, query, language='ko', page_size=100, page=1):
+        """뉴스 검색"""
+        url = f'{self.base_url}/everything'
+        params = self.build_params(query, language, page_size, page)
+        cache = self.get_cache()
+        if cache:
+            data = cache.get('news', params)
+            if data is not None:
+                return data
         
         try:
-            response = requests.get(url, params=params)
+            response = get_session().get(url, params=params)
             response.raise_for_status()
-            return response.json()
+            data = response.json()
         except requests.RequestException as e:
             print(f'뉴스 검색 실패: {e}')
             return None
+        
+        if cache:
+            cache.set('news', params, data, NEWS_CACHE_TTL)
+        return data
     
-    def extract_keywords(self, text, top_n=10):
-        """텍스트에서 키워드 추출"""
-        # 한글, 영문만 추출 (최소 2글자)
-        words = re.findall(r'[가-힣]{2,}|[a-zA-Z]{3,}', text)
+    def page_count(self, data, page_size, max_pages):
+        """첫 페이지 응답의 totalResults로 가져올 페이지 수 계산"""
+        total = data.get('totalResults', 0)
+        return min(math.ceil(total / page_size), max_pages)
+    
+    def harvest_news(self, query, max_pages=5, language='ko', page_size=MAX_PAGE_SIZE,
+                     max_workers=4, deduplicator=None):
+        """여러 페이지의 기사를 동시에 가져와서 중복을 제거한 뒤 한 건씩 생성
+
+        동시에 요청 중인 페이지는 최대 max_workers개이고, 받은 페이지는 바로 흘려보내므로
+        전체 페이지를 메모리에 모아 두지 않습니다. 페이지 순서는 보장하지 않습니다.
+        deduplicator를 넘기면 여러 검색어에 걸쳐 중복을 제거할 수 있습니다.
+        """
+        deduplicator = deduplicator or ArticleDeduplicator()
         
-        # 불용어 제거 (간단한 예시)
-        stopwords = {'그리고', '하지만', '그래서', '있다', '되다', '하다'}
-        words = [w for w in words if w not in stopwords]
+        first = self.search_news(query, language, page_size, page=1)
+        if not first:
+            return
+        yield from deduplicator.filter(first['articles'])
+        
+        pages = iter(range(2, self.page_count(first, page_size, max_pages) + 1))
+        # 나머지 페이지를 받는 동안 첫 페이지를 붙잡고 있지 않도록 참조 해제
+        del first
         
-        # 빈도 계산
-        word_counts = Counter(words)
-        return word_counts.most_common(top_n)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            def submit(page):
+                return executor.submit(self.search_news, query, language, page_size, page)
+            
+            pending = {submit(page) for page in itertools.islice(pages, max_workers)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    data = future.result()
+                    if data:
+                        yield from deduplicator.filter(data['articles'])
+                    next_page = next(pages, None)
+                    if next_page is not None:
+                        pending.add(submit(next_page))
+    
+    def harvest_keywords(self, query, max_pages=5, counter=None, **kwargs):
+        """harvest_news()로 가져온 기사의 키워드를 바로 집계 (기사를 모아 두지 않음)"""
+        return self.count_keywords(self.harvest_news(query, max_pages, **kwargs), counter)
+    
+    def extract_keywords(self, text, top_n=10):
+        """텍스트에서 키워드 추출"""
+        counter = KeywordCounter()
+        counter.add_text(text)
+        return counter.most_common(top_n)
+    
+    def count_keywords(self, articles, counter=None):
+        """기사를 한 건씩 토큰화해서 키워드 빈도 누적
+
+        counter를 넘기면 그 위에 이어서 집계하므로 여러 페이지/검색어 결과를 합칠 수 있습니다.
+        기사가 매우 많으면 keywords.SketchKeywordCounter를 넘겨서 메모리를 일정하게 유지하세요.
+        """
+        if counter is None:
+            counter = KeywordCounter()
+        return counter.add_articles(articles)
     
     def analyze_news_trends(self, query):
         """뉴스 트렌드 분석"""
         data = self.search_news(query)
-        
+        self.print_news_trends(query, data)
+    
+    def print_news_trends(self, query, data):
+        """뉴스 검색 결과로 트렌드 분석 결과 출력"""
         if not data or data['totalResults'] == 0:
             print('뉴스를 찾을 수 없습니다.')
             return
         
         articles = data['articles']
         
-        # 모든 기사 제목과 설명 합치기
-        all_text = ' '.join([
-            (article.get('title', '') + ' ' + article.get('description', ''))
-            for article in articles
-        ])
-        
-        # 키워드 추출
-        keywords = self.extract_keywords(all_text, top_n=15)
+        # 기사별로 제목과 설명에서 키워드 추출
+        keywords = self.count_keywords(articles).most_common(15)
         
         print(f"\n📰 '{query}' 관련 뉴스 분석")
         print(f"{'='*40}")
@@ -79,11 +196,112 @@ class NewsAnalyzer:
             print(f"   출처: {article['source']['name']}")
             print(f"   링크: {article['url']}")
 
+
+class AsyncNewsAnalyzer(NewsAnalyzer):
+    """여러 검색어를 동시에 조회하는 비동기 버전"""
+    
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, response_cache=None, use_cache=True):
+        super().__init__(response_cache=response_cache, use_cache=use_cache)
+        self.concurrency = concurrency
+    
+    async def search_news(self, query, language='ko', page_size=100, page=1):
+        """뉴스 검색"""
+        url = f'{self.base_url}/everything'
+        params = self.build_params(query, language, page_size, page)
+        cache = self.get_cache()
+        if cache:
+            data = cache.get('news', params)
+            if data is not None:
+                return data
+        
+        try:
+            response = await get_async_client().get(url, params=params)
+            response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPError as e:
+            print(f'뉴스 검색 실패: {e}')
+            return None
+        
+        if cache:
+            cache.set('news', params, data, NEWS_CACHE_TTL)
+        return data
+    
+    async def search_many(self, queries, language='ko', page_size=100):
+        """여러 검색어를 동시에 조회 (queries와 같은 순서)"""
+        async def search(query):
+            return await self.search_news(query, language, page_size)
+        
+        return await gather_limited(search, queries, self.concurrency)
+    
+    async def harvest_news(self, query, max_pages=5, language='ko', page_size=MAX_PAGE_SIZE,
+                           deduplicator=None):
+        """여러 페이지의 기사를 동시에 가져와서 중복을 제거한 뒤 한 건씩 생성 (async generator)
+
+        동시에 요청 중인 페이지는 최대 concurrency개입니다. 페이지 순서는 보장하지 않습니다.
+        """
+        deduplicator = deduplicator or ArticleDeduplicator()
+        
+        first = await self.search_news(query, language, page_size, page=1)
+        if not first:
+            return
+        for article in deduplicator.filter(first['articles']):
+            yield article
+        
+        pages = iter(range(2, self.page_count(first, page_size, max_pages) + 1))
+        # 나머지 페이지를 받는 동안 첫 페이지를 붙잡고 있지 않도록 참조 해제
+        del first
+        
+        def start(page):
+            return asyncio.create_task(self.search_news(query, language, page_size, page))
+        
+        pending = {start(page) for page in itertools.islice(pages, self.concurrency)}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    data = task.result()
+                    if data:
+                        for article in deduplicator.filter(data['articles']):
+                            yield article
+                    next_page = next(pages, None)
+                    if next_page is not None:
+                        pending.add(start(next_page))
+        finally:
+            # 소비자가 중간에 멈추면 남은 요청 취소
+            for task in pending:
+                task.cancel()
+    
+    async def harvest_keywords(self, query, max_pages=5, counter=None, **kwargs):
+        """harvest_news()로 가져온 기사의 키워드를 바로 집계 (기사를 모아 두지 않음)"""
+        if counter is None:
+            counter = KeywordCounter()
+        async for article in self.harvest_news(query, max_pages, **kwargs):
+            counter.add_article(article)
+        return counter
+    
+    async def analyze_news_trends(self, query):
+        """뉴스 트렌드 분석"""
+        data = await self.search_news(query)
+        self.print_news_trends(query, data)
+    
+    async def compare_trends(self, queries):
+        """여러 검색어의 트렌드를 동시에 조회해서 순서대로 출력"""
+        results = await self.search_many(queries)
+        for query, data in zip(queries, results):
+            self.print_news_trends(query, data)
+
 # 사용 예시
 if __name__ == '__main__':
     try:
         analyzer = NewsAnalyzer()
         analyzer.analyze_news_trends('인공지능')
+        
+        # 여러 페이지를 모아서 키워드 집계 (중복 기사 제거)
+        counter = analyzer.harvest_keywords('인공지능', max_pages=5)
+        print(f"\n📚 기사 {counter.articles}건 키워드 상위 10개: {counter.most_common(10)}")
+        
+        # 여러 검색어 동시 분석 (비동기)
+        asyncio.run(AsyncNewsAnalyzer().compare_trends(['인공지능', '반도체']))
     except ValueError as e:
         print(f"오류: {e}")
         print("News API 키를 발급받으세요: https://newsapi.org")
\ No newline at end of file
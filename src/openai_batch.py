@@ -0,0 +1,360 @@
+"""
+OpenAI Batch API 파이프라인
+
+바로 답이 필요 없는 대량 요청을 Batch API로 처리합니다.
+(일반 요청의 절반 비용이고, 대화형 요청의 rate limit을 쓰지 않음)
+
+1) 입력을 Batch API 요청 형식의 JSONL로 작성 (배치당 최대 MAX_BATCH_REQUESTS건씩 나눔)
+2) 파일을 업로드하고 배치 생성
+3) 끝날 때까지 상태 조회 (조회 간격을 점점 늘림)
+4) 결과/에러 파일을 한 줄씩 내려받아 라운드별 결과 파일에 기록
+5) 429/5xx 또는 만료/취소로 처리되지 못한 요청만 모아서 다시 제출 (max_rounds까지)
+6) 입력 순서대로 custom_id를 따라가며 최종 결과를 합쳐서 출력
+
+custom_id는 입력 순서로 만들고(request-0, request-1, ...) 입력의 id는 ids.jsonl에 따로 기록합니다.
+(Batch API는 custom_id가 중복된 입력 파일을 거절하므로 입력의 id를 그대로 쓰지 않음)
+요청/결과 파일과 진행 상태(state.json)는 작업 디렉터리(workdir)에 저장합니다.
+상태를 조회하는 도중에 프로세스가 종료돼도 같은 명령을 다시 실행하면 이미 제출한 배치를 이어서 기다립니다.
+작업마다 새 작업 디렉터리를 사용하세요.
+
+OPENAI_BASE_URL 환경 변수를 지정하면 로컬 대체 서버(fake_openai_server.py)로 시험할 수 있습니다.
+
+사용 방법:
+    pipeline = BatchPipeline('.cache/batch/nightly')
+    with open('results.jsonl', 'w', encoding='utf-8') as output:
+        pipeline.run(prompts, output, instructions='세 줄로 요약해줘.')
+
+실행 방법:
+    python src/openai_batch.py prompts.txt -o results.jsonl --workdir .cache/batch/nightly
+
+입력과 출력 형식은 openai_runner.py와 같습니다.
+    {"index": 0, "id": "a1", "output_text": "...", "usage": {...}, "error": null}
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from ai_clients import get_openai_client
+from openai_runner import DEFAULT_MAX_OUTPUT_TOKENS, DEFAULT_MODEL, read_inputs
+
+BATCH_ENDPOINT = '/v1/responses'
+# 배치 하나에 넣을 수 있는 최대 요청 수
+MAX_BATCH_REQUESTS = 50000
+# 더 이상 바뀌지 않는 배치 상태
+TERMINAL_STATUSES = frozenset({'completed', 'failed', 'expired', 'cancelled'})
+# 다시 제출하면 처리될 수 있는 요청별 오류 코드
+RETRYABLE_ERROR_CODES = frozenset({'batch_expired', 'batch_cancelled'})
+
+
+def response_text(body):
+    """Responses API 응답 본문에서 출력 텍스트 추출 (SDK의 response.output_text와 같은 값)"""
+    texts = []
+    for item in body.get('output') or []:
+        if item.get('type') != 'message':
+            continue
+        for content in item.get('content') or []:
+            if content.get('type') == 'output_text':
+                texts.append(content.get('text', ''))
+    return ''.join(texts)
+
+
+def parse_result(line):
+    """결과/에러 파일의 한 줄 → (결과 dict, 다시 제출할지 여부)"""
+    data = json.loads(line)
+    record = {'id': data['custom_id'], 'output_text': None, 'usage': None, 'error': None}
+    response = data.get('response') or {}
+    status_code = response.get('status_code')
+    body = response.get('body') or {}
+
+    if status_code == 200:
+        record['output_text'] = response_text(body)
+        usage = body.get('usage')
+        if usage:
+            record['usage'] = {
+                'input_tokens': usage.get('input_tokens'),
+                'output_tokens': usage.get('output_tokens'),
+                'total_tokens': usage.get('total_tokens'),
+            }
+        return record, False
+
+    error = data.get('error') or body.get('error') or {}
+    code = error.get('code') or status_code
+    record['error'] = f"{code}: {error.get('message', '')}"
+    retryable = (
+        code in RETRYABLE_ERROR_CODES
+        or status_code == 429
+        or (status_code or 0) >= 500
+    )
+    return record, retryable
+
+
+class BatchPipeline:
+    """입력 작성 → 업로드 → 상태 조회 → 결과 병합 → 실패분 재제출"""
+
+    def __init__(self, workdir, model=DEFAULT_MODEL, max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
+                 poll_interval=10, max_poll_interval=300, max_rounds=3,
+                 max_batch_requests=MAX_BATCH_REQUESTS, client=None):
+        self.workdir = Path(workdir)
+        self.model = model
+        self.max_output_tokens = max_output_tokens
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        # 처음 제출을 포함해서 최대 몇 번까지 제출할지
+        self.max_rounds = max_rounds
+        self.max_batch_requests = max_batch_requests
+        self.client = client
+        self.state_path = self.workdir / 'state.json'
+        # 입력 순서대로 입력 항목의 id (없으면 null)
+        self.ids_path = self.workdir / 'ids.jsonl'
+
+    def get_client(self):
+        return self.client or get_openai_client()
+
+    def request_path(self, round_no, part):
+        return self.workdir / f'requests-{round_no}-{part}.jsonl'
+
+    def result_path(self, round_no, part):
+        return self.workdir / f'results-{round_no}-{part}.jsonl'
+
+    def load_state(self):
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save_state(self, state):
+        # 기록 도중 종료돼도 상태 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        temp_path = self.state_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.state_path)
+
+    def build_request(self, custom_id, input, **body):
+        """Batch API 요청 한 줄"""
+        body = {'model': self.model, 'input': input, **body}
+        if self.max_output_tokens:
+            body.setdefault('max_output_tokens', self.max_output_tokens)
+        return {'custom_id': custom_id, 'method': 'POST', 'url': BATCH_ENDPOINT, 'body': body}
+
+    def request_lines(self, inputs, ids, **body):
+        """입력 항목 → 요청 JSON 문자열 (입력의 id는 ids 파일에 한 줄씩 기록)"""
+        for index, item in enumerate(inputs):
+            if isinstance(item, dict) and 'input' in item:
+                item_id, value = item.get('id'), item['input']
+            else:
+                item_id, value = None, item
+            ids.write(json.dumps(item_id, ensure_ascii=False) + '\n')
+            yield json.dumps(self.build_request(f'request-{index}', value, **body), ensure_ascii=False)
+
+    def write_requests(self, lines, round_no):
+        """요청 줄을 max_batch_requests건씩 파일로 나눠 기록 → 파일 수"""
+        parts = 0
+        f = None
+        try:
+            for count, line in enumerate(lines):
+                if count % self.max_batch_requests == 0:
+                    if f is not None:
+                        f.close()
+                    f = open(self.request_path(round_no, parts), 'w', encoding='utf-8')
+                    parts += 1
+                f.write(line + '\n')
+        finally:
+            if f is not None:
+                f.close()
+        return parts
+
+    def iter_requests(self, round_no, parts):
+        """라운드의 요청 줄을 제출 순서대로 읽기"""
+        for part in range(parts):
+            with open(self.request_path(round_no, part), encoding='utf-8') as f:
+                for line in f:
+                    yield line.rstrip('\n')
+
+    def retry_requests(self, round_no, parts, retry_ids):
+        """이전 라운드 요청 중 다시 제출할 요청만 골라냄"""
+        for line in self.iter_requests(round_no, parts):
+            if json.loads(line)['custom_id'] in retry_ids:
+                yield line
+
+    def submit(self, path):
+        """요청 파일을 업로드하고 배치 생성 → 배치 ID"""
+        client = self.get_client()
+        with open(path, 'rb') as f:
+            uploaded = client.files.create(file=f, purpose='batch')
+        batch = client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window='24h',
+        )
+        print(f"📤 배치 제출: {batch.id} ({path.name})")
+        return batch.id
+
+    def wait(self, batch_id):
+        """배치가 끝날 때까지 상태 조회 (조회 간격을 max_poll_interval까지 두 배씩 늘림)"""
+        interval = self.poll_interval
+        while True:
+            batch = self.get_client().batches.retrieve(batch_id)
+            counts = batch.request_counts
+            if counts:
+                print(f"⏳ {batch_id}: {batch.status} ({counts.completed + counts.failed}/{counts.total})")
+            else:
+                print(f"⏳ {batch_id}: {batch.status}")
+            if batch.status in TERMINAL_STATUSES:
+                return batch
+            time.sleep(interval)
+            interval = min(interval * 2, self.max_poll_interval)
+
+    def iter_file_lines(self, file_id):
+        """파일 내용을 내려받으면서 한 줄씩 생성"""
+        with self.get_client().files.with_streaming_response.content(file_id) as response:
+            for line in response.iter_lines():
+                if line:
+                    yield line
+
+    def collect_results(self, batch, round_no, part):
+        """배치의 결과/에러 파일을 결과 파일에 기록 → 다시 제출할 custom_id 집합"""
+        if batch.status == 'failed':
+            # 입력 파일 검증 실패 등으로 배치 전체가 거절된 경우 (다시 제출해도 같은 결과)
+            errors = batch.errors.data if batch.errors and batch.errors.data else []
+            for error in errors:
+                print(f"배치 실패: {batch.id} {error.code}: {error.message}")
+
+        retry_ids = set()
+        with open(self.result_path(round_no, part), 'w', encoding='utf-8') as out:
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if not file_id:
+                    continue
+                for line in self.iter_file_lines(file_id):
+                    record, retryable = parse_result(line)
+                    if retryable:
+                        retry_ids.add(record['id'])
+                    out.write(json.dumps(record, ensure_ascii=False) + '\n')
+        return retry_ids
+
+    def merge(self, state, output):
+        """라운드별 결과를 입력 순서대로 합쳐서 output에 기록 → (성공 수, 실패 수)
+
+        결과 본문은 메모리에 올리지 않고 custom_id별 파일 위치만 기억합니다.
+        같은 요청의 결과가 여러 라운드에 있으면 마지막 라운드의 결과를 사용합니다.
+        결과의 id는 custom_id 대신 입력 항목의 id로 바꿔서 기록합니다.
+        """
+        locations = {}
+        for round_no, parts in enumerate(state['parts']):
+            for part in range(parts):
+                path = self.result_path(round_no, part)
+                if not path.exists():
+                    continue
+                with open(path, 'rb') as f:
+                    offset = 0
+                    for line in f:
+                        locations[json.loads(line)['id']] = (path, offset)
+                        offset += len(line)
+
+        ok = failed = 0
+        with contextlib.ExitStack() as stack:
+            files = {}
+            ids = stack.enter_context(open(self.ids_path, encoding='utf-8'))
+            requests = self.iter_requests(0, state['parts'][0])
+            for index, (line, id_line) in enumerate(zip(requests, ids)):
+                custom_id = json.loads(line)['custom_id']
+                location = locations.get(custom_id)
+                if location is None:
+                    record = {'id': None, 'output_text': None, 'usage': None, 'error': 'no_result'}
+                else:
+                    path, offset = location
+                    if path not in files:
+                        files[path] = stack.enter_context(open(path, 'rb'))
+                    files[path].seek(offset)
+                    record = json.loads(files[path].readline())
+                record['id'] = json.loads(id_line)
+
+                if record['error']:
+                    failed += 1
+                else:
+                    ok += 1
+                output.write(json.dumps({'index': index, **record}, ensure_ascii=False) + '\n')
+        return ok, failed
+
+    def run(self, inputs, output, **body):
+        """입력 전체를 배치로 처리하고 결과를 입력 순서대로 output에 기록 → (성공 수, 실패 수)
+
+        body는 모든 요청 본문에 그대로 들어갑니다. (instructions 등)
+        작업 디렉터리에 이전 진행 상태가 있으면 inputs를 다시 읽지 않고 이어서 진행합니다.
+        """
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        state = self.load_state()
+        if state is None:
+            with open(self.ids_path, 'w', encoding='utf-8') as ids:
+                parts = self.write_requests(self.request_lines(inputs, ids, **body), 0)
+            state = {'round': 0, 'parts': [parts], 'batch_ids': []}
+            self.save_state(state)
+
+        while True:
+            round_no = state['round']
+            parts = state['parts'][round_no]
+            # 제출할 때마다 상태를 저장하므로 재실행 시 이미 제출한 배치는 다시 제출하지 않음
+            for part in range(len(state['batch_ids']), parts):
+                state['batch_ids'].append(self.submit(self.request_path(round_no, part)))
+                self.save_state(state)
+
+            retry_ids = set()
+            for part, batch_id in enumerate(state['batch_ids']):
+                batch = self.wait(batch_id)
+                retry_ids |= self.collect_results(batch, round_no, part)
+
+            if not retry_ids or round_no + 1 >= self.max_rounds:
+                break
+            print(f"🔁 {len(retry_ids)}건 다시 제출 (라운드 {round_no + 2}/{self.max_rounds})")
+            next_parts = self.write_requests(self.retry_requests(round_no, parts, retry_ids), round_no + 1)
+            state = {
+                'round': round_no + 1,
+                'parts': state['parts'] + [next_parts],
+                'batch_ids': [],
+            }
+            self.save_state(state)
+
+        return self.merge(state, output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI Batch API 일괄 처리 (JSON Lines 출력)")
+    parser.add_argument('input', help="프롬프트 파일 (한 줄에 하나 또는 JSON Lines, '-'이면 표준 입력)")
+    parser.add_argument('-o', '--output', default='-', help="결과 파일 ('-'이면 표준 출력)")
+    parser.add_argument('--workdir', required=True, help="요청/결과 파일과 진행 상태를 저장할 디렉터리 (작업마다 새로 지정)")
+    parser.add_argument('--model', default=DEFAULT_MODEL, help="사용할 모델")
+    parser.add_argument('--instructions', help="모든 요청에 공통으로 넣을 지시문")
+    parser.add_argument('--max-output-tokens', type=int, default=DEFAULT_MAX_OUTPUT_TOKENS, help="요청당 최대 출력 토큰")
+    parser.add_argument('--poll-interval', type=float, default=10, help="처음 상태 조회 간격 (초)")
+    parser.add_argument('--max-rounds', type=int, default=3, help="실패한 요청을 포함한 최대 제출 횟수")
+    args = parser.parse_args()
+
+    pipeline = BatchPipeline(
+        args.workdir,
+        model=args.model,
+        max_output_tokens=args.max_output_tokens,
+        poll_interval=args.poll_interval,
+        max_rounds=args.max_rounds,
+    )
+    body = {'instructions': args.instructions} if args.instructions else {}
+
+    # 결과를 표준 출력으로 보낼 때는 진행 메시지를 표준 에러로 돌림
+    stdout = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr if args.output == '-' else stdout):
+        output = stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+        try:
+            ok, failed = pipeline.run(read_inputs(args.input), output, **body)
+        finally:
+            if output is not stdout:
+                output.close()
+
+    print(f"✅ 완료: 성공 {ok}건, 실패 {failed}건", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,12 @@
-import os
-from dotenv import load_dotenv
-from openai import OpenAI
+import time
 
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from ai_clients import get_openai_client
+from openai_text import stream_text
+from streaming import print_stream
 
 
 def start_chat():
+    client = get_openai_client()
     messages = [{"role": "user", "content": "안녕! 나는 파이썬 개발자야."}]
 
     response1 = client.responses.create(
@@ -25,5 +25,164 @@ def start_chat():
     print(f"AI: {response2.output_text}")
 
 
+def start_chat_stream():
+    """start_chat()과 같은 대화를 답변이 생성되는 대로 출력"""
+    messages = [{"role": "user", "content": "안녕! 나는 파이썬 개발자야."}]
+
+    reply1 = print_stream(stream_text(messages), prefix="AI: ")
+
+    messages.append({"role": "assistant", "content": reply1})
+    messages.append({"role": "user", "content": "내가 방금 나를 누구라고 소개했었지?"})
+
+    print_stream(stream_text(messages), prefix="AI: ")
+
+
+SUMMARY_INSTRUCTIONS = (
+    "다음은 사용자와 AI의 이전 대화입니다. 이후 답변에 필요한 사용자 정보, 사실, 결정 사항, "
+    "아직 해결되지 않은 요청을 빠짐없이 간결하게 요약해줘."
+)
+
+
+class ChatSession:
+    """previous_response_id로 턴을 이어 가는 대화 세션
+
+    이전 대화는 서버에 저장된 응답을 previous_response_id로 참조하므로 매 턴 새 메시지만 보냅니다.
+    max_context_tokens를 지정하면 대화가 그보다 길어졌을 때 최근 keep_turns턴만 남기고
+    그 이전 대화를 요약한 뒤, 요약과 최근 턴으로 새 체인을 시작합니다. (sliding window + 요약)
+    previous_response_id로 이어도 이전 대화는 입력 토큰으로 계산되므로, 긴 대화에서는 압축이 필요합니다.
+    턴마다 토큰 사용량과 지연 시간을 metrics에 기록합니다.
+    """
+
+    def __init__(self, model="gpt-4.1-mini", instructions=None, max_context_tokens=None,
+                 keep_turns=4, summary_model=None, client=None):
+        self.model = model
+        self.instructions = instructions
+        self.max_context_tokens = max_context_tokens
+        self.keep_turns = keep_turns
+        self.summary_model = summary_model or model
+        self.client = client
+        self.previous_response_id = None
+        # 요약되지 않은 턴 ({"user", "assistant"}) - 새 체인을 시작할 때 다시 보냄
+        self.turns = []
+        self.summary = None
+        # 다음 턴에서 모델이 읽게 될 이전 대화 길이 (마지막 응답의 입력 + 출력 토큰)
+        self.context_tokens = 0
+        self.metrics = []
+
+    def get_client(self):
+        return self.client or get_openai_client()
+
+    def context_messages(self):
+        """새 체인을 시작할 때 보낼 이전 대화 (요약 + 최근 턴)"""
+        messages = []
+        if self.summary:
+            messages.append({"role": "developer", "content": f"이전 대화 요약:\n{self.summary}"})
+        for turn in self.turns:
+            messages.append({"role": "user", "content": turn["user"]})
+            messages.append({"role": "assistant", "content": turn["assistant"]})
+        return messages
+
+    def should_compact(self):
+        return (
+            self.max_context_tokens is not None
+            and self.context_tokens > self.max_context_tokens
+            # 요약을 매 턴 다시 만들지 않도록 요약할 턴이 keep_turns개 이상 쌓였을 때만 압축
+            and len(self.turns) >= self.keep_turns * 2
+        )
+
+    def compact(self):
+        """최근 keep_turns턴을 제외한 대화를 요약하고 다음 턴부터 새 체인 시작 → 요약 지표"""
+        older = self.turns[:len(self.turns) - self.keep_turns]
+        lines = [f"(이전 요약) {self.summary}"] if self.summary else []
+        for turn in older:
+            lines.append(f"사용자: {turn['user']}")
+            lines.append(f"AI: {turn['assistant']}")
+
+        started = time.perf_counter()
+        response = self.get_client().responses.create(
+            model=self.summary_model,
+            instructions=SUMMARY_INSTRUCTIONS,
+            input="\n".join(lines),
+            store=False,
+        )
+        self.summary = response.output_text
+        self.turns = self.turns[len(older):]
+        self.previous_response_id = None
+        return {
+            "summarized_turns": len(older),
+            "summary_tokens": response.usage.total_tokens if response.usage else None,
+            "summary_latency": round(time.perf_counter() - started, 3),
+        }
+
+    def send(self, message):
+        """메시지를 보내고 답변 텍스트 반환"""
+        metric = {"turn": len(self.metrics) + 1}
+        if self.should_compact():
+            metric.update(self.compact())
+
+        user_message = {"role": "user", "content": message}
+        if self.previous_response_id:
+            input = [user_message]
+            options = {"previous_response_id": self.previous_response_id}
+        else:
+            input = self.context_messages() + [user_message]
+            options = {}
+        # instructions는 이전 응답에서 이어지지 않으므로 매 턴 지정
+        if self.instructions:
+            options["instructions"] = self.instructions
+
+        started = time.perf_counter()
+        response = self.get_client().responses.create(model=self.model, input=input, **options)
+        latency = time.perf_counter() - started
+
+        reply = response.output_text
+        self.previous_response_id = response.id
+        self.turns.append({"user": message, "assistant": reply})
+
+        usage = response.usage
+        if usage:
+            self.context_tokens = usage.input_tokens + usage.output_tokens
+            details = usage.input_tokens_details
+            metric.update(
+                input_tokens=usage.input_tokens,
+                cached_tokens=details.cached_tokens if details else None,
+                output_tokens=usage.output_tokens,
+            )
+        metric["latency"] = round(latency, 3)
+        self.metrics.append(metric)
+        return reply
+
+    def stats(self):
+        """세션 전체 지표"""
+        return {
+            "turns": len(self.metrics),
+            "input_tokens": sum(m.get("input_tokens") or 0 for m in self.metrics),
+            "output_tokens": sum(m.get("output_tokens") or 0 for m in self.metrics),
+            "compactions": sum(1 for m in self.metrics if "summarized_turns" in m),
+            "avg_latency": (
+                round(sum(m["latency"] for m in self.metrics) / len(self.metrics), 3)
+                if self.metrics else None
+            ),
+        }
+
+
+def start_chat_session():
+    """ChatSession으로 대화하고 턴별 지표 출력"""
+    session = ChatSession(max_context_tokens=2000, keep_turns=2)
+    questions = [
+        "안녕! 나는 파이썬 개발자야.",
+        "비동기 프로그래밍을 배우고 있어. asyncio를 한 문장으로 설명해줘.",
+        "그럼 스레드와는 뭐가 달라?",
+        "내가 방금 나를 누구라고 소개했었지?",
+    ]
+    for question in questions:
+        print(f"나: {question}")
+        print(f"AI: {session.send(question)}")
+        print(f"   {session.metrics[-1]}")
+    print(session.stats())
+
+
 if __name__ == "__main__":
     start_chat()
+    start_chat_stream()
+    start_chat_session()
@@ -1,24 +1,18 @@
-import base64
-import os
 from pathlib import Path
-from dotenv import load_dotenv
-from openai import OpenAI
-
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from ai_clients import get_openai_client
+from image_prep import prepare_image
 
 
 def encode_image_to_data_url(image_path):
-    with open(image_path, "rb") as image_file:
-        encoded = base64.b64encode(image_file.read()).decode("utf-8")
-    return f"data:image/jpeg;base64,{encoded}"
+    # 긴 변을 줄이고 다시 인코딩한 이미지를 실제 형식의 MIME 타입으로 전송 (같은 이미지는 캐시 사용)
+    return prepare_image(image_path).to_data_url()
 
 
 def analyze_image():
     image_path = Path(__file__).resolve().parent / "sample_image.jpg"
     image_url = encode_image_to_data_url(str(image_path))
 
-    response = client.responses.create(
+    response = get_openai_client().responses.create(
         model="gpt-4.1-mini",
         input=[
             {
@@ -0,0 +1,310 @@
+"""
+OpenAI Responses API 비동기 일괄 실행기
+
+프롬프트(또는 Responses API input) 목록을 AsyncOpenAI로 동시에 요청합니다.
+
+- concurrency       : 동시에 보내는 요청 수
+- tokens_per_minute : 분당 토큰 예산. 요청 전에 예상 토큰(입력 추정치 + 최대 출력 토큰)만큼
+                      예산을 쓰고, 응답의 실제 사용량으로 보정합니다. (rate_limiter.RateLimiter)
+- 429/5xx/연결 오류는 지터를 넣은 지수 백오프로 재시도합니다.
+  Retry-After를 받으면 그 시간 동안 모든 요청을 멈춥니다.
+- 결과는 끝나는 순서대로(기본) 또는 입력 순서대로(ordered=True) 하나씩 돌려줍니다.
+  입력은 필요한 만큼만 읽으므로 프롬프트가 수만 개여도 메모리는 일정합니다.
+
+사용 방법:
+    runner = ResponseRunner(concurrency=32, tokens_per_minute=200_000)
+    async for result in runner.run(prompts, ordered=True):
+        print(result['index'], result['output_text'])
+
+실행 방법:
+    python src/openai_runner.py prompts.txt -o results.jsonl --concurrency 32 --tpm 200000
+    cat prompts.jsonl | python src/openai_runner.py - --ordered > results.jsonl
+
+입력 파일은 한 줄에 프롬프트 하나이거나, {"id": ..., "input": ...} 형식의 JSON Lines입니다.
+
+출력 예시 (한 줄):
+    {"index": 0, "id": "a1", "output_text": "...", "usage": {"input_tokens": 12, ...}, "error": null}
+
+실패한 요청은 output_text 없이 "error"에 사유가 기록됩니다.
+OPENAI_BASE_URL 환경 변수를 지정하면 로컬 대체 서버(fake_openai_server.py)로 시험할 수 있습니다.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import sys
+
+from ai_clients import close_async_openai_client, get_async_openai_client
+from lazy_import import lazy_import
+from rate_limiter import RateLimiter
+
+openai = lazy_import('openai')
+
+DEFAULT_MODEL = 'gpt-4.1-mini'
+DEFAULT_CONCURRENCY = 16
+DEFAULT_MAX_OUTPUT_TOKENS = 1024
+# 이미지 입력은 크기와 관계없이 이 토큰 수로 추정
+IMAGE_TOKEN_ESTIMATE = 1000
+
+
+def estimate_tokens(value):
+    """입력의 토큰 수 추정 (UTF-8 4바이트당 1토큰, 한글은 글자당 약 0.75토큰)"""
+    if isinstance(value, str):
+        if value.startswith('data:image/'):
+            return IMAGE_TOKEN_ESTIMATE
+        return len(value.encode('utf-8')) // 4 + 1
+    if isinstance(value, dict):
+        return sum(estimate_tokens(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_tokens(item) for item in value)
+    return 1
+
+
+def is_retryable(error):
+    """다시 보내면 성공할 수 있는 오류인지 (429, 5xx, 연결 오류/타임아웃)"""
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def retry_after(error):
+    """오류 응답의 Retry-After (초), 없으면 None"""
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class ResponseRunner:
+    """Responses API 요청을 동시성 제한과 분당 토큰 예산 안에서 실행"""
+
+    def __init__(self, model=DEFAULT_MODEL, concurrency=DEFAULT_CONCURRENCY,
+                 tokens_per_minute=None, max_output_tokens=DEFAULT_MAX_OUTPUT_TOKENS,
+                 max_retries=5, base_delay=1.0, max_delay=60.0, client=None):
+        self.model = model
+        self.concurrency = concurrency
+        self.max_output_tokens = max_output_tokens
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        # 지정하지 않으면 이벤트 루프별 공용 AsyncOpenAI 클라이언트 사용
+        self.client = client
+        # 분당 토큰 예산 (버킷 크기는 1분치)
+        self.limiter = (
+            RateLimiter(limit=tokens_per_minute, window=60, burst=tokens_per_minute)
+            if tokens_per_minute else None
+        )
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def get_client(self):
+        # 재시도는 직접 처리하므로 SDK의 자동 재시도는 끔
+        client = self.client or get_async_openai_client()
+        return client.with_options(max_retries=0)
+
+    def backoff(self, attempt, error):
+        """attempt번째 재시도 전 대기 시간 (full jitter, Retry-After가 더 길면 그만큼)"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        return max(delay, retry_after(error) or 0)
+
+    async def create(self, input, **kwargs):
+        """요청 하나를 보내고 응답 반환 (재시도가 끝나도 실패하면 마지막 예외를 발생)"""
+        max_output_tokens = kwargs.pop('max_output_tokens', self.max_output_tokens)
+        if max_output_tokens:
+            kwargs['max_output_tokens'] = max_output_tokens
+        estimated = estimate_tokens(input) + (max_output_tokens or DEFAULT_MAX_OUTPUT_TOKENS)
+
+        for attempt in range(self.max_retries + 1):
+            if self.limiter:
+                await self.limiter.acquire_async(estimated)
+            try:
+                response = await self.get_client().responses.create(
+                    model=self.model, input=input, **kwargs
+                )
+            except openai.OpenAIError as e:
+                if self.limiter:
+                    # 거절된 요청은 예산을 쓰지 않은 것으로 보고, Retry-After 동안 모든 요청을 멈춤
+                    self.limiter.refund(estimated)
+                    if getattr(e, 'response', None) is not None:
+                        self.limiter.update(e.response)
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                self.retries += 1
+                await asyncio.sleep(self.backoff(attempt, e))
+                continue
+
+            usage = response.usage
+            if usage:
+                self.input_tokens += usage.input_tokens
+                self.output_tokens += usage.output_tokens
+                if self.limiter:
+                    self.limiter.refund(estimated - usage.total_tokens)
+            return response
+
+    async def run_item(self, index, item, **kwargs):
+        """항목 하나를 요청하고 결과 dict 반환 (실패해도 예외 대신 error에 기록)"""
+        if isinstance(item, dict) and 'input' in item:
+            item_id, value = item.get('id'), item['input']
+        else:
+            item_id, value = None, item
+
+        record = {'index': index, 'id': item_id, 'output_text': None, 'usage': None, 'error': None}
+        try:
+            response = await self.create(value, **kwargs)
+        except Exception as e:
+            self.failed += 1
+            record['error'] = f'{type(e).__name__}: {e}'
+            return record
+
+        self.completed += 1
+        record['output_text'] = response.output_text
+        if response.usage:
+            record['usage'] = {
+                'input_tokens': response.usage.input_tokens,
+                'output_tokens': response.usage.output_tokens,
+                'total_tokens': response.usage.total_tokens,
+            }
+        return record
+
+    async def run(self, inputs, ordered=False, max_pending=None, **kwargs):
+        """inputs의 각 항목을 요청하고 결과 dict를 하나씩 생성 (async generator)
+
+        기본은 끝나는 순서대로, ordered=True면 입력 순서대로 돌려줍니다.
+        아직 돌려주지 않은 항목은 최대 max_pending개(기본 concurrency의 4배)까지만 읽어 둡니다.
+        kwargs는 responses.create()에 그대로 전달됩니다. (instructions 등)
+        """
+        max_pending = max_pending or self.concurrency * 4
+        semaphore = asyncio.Semaphore(self.concurrency)
+        window = asyncio.Semaphore(max_pending)
+        finished = asyncio.Queue()
+        tasks = set()
+
+        async def run_one(index, item):
+            async with semaphore:
+                finished.put_nowait(await self.run_item(index, item, **kwargs))
+
+        async def produce():
+            count = 0
+            try:
+                for index, item in enumerate(inputs):
+                    await window.acquire()
+                    task = asyncio.create_task(run_one(index, item))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    count += 1
+            except Exception as e:
+                finished.put_nowait(e)
+                return
+            # 입력을 다 읽으면 전체 개수를 알림
+            finished.put_nowait(count)
+
+        producer = asyncio.create_task(produce())
+        total = None
+        emitted = 0
+        buffer = {}
+        try:
+            while total is None or emitted < total:
+                result = await finished.get()
+                if isinstance(result, Exception):
+                    raise result
+                if isinstance(result, int):
+                    total = result
+                    continue
+
+                if ordered:
+                    # 앞 순서의 결과가 도착할 때까지 보관했다가 순서대로 내보냄
+                    buffer[result['index']] = result
+                    ready = []
+                    while emitted + len(ready) in buffer:
+                        ready.append(buffer.pop(emitted + len(ready)))
+                else:
+                    ready = [result]
+
+                for record in ready:
+                    emitted += 1
+                    window.release()
+                    yield record
+        finally:
+            producer.cancel()
+            for task in list(tasks):
+                task.cancel()
+
+    def stats(self):
+        """실행 지표"""
+        stats = {
+            'completed': self.completed,
+            'failed': self.failed,
+            'retries': self.retries,
+            'input_tokens': self.input_tokens,
+            'output_tokens': self.output_tokens,
+        }
+        if self.limiter:
+            stats['budget'] = self.limiter.stats()
+        return stats
+
+
+def read_inputs(path):
+    """입력을 한 줄씩 읽기 (JSON 객체 줄은 {"id", "input"}로, 나머지는 프롬프트 문자열로)"""
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8')
+    try:
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            yield json.loads(line) if line.startswith('{') else line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+async def main_async(args, stdout):
+    runner = ResponseRunner(
+        model=args.model,
+        concurrency=args.concurrency,
+        tokens_per_minute=args.tpm,
+        max_output_tokens=args.max_output_tokens,
+    )
+    kwargs = {'instructions': args.instructions} if args.instructions else {}
+
+    output = stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        async for record in runner.run(read_inputs(args.input), ordered=args.ordered, **kwargs):
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            output.flush()
+    finally:
+        await close_async_openai_client()
+        if output is not stdout:
+            output.close()
+
+    print(f"✅ 완료: {runner.stats()}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI Responses API 일괄 실행 (JSON Lines 출력)")
+    parser.add_argument('input', help="프롬프트 파일 (한 줄에 하나 또는 JSON Lines, '-'이면 표준 입력)")
+    parser.add_argument('-o', '--output', default='-', help="결과 파일 ('-'이면 표준 출력)")
+    parser.add_argument('--model', default=DEFAULT_MODEL, help="사용할 모델")
+    parser.add_argument('--instructions', help="모든 요청에 공통으로 넣을 지시문")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help="동시에 보낼 요청 수")
+    parser.add_argument('--tpm', type=int, help="분당 토큰 예산 (지정하지 않으면 제한 없음)")
+    parser.add_argument('--max-output-tokens', type=int, default=DEFAULT_MAX_OUTPUT_TOKENS, help="요청당 최대 출력 토큰")
+    parser.add_argument('--ordered', action='store_true', help="결과를 입력 순서대로 출력")
+    args = parser.parse_args()
+
+    stdout = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr if args.output == '-' else stdout):
+        asyncio.run(main_async(args, stdout))
+
+
+if __name__ == '__main__':
+    main()
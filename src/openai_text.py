@@ -1,12 +1,9 @@
-import os
-from dotenv import load_dotenv
-from openai import OpenAI
-
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from ai_clients import get_openai_client
+from streaming import print_stream
 
 
 def generate_text():
+    client = get_openai_client()
     response = client.responses.create(
         model="gpt-4.1-mini",
         input="인공지능의 미래에 대해 짧게 설명해줘.",
@@ -15,5 +12,24 @@ def generate_text():
     print(response.output_text)
 
 
+def stream_text(input, model="gpt-4.1-mini"):
+    """응답 텍스트를 생성되는 대로 조각(delta)씩 생성
+
+    input은 프롬프트 문자열 또는 대화 메시지 목록입니다.
+    """
+    with get_openai_client().responses.create(model=model, input=input, stream=True) as stream:
+        for event in stream:
+            if event.type == "response.output_text.delta":
+                yield event.delta
+            elif event.type == "error":
+                raise RuntimeError(event.message)
+
+
+def generate_text_stream():
+    print("--- 텍스트 생성 결과 (스트리밍) ---")
+    print_stream(stream_text("인공지능의 미래에 대해 짧게 설명해줘."))
+
+
 if __name__ == "__main__":
     generate_text()
+    generate_text_stream()
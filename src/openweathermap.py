@@ -1,35 +1,101 @@
-import requests
-import os
-from dotenv import load_dotenv
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from config import get_env
+from lazy_import import lazy_import
+from async_http import DEFAULT_CONCURRENCY, gather_limited, get_async_client
+from http_session import get_session
+from response_cache import get_response_cache, make_key
+from kakao_api import search_address
+from single_flight import SingleFlight
 
-load_dotenv()
+# import 비용이 큰 패키지는 처음 사용할 때 import
+requests = lazy_import('requests')
+httpx = lazy_import('httpx')
+
+# 날씨 응답 캐시 유효 시간 (초)
+WEATHER_CACHE_TTL = 600
+# 도시 위치(좌표, 도시 ID) 캐시 유효 시간 (초) - 위치는 거의 바뀌지 않으므로 30일
+GEO_CACHE_TTL = 30 * 24 * 3600
+# group 엔드포인트 한 번에 조회할 수 있는 최대 도시 수
+GROUP_SIZE = 20
+
+# 같은 도시의 동시 조회를 하나로 합치는 그룹 (모든 WeatherDashboard가 공유)
+weather_flight = SingleFlight()
 
 class WeatherDashboard:
-    def __init__(self):
-        self.api_key = os.getenv('OPENWEATHER_API_KEY')
+    def __init__(self, response_cache=None, use_cache=True, single_flight=None,
+                 geocoder='openweathermap', max_workers=8):
+        self.api_key = get_env('OPENWEATHER_API_KEY')
         self.base_url = 'https://api.openweathermap.org/data/2.5/weather'
+        self.group_url = 'https://api.openweathermap.org/data/2.5/group'
+        self.geocoding_url = 'https://api.openweathermap.org/geo/1.0/direct'
+        # 도시 이름 → 좌표 변환에 사용할 API ('openweathermap' 또는 'kakao')
+        self.geocoder = geocoder
+        self.max_workers = max_workers
+        # 도시 이름 → {'lat', 'lon', 'id'} (디스크 캐시 앞의 메모리 캐시)
+        self.locations = {}
+        # 디스크 응답 캐시 (use_cache=False면 항상 API 호출)
+        self.response_cache = response_cache
+        self.use_cache = use_cache
+        self.single_flight = single_flight or weather_flight
     
-    def get_weather(self, city):
-        """특정 도시의 날씨 정보 조회"""
-        params = {
+    def get_cache(self):
+        """응답 캐시 (지정하지 않았으면 공유 캐시 사용)"""
+        if not self.use_cache:
+            return None
+        if self.response_cache is None:
+            self.response_cache = get_response_cache()
+        return self.response_cache
+    
+    def build_params(self, city):
+        """날씨 조회 요청 파라미터"""
+        return {
             'q': city,
             'appid': self.api_key,
             'units': 'metric',
             'lang': 'kr'
         }
+    
+    def get_weather(self, city):
+        """특정 도시의 날씨 정보 조회"""
+        params = self.build_params(city)
+        cache = self.get_cache()
+        if cache:
+            data = cache.get('weather', params)
+            if data is not None:
+                return data
+        
+        # 같은 도시를 동시에 조회하면 업스트림 요청은 한 번만 보내고 결과를 공유
+        return self.single_flight.do(
+            make_key('weather', params), lambda: self.fetch_weather(params)
+        )
+    
+    def fetch_weather(self, params):
+        """API에서 날씨 정보 조회 후 캐시에 저장"""
+        if not self.api_key:
+            print("환경 변수 OPENWEATHER_API_KEY가 설정되지 않았습니다.")
+            return None
         
         try:
-            response = requests.get(self.base_url, params=params)
+            response = get_session().get(self.base_url, params=params)
             response.raise_for_status()
-            return response.json()
+            data = response.json()
         except requests.RequestException as e:
             print(f'날씨 정보 조회 실패: {e}')
             return None
+        
+        cache = self.get_cache()
+        if cache:
+            cache.set('weather', params, data, WEATHER_CACHE_TTL)
+        return data
     
     def display_weather(self, city):
         """날씨 정보를 보기 좋게 출력"""
         data = self.get_weather(city)
-        
+        self.print_weather(city, data)
+    
+    def print_weather(self, city, data):
+        """조회한 날씨 데이터 출력"""
         if not data:
             return
         
@@ -43,13 +109,221 @@ class WeatherDashboard:
         print(f"💨 풍속: {data['wind']['speed']}m/s")
         print(f"{'='*40}\n")
     
-    def compare_cities(self, cities):
-        """여러 도시의 날씨 비교"""
+    def geocode(self, city):
+        """도시 이름 → {'lat', 'lon', 'id'} (한 번 찾으면 위치 캐시에 오래 저장)"""
+        location = self.locations.get(city)
+        if location is not None:
+            return location
+        
+        cache = self.get_cache()
+        if cache:
+            location = cache.get('geo', self.location_params(city))
+        if location is None:
+            location = self.fetch_location(city)
+            if location is None:
+                return None
+            self.save_location(city, location)
+        
+        self.locations[city] = location
+        return location
+    
+    def location_params(self, city):
+        """위치 캐시 키 (geocoder마다 결과가 다를 수 있으므로 키에 포함)"""
+        return {'q': city, 'geocoder': self.geocoder}
+    
+    def save_location(self, city, location):
+        self.locations[city] = location
+        cache = self.get_cache()
+        if cache:
+            cache.set('geo', self.location_params(city), location, GEO_CACHE_TTL)
+    
+    def fetch_location(self, city):
+        """geocoding API로 도시 좌표 조회"""
+        if self.geocoder == 'kakao':
+            documents = search_address(city)
+            if not documents:
+                print(f"'{city}' 위치를 찾을 수 없습니다.")
+                return None
+            # 카카오 주소 검색 결과의 x는 경도, y는 위도
+            return {'lat': float(documents[0]['y']), 'lon': float(documents[0]['x'])}
+        
+        params = {'q': city, 'limit': 1, 'appid': self.api_key}
+        try:
+            response = get_session().get(self.geocoding_url, params=params)
+            response.raise_for_status()
+            results = response.json()
+        except requests.RequestException as e:
+            print(f'위치 조회 실패: {e}')
+            return None
+        
+        if not results:
+            print(f"'{city}' 위치를 찾을 수 없습니다.")
+            return None
+        return {'lat': results[0]['lat'], 'lon': results[0]['lon']}
+    
+    def get_weather_by_location(self, city, location):
+        """좌표로 날씨 조회 (응답의 도시 ID를 위치 캐시에 기록해서 다음부터 group 조회에 사용)"""
+        params = {
+            'lat': location['lat'],
+            'lon': location['lon'],
+            'appid': self.api_key,
+            'units': 'metric',
+            'lang': 'kr'
+        }
+        
+        try:
+            response = get_session().get(self.base_url, params=params)
+            response.raise_for_status()
+            data = response.json()
+        except requests.RequestException as e:
+            print(f'날씨 정보 조회 실패: {e}')
+            return None
+        
+        if data.get('id'):
+            self.save_location(city, {**location, 'id': data['id']})
+        return data
+    
+    def get_weather_group(self, city_ids):
+        """도시 ID 목록(최대 GROUP_SIZE개)의 날씨를 요청 한 번으로 조회 → {도시 ID: 날씨}"""
+        params = {
+            'id': ','.join(str(city_id) for city_id in city_ids),
+            'appid': self.api_key,
+            'units': 'metric',
+            'lang': 'kr'
+        }
+        
+        try:
+            response = get_session().get(self.group_url, params=params)
+            response.raise_for_status()
+            return {item['id']: item for item in response.json().get('list', [])}
+        except requests.RequestException as e:
+            print(f'날씨 정보 일괄 조회 실패: {e}')
+            return {}
+    
+    def get_weather_bulk(self, cities):
+        """여러 도시의 날씨를 적은 요청 수로 조회 (cities와 같은 순서)
+
+        0) get_weather()와 같은 날씨 캐시를 먼저 확인하고 캐시에 없는 도시만 조회
+        1) 도시 이름 → 좌표/도시 ID (위치 캐시 사용, 처음 한 번만 geocoding)
+        2) 도시 ID를 아는 도시는 group 엔드포인트로 GROUP_SIZE개씩 한 번에 조회
+        3) ID를 모르거나 group 응답에 없는 도시는 좌표로 조회하고 ID를 기록
+           (get_weather()와 같은 키로 single-flight를 거치므로 동시 조회는 한 번만 요청)
+        조회한 결과는 날씨 캐시에 저장하므로 이후의 get_weather()도 같은 값을 사용합니다.
+        처음 실행할 때는 도시마다 요청이 필요하지만, 이후에는 도시 20개당 요청 한 번입니다.
+        """
+        cache = self.get_cache()
+        results = [cache.get('weather', self.build_params(city)) if cache else None for city in cities]
+        todo = [i for i, data in enumerate(results) if data is None]
+        if not todo:
+            return results
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            locations = dict(zip(todo, executor.map(self.geocode, [cities[i] for i in todo])))
+            
+            city_ids = list(dict.fromkeys(
+                location['id'] for location in locations.values() if location and location.get('id')
+            ))
+            chunks = [city_ids[i:i + GROUP_SIZE] for i in range(0, len(city_ids), GROUP_SIZE)]
+            weather_by_id = {}
+            for result in executor.map(self.get_weather_group, chunks):
+                weather_by_id.update(result)
+            
+            for i in todo:
+                if locations[i]:
+                    results[i] = weather_by_id.get(locations[i].get('id'))
+            missing = [i for i in todo if locations[i] and results[i] is None]
+            
+            def fetch(i):
+                return self.single_flight.do(
+                    make_key('weather', self.build_params(cities[i])),
+                    lambda: self.get_weather_by_location(cities[i], locations[i]),
+                )
+            
+            for i, data in zip(missing, executor.map(fetch, missing)):
+                results[i] = data
+        
+        if cache:
+            cache.set_many('weather', [
+                (self.build_params(cities[i]), results[i], WEATHER_CACHE_TTL)
+                for i in todo if results[i] is not None
+            ])
+        return results
+    
+    def compare_cities(self, cities, bulk=False):
+        """여러 도시의 날씨 비교 (bulk=True면 위치 캐시와 group 조회로 요청 수를 줄임)"""
         print("\n🌍 도시별 날씨 비교\n")
         
+        if bulk:
+            for city, data in zip(cities, self.get_weather_bulk(cities)):
+                self.print_weather(city, data)
+            return
+        
         for city in cities:
             self.display_weather(city)
 
+
+class AsyncWeatherDashboard(WeatherDashboard):
+    """여러 도시를 동시에 조회하는 비동기 버전"""
+    
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, response_cache=None, use_cache=True,
+                 single_flight=None):
+        super().__init__(
+            response_cache=response_cache,
+            use_cache=use_cache,
+            single_flight=single_flight,
+        )
+        self.concurrency = concurrency
+    
+    async def get_weather(self, city):
+        """특정 도시의 날씨 정보 조회"""
+        params = self.build_params(city)
+        cache = self.get_cache()
+        if cache:
+            data = cache.get('weather', params)
+            if data is not None:
+                return data
+        
+        # 같은 도시를 동시에 조회하면 업스트림 요청은 한 번만 보내고 결과를 공유
+        return await self.single_flight.do_async(
+            make_key('weather', params), lambda: self.fetch_weather(params)
+        )
+    
+    async def fetch_weather(self, params):
+        """API에서 날씨 정보 조회 후 캐시에 저장"""
+        if not self.api_key:
+            print("환경 변수 OPENWEATHER_API_KEY가 설정되지 않았습니다.")
+            return None
+        
+        try:
+            response = await get_async_client().get(self.base_url, params=params)
+            response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPError as e:
+            print(f'날씨 정보 조회 실패: {e}')
+            return None
+        
+        cache = self.get_cache()
+        if cache:
+            cache.set('weather', params, data, WEATHER_CACHE_TTL)
+        return data
+    
+    async def display_weather(self, city):
+        """날씨 정보를 보기 좋게 출력"""
+        data = await self.get_weather(city)
+        self.print_weather(city, data)
+    
+    async def get_weather_many(self, cities):
+        """여러 도시의 날씨를 동시에 조회 (cities와 같은 순서)"""
+        return await gather_limited(self.get_weather, cities, self.concurrency)
+    
+    async def compare_cities(self, cities):
+        """여러 도시의 날씨 비교 (요청은 동시에, 출력은 입력 순서대로)"""
+        print("\n🌍 도시별 날씨 비교\n")
+        
+        results = await self.get_weather_many(cities)
+        for city, data in zip(cities, results):
+            self.print_weather(city, data)
+
 # 사용 예시
 if __name__ == '__main__':
     dashboard = WeatherDashboard()
@@ -59,4 +333,10 @@ if __name__ == '__main__':
     
     # 여러 도시 비교
     cities = ['Seoul', 'Busan', 'Jeju', 'Tokyo', 'New York']
-    dashboard.compare_cities(cities)
\ No newline at end of file
+    dashboard.compare_cities(cities)
+    
+    # 여러 도시 일괄 비교 (좌표 캐시 + group 조회)
+    dashboard.compare_cities(cities, bulk=True)
+    
+    # 여러 도시 동시 비교 (비동기)
+    asyncio.run(AsyncWeatherDashboard().compare_cities(cities))
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""
+GitHub API rate limit 스케줄러 (토큰 버킷)
+
+GitHub는 응답마다 X-RateLimit-Remaining(남은 요청 수)과
+X-RateLimit-Reset(초기화 시각, unix)을 알려줍니다.
+이 모듈은 그 값을 읽어서 "초기화 시각까지 남은 요청을 고르게 나눠 쓰는" 속도로
+요청을 내보내므로, 한도에 부딪혀 403을 받기 전에 미리 속도를 늦춥니다.
+
+- 요청 전에 acquire() (스레드) 또는 await acquire_async() (코루틴)를 호출합니다.
+  토큰이 없으면 토큰이 생길 때까지 기다립니다.
+- 응답을 받으면 update(response)로 헤더를 반영합니다.
+- 2차 제한(secondary rate limit)으로 403/429와 Retry-After를 받으면
+  그 시간 동안 모든 요청을 멈추고, should_retry(response)가 True를 반환합니다.
+- stats()로 대기 중인 요청 수, 대기 횟수, 대기 시간을 확인할 수 있습니다.
+- cost를 지정하면 요청 하나가 토큰 여러 개를 쓰므로, 분당 토큰(TPM) 예산처럼
+  요청마다 크기가 다른 한도에도 사용할 수 있습니다. (refund()로 실제 사용량 보정)
+
+사용 방법:
+    limiter = RateLimiter()
+
+    limiter.acquire()
+    response = get_rate_limited_session().get(url)   # 429는 세션에서 재시도하지 않음
+    limiter.update(response)
+    if limiter.should_retry(response):
+        ...  # 다시 acquire() 후 재요청
+"""
+
+import asyncio
+import datetime
+import email.utils
+import threading
+import time
+
+# 토큰 없이 60회, 토큰이 있으면 5000회 / 시간
+UNAUTHENTICATED_LIMIT = 60
+AUTHENTICATED_LIMIT = 5000
+RATE_LIMIT_WINDOW = 3600
+
+
+def retry_after_seconds(value, now=None):
+    """Retry-After 헤더 값(초 또는 HTTP 날짜) → 기다릴 시간(초), 읽을 수 없으면 None"""
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        # 시간대가 -0000이면 UTC로 간주
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+    now = time.time() if now is None else now
+    return max(retry_at.timestamp() - now, 0.0)
+
+
+class RateLimiter:
+    """스레드와 코루틴이 함께 쓸 수 있는 토큰 버킷"""
+
+    def __init__(self, limit=AUTHENTICATED_LIMIT, window=RATE_LIMIT_WINDOW,
+                 burst=20, reserve=0, poll_interval=1.0):
+        # burst: 한 번에 연달아 보낼 수 있는 최대 요청 수 (버킷 크기)
+        # reserve: 다른 작업을 위해 남겨 둘 요청 수
+        # poll_interval: 대기 중인 요청이 토큰을 다시 확인하는 최대 간격 (초)
+        self.burst = burst
+        self.reserve = reserve
+        self.poll_interval = poll_interval
+        self.default_rate = limit / window
+        self.rate = self.default_rate  # 초당 토큰
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0  # monotonic 시각
+        self.remaining = None
+        self.reset_at = None  # unix 시각
+        self._lock = threading.Lock()
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.waits = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self, now):
+        if self.rate <= 0 and now >= self.blocked_until:
+            # 한도를 다 써서 멈췄다가 초기화 시각이 지나면 기본 속도로 다시 시작
+            self.rate = self.default_rate
+            self.updated_at = max(self.updated_at, self.blocked_until)
+        elapsed = now - self.updated_at
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self, cost=1):
+        """토큰이 있으면 cost개 가져가고 0을, 없으면 토큰이 찰 때까지 남은 시간(초)을 반환"""
+        # 버킷보다 큰 요청은 버킷이 가득 찼을 때 보냄
+        cost = min(cost, self.burst)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # 한도 초과로 멈춘 동안에는 초기화 시각(또는 Retry-After)까지 대기
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            if self.tokens >= cost:
+                self.tokens -= cost
+                return 0.0
+            if self.rate <= 0:
+                return self.poll_interval
+            return (cost - self.tokens) / self.rate
+
+    def refund(self, amount):
+        """미리 가져간 토큰과 실제 사용량의 차이를 보정 (음수면 더 차감)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.burst, self.tokens + amount)
+
+    def _enter_queue(self):
+        with self._lock:
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+    def _leave_queue(self, waited):
+        with self._lock:
+            self.queue_depth -= 1
+            self.waits += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def acquire(self, cost=1):
+        """요청을 보내도 될 때까지 현재 스레드를 대기"""
+        wait = self.try_acquire(cost)
+        if wait == 0:
+            return
+
+        started = time.monotonic()
+        self._enter_queue()
+        try:
+            # 기다리는 동안 응답 헤더로 속도가 바뀔 수 있으므로 poll_interval마다 다시 확인
+            while wait > 0:
+                time.sleep(min(wait, self.poll_interval))
+                wait = self.try_acquire(cost)
+        finally:
+            self._leave_queue(time.monotonic() - started)
+
+    async def acquire_async(self, cost=1):
+        """요청을 보내도 될 때까지 현재 코루틴을 대기"""
+        wait = self.try_acquire(cost)
+        if wait == 0:
+            return
+
+        started = time.monotonic()
+        self._enter_queue()
+        try:
+            while wait > 0:
+                await asyncio.sleep(min(wait, self.poll_interval))
+                wait = self.try_acquire(cost)
+        finally:
+            self._leave_queue(time.monotonic() - started)
+
+    def update(self, response):
+        """응답 헤더의 rate limit 정보를 반영"""
+        headers = response.headers
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        retry_after = headers.get('Retry-After')
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if remaining is not None and reset is not None:
+                self.remaining = int(remaining)
+                self.reset_at = int(reset)
+                seconds_left = max(self.reset_at - time.time(), 1)
+                usable = max(self.remaining - self.reserve, 0)
+
+                # 초기화 시각까지 남은 요청을 고르게 나눠 쓰는 속도
+                self.rate = usable / seconds_left
+                # 서버가 알려준 남은 횟수보다 많이 보내지 않도록 버킷을 줄임
+                self.tokens = min(self.tokens, usable)
+                if usable == 0:
+                    self.blocked_until = max(self.blocked_until, now + seconds_left)
+
+            if retry_after is not None and response.status_code in (403, 429):
+                wait = retry_after_seconds(retry_after)
+                if wait is None and self.reset_at is not None:
+                    # 읽을 수 없는 Retry-After면 한도 초기화 시각까지 대기
+                    wait = max(self.reset_at - time.time(), 0)
+                if wait is not None:
+                    self.blocked_until = max(self.blocked_until, now + wait)
+
+    def should_retry(self, response):
+        """rate limit 때문에 거절된 응답이면 True (update() 이후 호출)"""
+        if response.status_code not in (403, 429):
+            return False
+        return (
+            'Retry-After' in response.headers
+            or response.headers.get('X-RateLimit-Remaining') == '0'
+        )
+
+    def stats(self):
+        """스케줄러 지표"""
+        with self._lock:
+            return {
+                'queue_depth': self.queue_depth,
+                'max_queue_depth': self.max_queue_depth,
+                'waits': self.waits,
+                'total_wait': round(self.total_wait, 3),
+                'max_wait': round(self.max_wait, 3),
+                'rate_per_sec': round(self.rate, 3),
+                'remaining': self.remaining,
+                'reset_at': self.reset_at,
+            }
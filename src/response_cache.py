@@ -0,0 +1,169 @@
+"""
+디스크 응답 캐시 (SQLite)
+
+같은 조건의 API 요청 결과를 파일에 저장해 두고 유효 시간 동안 재사용합니다.
+무료 요금제의 일일 호출 한도를 아끼고, 네트워크 왕복 없이 바로 응답할 수 있습니다.
+
+- 키: 엔드포인트 이름 + 정규화한 요청 파라미터
+  (키 순서와 앞뒤 공백 차이는 같은 요청으로 취급하고 API 키는 제외,
+  대소문자는 도시 이름처럼 API가 구분하지 않는 파라미터(CASE_INSENSITIVE_PARAMS)만 무시)
+- 항목마다 유효 시간(TTL)이 있고, max_entries를 넘으면 가장 오래전에 저장한 항목부터 지웁니다.
+- SQLite WAL 모드를 사용하므로 여러 워커 프로세스가 같은 파일을 동시에 읽고 쓸 수 있습니다.
+
+캐시 파일 위치는 환경 변수 RESPONSE_CACHE_PATH로 바꿀 수 있습니다.
+
+사용 방법:
+    cache = get_response_cache()
+    data = cache.get('weather', params)
+    if data is None:
+        data = fetch()
+        cache.set('weather', params, data, ttl=600)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = '.cache/responses.sqlite3'
+DEFAULT_MAX_ENTRIES = 10000
+# 요청 파라미터 중 캐시 키에서 제외할 항목 (API 키)
+IGNORED_PARAMS = frozenset({'appid', 'apiKey', 'api_key'})
+# 대소문자를 구분하지 않는 파라미터 (도시 이름, 검색어, 언어, 단위)
+CASE_INSENSITIVE_PARAMS = frozenset({'q', 'lang', 'language', 'units'})
+# 몇 번 저장할 때마다 만료 항목 정리와 크기 제한을 적용할지
+EVICT_EVERY = 100
+
+
+def make_key(namespace, params):
+    """엔드포인트 이름과 정규화한 파라미터로 캐시 키 생성"""
+    normalized = {}
+    for key, value in params.items():
+        if key in IGNORED_PARAMS:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+            if key in CASE_INSENSITIVE_PARAMS:
+                value = value.lower()
+        normalized[key] = value
+    return namespace + ':' + json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+
+
+class ResponseCache:
+    """여러 프로세스/스레드가 공유할 수 있는 SQLite 기반 응답 캐시"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES, timeout=30):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY,'
+            ' namespace TEXT NOT NULL,'
+            ' value TEXT NOT NULL,'
+            ' expires_at REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at)')
+
+    def _connect(self):
+        """스레드마다 별도의 연결 사용 (sqlite3 연결은 스레드 간에 공유하지 않음)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace, params):
+        """유효한 캐시가 있으면 저장된 값을, 없으면 None 반환"""
+        row = self._connect().execute(
+            'SELECT value, expires_at FROM responses WHERE key = ?',
+            (make_key(namespace, params),),
+        ).fetchone()
+
+        with self._lock:
+            if row is None or row[1] < time.time():
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, namespace, params, value, ttl):
+        """값을 ttl초 동안 저장"""
+        self.set_many(namespace, [(params, value, ttl)])
+
+    def set_many(self, namespace, items):
+        """(params, 값, ttl) 여러 개를 한 트랜잭션으로 저장 (대량 저장 시 커밋 횟수를 줄임)"""
+        now = time.time()
+        rows = [
+            (make_key(namespace, params), namespace, json.dumps(value, ensure_ascii=False), now + ttl)
+            for params, value, ttl in items
+        ]
+        if not rows:
+            return
+        conn = self._connect()
+        conn.execute('BEGIN')
+        try:
+            conn.executemany(
+                'INSERT OR REPLACE INTO responses (key, namespace, value, expires_at) VALUES (?, ?, ?, ?)',
+                rows,
+            )
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+        with self._lock:
+            before = self._writes
+            self._writes += len(rows)
+            should_evict = self._writes // EVICT_EVERY > before // EVICT_EVERY
+        if should_evict:
+            self.evict()
+
+    def evict(self):
+        """만료된 항목을 지우고, max_entries를 넘으면 가장 오래전에 저장한 항목부터 삭제
+
+        항목 수를 세면 테이블 전체를 읽으므로, 저장할 때마다 커지는 rowid로 범위를 정해서
+        최근에 저장한 max_entries개 범위 밖의 항목만 지웁니다. (둘 다 인덱스 범위 삭제)
+        """
+        conn = self._connect()
+        conn.execute('DELETE FROM responses WHERE expires_at < ?', (time.time(),))
+        (newest,) = conn.execute('SELECT MAX(rowid) FROM responses').fetchone()
+        if newest is not None and newest > self.max_entries:
+            conn.execute('DELETE FROM responses WHERE rowid <= ?', (newest - self.max_entries,))
+
+    def clear(self, namespace=None):
+        if namespace is None:
+            self._connect().execute('DELETE FROM responses')
+        else:
+            self._connect().execute('DELETE FROM responses WHERE namespace = ?', (namespace,))
+
+    def stats(self):
+        """현재 프로세스의 캐시 적중 통계"""
+        (count,) = self._connect().execute('SELECT COUNT(*) FROM responses').fetchone()
+        return {'entries': count, 'hits': self.hits, 'misses': self.misses}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """공유 응답 캐시 반환 (처음 호출 시 생성)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(os.getenv('RESPONSE_CACHE_PATH', DEFAULT_CACHE_PATH))
+    return _cache
@@ -0,0 +1,104 @@
+"""
+요청 합치기 (single-flight)
+
+같은 키의 요청이 이미 진행 중이면 새로 요청하지 않고 그 결과를 함께 기다립니다.
+캐시가 만료되는 순간 수십 명이 동시에 같은 도시의 날씨를 조회해도
+실제 업스트림 요청은 한 번만 나갑니다.
+
+- 스레드: group.do(key, fn)
+- asyncio: await group.do_async(key, coro_fn)
+
+먼저 온 호출이 fn을 실행하고, 그동안 들어온 같은 키의 호출은 같은 결과(또는 예외)를 받습니다.
+호출이 끝나면 키가 지워지므로 결과를 캐시하지는 않습니다.
+
+사용 방법:
+    group = SingleFlight()
+    data = group.do('weather:seoul', lambda: fetch('Seoul'))
+"""
+
+import asyncio
+import threading
+
+
+class _Call:
+    """스레드에서 진행 중인 호출 하나"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """키별로 진행 중인 호출을 하나로 합침"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._futures = {}  # (이벤트 루프, 키) -> asyncio.Future
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key, fn):
+        """fn()을 실행하거나, 같은 키로 진행 중인 호출의 결과를 기다려서 반환"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key, coro_fn):
+        """await coro_fn()을 실행하거나, 같은 키로 진행 중인 호출의 결과를 기다려서 반환"""
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        future = self._futures.get(flight_key)
+        if future is not None:
+            with self._lock:
+                self.shared += 1
+            # 기다리던 호출 하나가 취소돼도 공유 future는 취소되지 않도록 shield
+            return await asyncio.shield(future)
+
+        future = loop.create_future()
+        self._futures[flight_key] = future
+        with self._lock:
+            self.calls += 1
+        try:
+            result = await coro_fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # 기다리는 호출이 없을 때 'exception was never retrieved' 경고 방지
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._futures[flight_key]
+
+    def stats(self):
+        """실제 실행 횟수와 다른 호출의 결과를 공유받은 횟수"""
+        return {'calls': self.calls, 'shared': self.shared}
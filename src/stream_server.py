@@ -0,0 +1,115 @@
+"""
+LLM 스트리밍 응답 서버 (FastAPI, Server-Sent Events)
+
+답변 전체를 기다리지 않고 생성되는 대로 한 조각씩 보내므로,
+사용자는 첫 토큰이 나오는 즉시 답변을 보기 시작합니다.
+
+사용 방법:
+1. .env 파일에 OPENAI_API_KEY, GOOGLE_API_KEY를 설정합니다.
+2. 다음 명령어로 서버를 실행합니다:
+   python src/stream_server.py
+3. 다른 터미널에서 요청합니다:
+   curl -N "http://localhost:8000/stream/openai?prompt=인공지능의 미래"
+   curl -N -X POST http://localhost:8000/chat/gemini/stream \\
+        -H "Content-Type: application/json" \\
+        -d '{"messages": [{"role": "user", "content": "안녕!"}]}'
+
+이벤트 형식:
+    data: {"delta": "인공"}
+    data: {"delta": "지능의"}
+    ...
+    event: done
+    data: {"text": "전체 답변", "ttft": 0.42, "elapsed": 2.17}
+
+스트리밍 도중 오류가 나면 event: error 이벤트를 보내고 연결을 닫습니다.
+"""
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+import gemini_chat
+import gemini_text
+import openai_text
+from streaming import sse_events
+
+app = FastAPI(title="LLM 스트리밍 서버", description="OpenAI/Gemini 답변을 Server-Sent Events로 전송")
+
+PROVIDERS = ("openai", "gemini")
+
+
+class ChatMessage(BaseModel):
+    """대화 메시지 하나 (role이나 content가 없으면 FastAPI가 422로 거절)"""
+    role: str
+    content: str
+
+
+class ChatRequest(BaseModel):
+    """OpenAI 형식의 대화 기록 (마지막 메시지가 이번 질문)"""
+    messages: list[ChatMessage]
+
+
+def sse_response(deltas):
+    """조각 제너레이터를 SSE 응답으로 변환
+
+    동기 제너레이터는 스레드 풀에서 실행되므로 이벤트 루프를 막지 않습니다.
+    """
+    return StreamingResponse(
+        sse_events(deltas),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # 리버스 프록시(nginx)가 응답을 모았다가 보내지 않도록 함
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+def unknown_provider(provider):
+    return JSONResponse(
+        content={"error": f"지원하지 않는 provider입니다: {provider}", "providers": list(PROVIDERS)},
+        status_code=404
+    )
+
+
+@app.get("/")
+def read_root():
+    """홈 페이지"""
+    return {
+        "message": "LLM 스트리밍 서버",
+        "endpoints": {
+            "/stream/{provider}?prompt=...": "프롬프트 하나에 대한 답변 스트리밍",
+            "/chat/{provider}/stream": "대화 기록에 대한 다음 답변 스트리밍 (POST)"
+        }
+    }
+
+
+@app.get("/stream/{provider}")
+def stream_text(provider: str, prompt: str):
+    """프롬프트 하나에 대한 답변을 SSE로 전송"""
+    if provider == "openai":
+        return sse_response(openai_text.stream_text(prompt))
+    if provider == "gemini":
+        return sse_response(gemini_text.stream_text(prompt))
+    return unknown_provider(provider)
+
+
+@app.post("/chat/{provider}/stream")
+def stream_chat(provider: str, request: ChatRequest):
+    """대화 기록에 이어지는 답변을 SSE로 전송"""
+    if not request.messages:
+        return JSONResponse(content={"error": "messages가 비어 있습니다."}, status_code=400)
+
+    messages = [message.model_dump() for message in request.messages]
+    if provider == "openai":
+        return sse_response(openai_text.stream_text(messages))
+    if provider == "gemini":
+        *history, last = messages
+        chat = gemini_chat.create_chat(history)
+        return sse_response(gemini_chat.stream_message(chat, last["content"]))
+    return unknown_provider(provider)
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000)
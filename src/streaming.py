@@ -0,0 +1,71 @@
+"""
+스트리밍 응답 도우미
+
+LLM 응답을 조각(delta)별로 생성하는 제너레이터를
+- 터미널에 바로바로 출력하거나 (print_stream)
+- Server-Sent Events 형식으로 바꿔서 보낼 때 (sse_events)
+사용합니다. 둘 다 첫 토큰까지 걸린 시간(TTFT)을 함께 측정합니다.
+
+사용 방법:
+    from openai_text import stream_text
+    from streaming import print_stream
+
+    text = print_stream(stream_text("안녕!"), prefix="AI: ")
+"""
+
+import json
+import time
+
+
+def print_stream(deltas, prefix=""):
+    """조각을 받는 대로 출력하고 전체 텍스트 반환"""
+    started = time.perf_counter()
+    first_token = None
+    chunks = []
+
+    print(prefix, end="", flush=True)
+    for delta in deltas:
+        if first_token is None:
+            first_token = time.perf_counter() - started
+        chunks.append(delta)
+        print(delta, end="", flush=True)
+    print()
+
+    if first_token is not None:
+        print(f"(첫 토큰까지 {first_token:.2f}초, 전체 {time.perf_counter() - started:.2f}초)")
+    return "".join(chunks)
+
+
+def sse_event(data, event=None):
+    """Server-Sent Events 메시지 한 개"""
+    lines = [f"event: {event}"] if event else []
+    lines.append("data: " + json.dumps(data, ensure_ascii=False))
+    return "\n".join(lines) + "\n\n"
+
+
+def sse_events(deltas):
+    """조각마다 data 이벤트를, 끝나면 done 이벤트(전체 텍스트, TTFT)를 생성
+
+    응답 헤더를 보낸 뒤에 발생한 오류는 HTTP 상태 코드로 알릴 수 없으므로 error 이벤트로 보냅니다.
+    """
+    started = time.perf_counter()
+    first_token = None
+    chunks = []
+    try:
+        for delta in deltas:
+            if first_token is None:
+                first_token = time.perf_counter() - started
+            chunks.append(delta)
+            yield sse_event({"delta": delta})
+    except Exception as e:
+        yield sse_event({"error": str(e)}, event="error")
+        return
+
+    yield sse_event(
+        {
+            "text": "".join(chunks),
+            "ttft": round(first_token, 3) if first_token is not None else None,
+            "elapsed": round(time.perf_counter() - started, 3),
+        },
+        event="done",
+    )
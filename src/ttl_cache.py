@@ -0,0 +1,179 @@
+"""
+TTL + LRU 캐시 (stale-while-revalidate)
+
+- 항목마다 만료 시각(TTL)을 가집니다.
+- maxsize를 넘으면 가장 오래 사용하지 않은 항목부터 지웁니다 (LRU).
+- 만료됐지만 max_stale 이내인 항목은 일단 그대로 돌려주고,
+  백그라운드에서 새 값을 가져옵니다 (stale-while-revalidate).
+  그래서 조회하는 쪽은 오래되지 않은 값이 있는 한 네트워크를 기다리지 않습니다.
+
+사용 방법:
+    cache = TTLCache(maxsize=128, default_ttl=3600)
+
+    def load():
+        data = fetch()
+        return data, expires_at   # expires_at이 None이면 default_ttl 적용
+
+    value = cache.get_or_load('USD', load)
+    print(cache.stats())
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """만료 시각과 최대 크기가 있는 스레드 안전 캐시"""
+
+    def __init__(self, maxsize=128, default_ttl=3600, max_stale=86400):
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self.max_stale = max_stale
+        self._data = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._tasks = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.lookup(key)[0] is not None
+
+    def lookup(self, key):
+        """(값, 신선 여부) 반환. 없거나 너무 오래된 항목이면 (None, False)"""
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None, False
+            value, expires_at = entry
+            if self.max_stale is not None and now > expires_at + self.max_stale:
+                del self._data[key]
+                return None, False
+            self._data.move_to_end(key)
+            return value, now < expires_at
+
+    def set(self, key, value, expires_at=None):
+        """값 저장 (expires_at은 unix 시각, None이면 default_ttl 적용)"""
+        if expires_at is None:
+            expires_at = time.time() + self.default_ttl
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """캐시 카운터"""
+        return {
+            'size': len(self._data),
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'refreshes': self.refreshes,
+            'refresh_failures': self.refresh_failures,
+        }
+
+    def _incr(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _store(self, key, result):
+        """loader 결과 (값, 만료 시각)를 저장. 값이 None이면 저장하지 않음"""
+        value, expires_at = result
+        if value is not None:
+            self.set(key, value, expires_at)
+        return value
+
+    def _start_refresh(self, key):
+        """이미 갱신 중인 키가 아니면 True 반환하고 갱신 중으로 표시"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _finish_refresh(self, key, value):
+        with self._lock:
+            self._refreshing.discard(key)
+            if value is None:
+                self.refresh_failures += 1
+            else:
+                self.refreshes += 1
+
+    def get_or_load(self, key, loader):
+        """캐시에서 조회하고, 없으면 loader()로 가져와서 저장
+
+        loader는 (값, 만료 시각) 튜플을 반환해야 합니다.
+        만료된 항목은 그대로 반환하고 백그라운드 스레드에서 갱신합니다.
+        """
+        value, fresh = self.lookup(key)
+        if value is not None:
+            if fresh:
+                self._incr('hits')
+            else:
+                self._incr('stale_hits')
+                if self._start_refresh(key):
+                    threading.Thread(
+                        target=self._refresh, args=(key, loader), daemon=True
+                    ).start()
+            return value
+
+        self._incr('misses')
+        return self._store(key, loader())
+
+    def _refresh(self, key, loader):
+        value = None
+        try:
+            value = self._store(key, loader())
+        except Exception as e:
+            # 백그라운드 갱신 실패는 호출한 쪽에 전달할 수 없으므로 기록만 하고 이전 값을 유지
+            print(f'캐시 갱신 실패 ({key}): {e}')
+        finally:
+            self._finish_refresh(key, value)
+
+    async def aget_or_load(self, key, loader):
+        """get_or_load()의 비동기 버전 (loader는 코루틴 함수)
+
+        만료된 항목은 그대로 반환하고 백그라운드 태스크에서 갱신합니다.
+        """
+        value, fresh = self.lookup(key)
+        if value is not None:
+            if fresh:
+                self._incr('hits')
+            else:
+                self._incr('stale_hits')
+                if self._start_refresh(key):
+                    task = asyncio.create_task(self._arefresh(key, loader))
+                    # 태스크가 끝나기 전에 가비지 컬렉션되지 않도록 참조 유지
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+            return value
+
+        self._incr('misses')
+        return self._store(key, await loader())
+
+    async def _arefresh(self, key, loader):
+        value = None
+        try:
+            value = self._store(key, await loader())
+        except Exception as e:
+            print(f'캐시 갱신 실패 ({key}): {e}')
+        finally:
+            self._finish_refresh(key, value)
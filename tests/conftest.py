@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# src/의 모듈은 서로 패키지 없이 import하므로 src를 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from currncy import CurrencyConverter, RateTable
+from single_flight import SingleFlight
+
+USD_RATES = {
+    'base': 'USD',
+    'date': '2026-10-16',
+    'rates': {'USD': 1.0, 'KRW': 1400.0, 'EUR': 0.92, 'JPY': 150.0, 'CNY': 7.1},
+}
+
+
+class FakeConverter(CurrencyConverter):
+    """API 대신 USD_RATES로 응답하는 변환기 (기준 통화별 응답은 USD 표에서 계산)"""
+
+    def __init__(self, **kwargs):
+        super().__init__(single_flight=SingleFlight(), **kwargs)
+        self.fetched = []
+
+    def fetch_rates(self, base):
+        self.fetched.append(base)
+        return RateTable(USD_RATES).rates_for(base), None
+
+
+ROWS = [
+    (10000, 'KRW', 'USD'),
+    (500, 'EUR', 'KRW'),
+    (1200, 'JPY', 'CNY'),
+    (1, 'USD', 'USD'),
+    (250, 'CNY', 'EUR'),
+]
+
+
+@pytest.mark.parametrize('cross_rate', [False, True])
+def test_convert_many_matches_scalar_convert(cross_rate):
+    converter = FakeConverter(cross_rate=cross_rate)
+    amounts, from_codes, to_codes = zip(*ROWS)
+
+    converted = converter.convert_many(amounts, from_codes, to_codes)
+    expected = [converter.convert(*row) for row in ROWS]
+
+    np.testing.assert_allclose(converted, expected)
+
+
+def test_unknown_codes_are_nan():
+    table = RateTable(USD_RATES)
+
+    assert table.lookup_indices(['KRW', 'XXX', 'KRW']).tolist() == [1, -1, 1]
+    converted = table.convert_many([1, 2, 3, 4], ['USD', 'XXX', 'USD', 'XXX'], ['KRW', 'USD', 'YYY', 'YYY'])
+
+    assert converted[0] == 1400.0
+    assert np.isnan(converted[1:]).all()
+
+
+def test_cross_rate_mode_fetches_pivot_only():
+    converter = FakeConverter(cross_rate=True)
+
+    for from_currency in ('KRW', 'EUR', 'JPY', 'KRW'):
+        converter.convert(100, from_currency, 'USD')
+    converter.convert_many([1], ['EUR'], ['JPY'])
+
+    assert converter.fetched == ['USD']
+    assert converter.convert(100, 'XXX', 'USD') is None
+
+
+def test_rates_for_reuses_row_until_table_changes():
+    converter = FakeConverter(cross_rate=True)
+
+    first = converter.get_rates('KRW')
+    assert converter.get_rates('KRW') is first
+    assert first['rates']['USD'] == pytest.approx(1 / 1400)
+
+    # 환율표가 새로 만들어지면 다시 계산
+    converter.cache.clear()
+    assert converter.get_rates('KRW') is not first
@@ -0,0 +1,125 @@
+from types import SimpleNamespace
+
+import pytest
+from google.genai import types
+
+from gemini_sessions import GeminiSessionManager, SessionArchive
+
+
+class FakeChat:
+    """chats.create()가 돌려주는 채팅 객체 대신 사용 (보낸 메시지를 기록에 추가)"""
+
+    def __init__(self, history):
+        self.history = list(history)
+
+    def send_message(self, message):
+        self.history.append(types.Content(role='user', parts=[types.Part(text=message)]))
+        reply = f'reply to {message}'
+        self.history.append(types.Content(role='model', parts=[types.Part(text=reply)]))
+        return SimpleNamespace(text=reply)
+
+    def send_message_stream(self, message):
+        yield SimpleNamespace(text=self.send_message(message).text)
+
+    def get_history(self, curated=True):
+        return list(self.history)
+
+
+class FakeClient:
+    def __init__(self):
+        self.created = []
+        self.chats = SimpleNamespace(create=self.create)
+
+    def create(self, model, history):
+        chat = FakeChat(history)
+        self.created.append(chat)
+        return chat
+
+
+def texts(history):
+    return [content.parts[0].text for content in history if content.role == 'user']
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return SessionArchive(tmp_path / 'sessions.sqlite3')
+
+
+@pytest.fixture
+def manager(archive):
+    return GeminiSessionManager(maxsize=1, idle_ttl=600, archive=archive, client=FakeClient())
+
+
+def test_evicted_session_is_rehydrated_with_history(manager, archive):
+    manager.send('alice', 'hello')
+    manager.send('bob', 'hi')  # maxsize=1이므로 alice는 디스크로 내려감
+
+    assert manager.stats()['live'] == 1
+    assert texts(archive.load('alice')[1]) == ['hello']
+
+    manager.send('alice', 'again')
+    assert texts(manager.get('alice').get_history()) == ['hello', 'again']
+    assert manager.stats()['rehydrated'] == 1
+
+
+def test_stream_records_turn(manager):
+    assert list(manager.stream('alice', 'hello')) == ['reply to hello']
+    assert texts(manager.get('alice').get_history()) == ['hello']
+
+
+def test_close_persists_live_sessions(manager, archive):
+    manager.send('alice', 'hello')
+    manager.close()
+
+    assert manager.stats()['live'] == 0
+    assert texts(archive.load('alice')[1]) == ['hello']
+
+
+def test_delete_removes_session_everywhere(manager, archive):
+    manager.send('alice', 'hello')
+    manager.send('bob', 'hi')
+    manager.send('alice', 'again')  # bob은 디스크에 저장됨
+
+    manager.delete('alice')
+    manager.delete('bob')
+
+    assert archive.load('alice') is None
+    assert archive.load('bob') is None
+    manager.close()
+    assert archive.load('alice') is None
+    assert manager.get('alice').get_history() == []
+
+
+def test_deleted_session_is_not_saved_by_pending_eviction(manager, archive):
+    session = manager.get_session('alice')
+    manager.send('alice', 'hello')
+    # close()가 _evicting으로 옮긴 뒤 저장하기 전에 삭제된 경우
+    with manager._lock:
+        manager._live.pop('alice')
+        manager._evicting['alice'] = session
+    manager.delete('alice')
+    manager._persist('alice', session)
+
+    assert archive.load('alice') is None
+
+
+def test_send_after_concurrent_eviction_is_not_lost(manager, archive):
+    manager.send('alice', 'hello')
+    get_session = manager.get_session
+    calls = []
+
+    def get_then_evicted(session_id):
+        # get_session()이 세션을 돌려준 직후 다른 스레드가 세션을 내리고 저장을 마친 상황
+        session = get_session(session_id)
+        if not calls:
+            manager.close()
+        calls.append(session)
+        return session
+
+    manager.get_session = get_then_evicted
+    manager.send('alice', 'second')
+
+    assert len(calls) == 2 and calls[0] is not calls[1]
+    assert texts(manager.get('alice').get_history()) == ['hello', 'second']
+    manager.close()
+    assert texts(archive.load('alice')[1]) == ['hello', 'second']
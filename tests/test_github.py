@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import pytest
+
+import github
+from github import GitHubAnalyzer
+
+
+class FakeSession:
+    """GitHub 응답을 순서대로 돌려주고 요청 헤더를 기록"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, params=None):
+        self.requests.append(headers)
+        respond = self.responses.pop(0)
+        return respond() if callable(respond) else respond
+
+
+def response(status_code, data=None, etag=None):
+    headers = {'ETag': etag} if etag else {}
+    return SimpleNamespace(status_code=status_code, headers=headers, links={}, json=lambda: data)
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.delenv('GITHUB_PERSONAL_ACCESS_TOKEN', raising=False)
+    monkeypatch.setattr(github, 'get_env', lambda name, default=None: default)
+    return GitHubAnalyzer(page_cache_size=1)
+
+
+def use_session(monkeypatch, session):
+    monkeypatch.setattr(github, 'get_rate_limited_session', lambda: session)
+
+
+def test_not_modified_reuses_cached_page(analyzer, monkeypatch):
+    repos = [{'name': 'a'}]
+    session = FakeSession([response(200, repos, etag='"v1"'), response(304)])
+    use_session(monkeypatch, session)
+
+    assert analyzer.fetch_page('octocat', 1) == (repos, 1)
+    assert analyzer.fetch_page('octocat', 1) == (repos, 1)
+    assert session.requests[1]['If-None-Match'] == '"v1"'
+
+
+def test_not_modified_after_page_was_evicted_mid_request(analyzer, monkeypatch):
+    repos = [{'name': 'a'}]
+
+    def evicted_then_not_modified():
+        # 요청하는 동안 다른 페이지가 LRU에서 이 페이지를 밀어냄
+        analyzer.page_cache.set(('someone', 1), {'etag': None, 'last_modified': None, 'data': [], 'last_page': 1})
+        return response(304)
+
+    session = FakeSession([response(200, repos, etag='"v1"'), evicted_then_not_modified])
+    use_session(monkeypatch, session)
+
+    analyzer.fetch_page('octocat', 1)
+    assert analyzer.fetch_page('octocat', 1) == (repos, 1)
+    assert analyzer.page_cache.lookup(('octocat', 1))[0]['data'] == repos
+
+
+def test_no_conditional_headers_without_cached_body(analyzer, monkeypatch):
+    session = FakeSession([response(200, [], etag='"v1"'), response(200, [], etag='"v2"')])
+    use_session(monkeypatch, session)
+
+    analyzer.fetch_page('octocat', 1)
+    analyzer.page_cache.clear()
+    analyzer.fetch_page('octocat', 1)
+
+    assert 'If-None-Match' not in session.requests[1]
@@ -0,0 +1,95 @@
+import asyncio
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import github
+import github_batch
+from github import AsyncGitHubAnalyzer
+from github_batch import load_output, run_batch
+from rate_limiter import RateLimiter
+
+
+def repo(name):
+    return {'name': name, 'language': 'Python', 'stargazers_count': 1, 'forks_count': 0,
+            'description': None}
+
+
+class FakeAsyncClient:
+    """사용자마다 3페이지짜리 레포지토리 목록을 돌려주고 동시에 진행 중인 요청 수를 기록"""
+
+    def __init__(self, pages=3):
+        self.pages = pages
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get(self, url, headers=None, params=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        page = params['page']
+        links = {'last': {'url': f'{url}?page={self.pages}'}} if page == 1 else {}
+        return SimpleNamespace(status_code=200, headers={}, links=links,
+                               json=lambda: [repo(f'{url}-{page}')])
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.delenv('GITHUB_PERSONAL_ACCESS_TOKEN', raising=False)
+    monkeypatch.setattr(github, 'get_env', lambda name, default=None: default)
+    fake = FakeAsyncClient()
+    monkeypatch.setattr(github, 'get_async_client', lambda: fake)
+    return fake
+
+
+def make_analyzer(concurrency):
+    return AsyncGitHubAnalyzer(
+        concurrency=concurrency,
+        page_cache_size=0,
+        rate_limiter=RateLimiter(limit=10**6, burst=10**6),
+    )
+
+
+def test_users_and_pages_share_one_request_limit(client):
+    output = io.StringIO()
+    ok, failed = asyncio.run(run_batch(make_analyzer(2), ['a', 'b', 'c', 'd'], output, concurrency=2))
+
+    assert (ok, failed) == (4, 0)
+    assert client.max_in_flight == 2
+
+
+def test_empty_done_set_is_filled_in_place(client):
+    done = set()
+    asyncio.run(run_batch(make_analyzer(2), ['a', 'b', 'a'], io.StringIO(), done=done))
+    assert done == {'a', 'b'}
+
+
+def test_resume_skips_users_already_in_output(client, tmp_path, monkeypatch):
+    path = tmp_path / 'report.jsonl'
+    # 결과는 썼지만 체크포인트를 쓰기 전에 중단됨 + 마지막 줄은 쓰다 말았음
+    path.write_text(
+        json.dumps({'username': 'a', 'repo_count': 3}) + '\n'
+        + json.dumps({'username': 'b', 'error': 'fetch_failed'}) + '\n'
+        + '{"username": "c", "repo_',
+        encoding='utf-8',
+    )
+    args = SimpleNamespace(input=str(tmp_path / 'users.txt'), output=str(path), checkpoint=None,
+                           concurrency=2, top_n=5)
+    (tmp_path / 'users.txt').write_text('a\nb\nc\n', encoding='utf-8')
+    analyzer = make_analyzer(2)
+    monkeypatch.setattr(github_batch, 'AsyncGitHubAnalyzer', lambda **kwargs: analyzer)
+    asyncio.run(github_batch.main_async(args, io.StringIO()))
+
+    records = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    usernames = [record['username'] for record in records if 'error' not in record]
+    assert sorted(usernames) == ['a', 'b', 'c']
+
+
+def test_load_output_ignores_missing_file_and_stdout(tmp_path):
+    assert load_output(str(tmp_path / 'missing.jsonl')) == set()
+    assert load_output('-') == set()
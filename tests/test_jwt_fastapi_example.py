@@ -0,0 +1,88 @@
+import base64
+import importlib
+import json
+import os
+import secrets
+import time
+
+import jwt
+import pytest
+
+
+@pytest.fixture(scope='module')
+def app_module(tmp_path_factory):
+    # 모듈을 import할 때 환경 변수를 읽으므로 먼저 설정
+    os.environ['JWT_SECRET_KEY'] = secrets.token_urlsafe(32)
+    os.environ['JWT_REVOCATION_PATH'] = str(tmp_path_factory.mktemp('jwt') / 'revoked.sqlite3')
+    os.environ['JWT_REVOCATION_SHM'] = f'jwt_revocation_test_{secrets.token_hex(4)}'
+    module = importlib.import_module('jwt_fastapi_example')
+    yield module
+    import jwt_revocation
+    jwt_revocation.close_revocation_list()
+    jwt_revocation.remove_shared_memory(os.environ['JWT_REVOCATION_SHM'])
+
+
+def user(i=1):
+    return {'id': i, 'email': f'user{i}@example.com', 'role': 'user'}
+
+
+def test_round_trip_matches_stock_pyjwt(app_module):
+    token = app_module.generate_token(user())
+    claims = app_module.jwt_codec.decode(token, app_module.SECRET_KEY, algorithms=['HS256'])
+
+    assert claims == jwt.decode(token, app_module.SECRET_KEY, algorithms=['HS256'])
+    assert claims['email'] == 'user1@example.com'
+    assert isinstance(claims['exp'], int) and claims['jti']
+
+
+def test_orjson_hooks_are_used(app_module, monkeypatch):
+    # PyJWT가 내부 메서드 이름을 바꾸면 orjson 없이 조용히 동작하므로 실제로 호출되는지 확인
+    calls = []
+    original = app_module.orjson.dumps
+    monkeypatch.setattr(app_module.orjson, 'dumps', lambda value: calls.append(value) or original(value))
+
+    app_module.jwt_codec.encode({'a': 1}, 'k' * 32, algorithm='HS256')
+    assert calls == [{'a': 1}]
+
+
+def test_expired_token_is_rejected(app_module):
+    token = app_module.jwt_codec.encode(
+        {'user_id': 1, 'exp': int(time.time()) - 10}, app_module.SECRET_KEY, algorithm='HS256'
+    )
+    with pytest.raises(jwt.ExpiredSignatureError):
+        app_module.decode_token(token)
+
+
+def test_tampered_token_is_rejected(app_module):
+    token = app_module.generate_token(user())
+    app_module.decode_token(token)  # 원래 토큰은 캐시에 들어감
+
+    header, payload, signature = token.split('.')
+    claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+    claims['role'] = 'admin'
+    forged = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b'=').decode()
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        app_module.decode_token(f'{header}.{forged}.{signature}')
+    with pytest.raises(jwt.InvalidSignatureError):
+        app_module.decode_token(app_module.jwt_codec.encode(claims, 'wrong-secret' * 3, algorithm='HS256'))
+
+
+def test_non_object_payload_is_rejected(app_module):
+    token = jwt.api_jws.encode(b'[1, 2]', app_module.SECRET_KEY, algorithm='HS256')
+    with pytest.raises(jwt.DecodeError):
+        app_module.jwt_codec.decode(token, app_module.SECRET_KEY, algorithms=['HS256'])
+
+
+def test_login_protected_logout(app_module):
+    from fastapi.testclient import TestClient
+
+    with TestClient(app_module.app) as client:
+        token = client.post('/login', json={'email': 'a@example.com', 'password': 'x'}).json()['token']
+        headers = {'Authorization': f'Bearer {token}'}
+
+        assert client.get('/protected-data', headers=headers).status_code == 200
+        assert client.post('/logout', headers=headers).status_code == 200
+        response = client.get('/protected-data', headers=headers)
+        assert response.status_code == 401
+        assert response.json()['detail'] == '취소된 토큰입니다.'
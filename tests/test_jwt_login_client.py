@@ -0,0 +1,152 @@
+import base64
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import jwt_login_client
+from jwt_login_client import TokenManager
+
+
+def make_token(exp, name='token'):
+    """서명 없이 exp만 들어 있는 JWT 모양의 문자열"""
+    payload = base64.urlsafe_b64encode(json.dumps({'exp': exp, 'name': name}).encode()).rstrip(b'=')
+    return f'header.{payload.decode()}.signature'
+
+
+class FakeLogin:
+    """호출 횟수를 세고, 호출할 때마다 새 토큰을 발급 (fail이면 예외)"""
+
+    def __init__(self, ttl=3600, delay=0.0):
+        self.ttl = ttl
+        self.delay = delay
+        self.fail = False
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, email, password, base_url):
+        with self._lock:
+            self.calls += 1
+            calls = self.calls
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError('login server down')
+        return make_token(time.time() + self.ttl, f'token-{calls}')
+
+
+@pytest.fixture
+def fake_login(monkeypatch):
+    fake = FakeLogin()
+    monkeypatch.setattr(jwt_login_client, 'login', fake)
+    return fake
+
+
+def wait_for_refresh(manager):
+    for _ in range(200):
+        if not manager._refreshing:
+            return
+        time.sleep(0.01)
+    raise AssertionError('background refresh did not finish')
+
+
+def test_concurrent_callers_share_one_login(fake_login):
+    fake_login.delay = 0.05
+    manager = TokenManager('a@example.com', 'pw')
+    tokens = []
+
+    def call():
+        tokens.append(manager.get_token())
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fake_login.calls == 1
+    assert len(set(tokens)) == 1
+
+
+def test_failed_background_refresh_backs_off(fake_login):
+    fake_login.ttl = 30  # 처음부터 refresh_margin(60초) 안쪽
+    manager = TokenManager('a@example.com', 'pw')
+    token = manager.get_token()
+    wait_for_refresh(manager)
+    fake_login.fail = True
+    calls = fake_login.calls
+
+    manager.get_token()
+    wait_for_refresh(manager)
+    assert fake_login.calls == calls + 1
+
+    # 대기 시간 안에는 요청이 많아도 다시 로그인하지 않고 현재 토큰을 계속 사용
+    for _ in range(20):
+        assert manager.get_token() == token
+    wait_for_refresh(manager)
+    assert fake_login.calls == calls + 1
+    assert manager.stats()['refresh_errors'] == 1
+
+    # 대기 시간이 지나면 다시 시도하고, 성공하면 대기 시간 초기화
+    fake_login.fail = False
+    manager._next_refresh_at = 0.0
+    manager.get_token()
+    wait_for_refresh(manager)
+    assert fake_login.calls == calls + 2
+    assert manager._refresh_failures == 0
+
+
+def test_backoff_doubles_up_to_max(fake_login):
+    fake_login.ttl = 30
+    manager = TokenManager('a@example.com', 'pw')
+    manager.get_token()
+    wait_for_refresh(manager)
+    fake_login.fail = True
+
+    delays = []
+    for _ in range(7):
+        manager._next_refresh_at = 0.0
+        manager.get_token()
+        wait_for_refresh(manager)
+        delays.append(round(manager._next_refresh_at - time.time()))
+
+    assert delays == [1, 2, 4, 8, 16, 30, 30]
+
+
+class FakeSession:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.tokens = []
+
+    def request(self, method, url, headers=None, **kwargs):
+        self.tokens.append(headers['Authorization'])
+        status_code = self.statuses.pop(0)
+
+        def raise_for_status():
+            if status_code >= 400:
+                raise RuntimeError(f'HTTP {status_code}')
+
+        return SimpleNamespace(status_code=status_code, raise_for_status=raise_for_status,
+                               json=lambda: {'ok': True})
+
+
+def test_unauthorized_retries_once_with_new_token(fake_login, monkeypatch):
+    session = FakeSession([401, 200])
+    monkeypatch.setattr(jwt_login_client, 'get_session', lambda: session)
+    manager = TokenManager('a@example.com', 'pw')
+
+    assert manager.get('/protected-data') == {'ok': True}
+    assert fake_login.calls == 2
+    assert session.tokens[0] != session.tokens[1]
+    assert manager.stats()['retries'] == 1
+
+
+def test_unauthorized_twice_gives_up(fake_login, monkeypatch):
+    session = FakeSession([401, 401, 200])
+    monkeypatch.setattr(jwt_login_client, 'get_session', lambda: session)
+    manager = TokenManager('a@example.com', 'pw')
+
+    with pytest.raises(RuntimeError, match='401'):
+        manager.get('/protected-data')
+    assert len(session.tokens) == 2
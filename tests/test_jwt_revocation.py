@@ -0,0 +1,163 @@
+import asyncio
+import os
+import secrets
+import time
+
+import pytest
+
+from jwt_revocation import (
+    ATTACHED, ATTACHED_OFFSET, BloomFilter, RevocationList, RevocationStore, remove_shared_memory,
+)
+
+
+def shm_exists(name):
+    return os.path.exists(f'/dev/shm/{name}')
+
+
+@pytest.fixture
+def store(tmp_path):
+    return RevocationStore(tmp_path / 'revoked.sqlite3')
+
+
+@pytest.fixture
+def shm_name():
+    name = f'jwt_revocation_test_{secrets.token_hex(4)}'
+    yield name
+    remove_shared_memory(name)
+
+
+def attached(revocations):
+    return ATTACHED.unpack_from(revocations._shm.buf, ATTACHED_OFFSET)[0]
+
+
+def test_bloom_filter_has_no_false_negatives():
+    size, hashes = BloomFilter.optimal(1000, 0.01)
+    bloom = BloomFilter(size, hashes)
+    items = [secrets.token_urlsafe(16) for _ in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    others = [secrets.token_urlsafe(16) for _ in range(10_000)]
+    assert sum(item in bloom for item in others) < 300
+
+
+def test_revoke_is_visible_across_attachments(store, shm_name):
+    first = RevocationList(store, shm_name=shm_name)
+    second = RevocationList(store, shm_name=shm_name)
+    try:
+        assert attached(first) == 2
+        first.revoke('jti-1', time.time() + 60)
+
+        # 필터 비트를 공유하므로 sync() 없이 바로 보임
+        assert 'jti-1' in second.bloom
+        assert second.is_revoked('jti-1')
+        assert not second.is_revoked('jti-2')
+        assert not second.is_revoked(None)
+    finally:
+        first.close()
+        second.close()
+
+
+def test_revocation_from_another_process_is_synced(store, tmp_path):
+    revocations = RevocationList(store)
+    other_process = RevocationStore(tmp_path / 'revoked.sqlite3')
+    other_process.add('jti-1', time.time() + 60)
+
+    assert not revocations.is_revoked('jti-1')
+    assert revocations.sync() == 1
+    assert revocations.is_revoked('jti-1')
+
+
+def test_false_positive_falls_back_to_sqlite(store):
+    revocations = RevocationList(store)
+    # SQLite에는 없고 필터에만 있는 jti (오탐과 같은 상황)
+    revocations.bloom.add('ghost')
+
+    assert not revocations.is_revoked('ghost')
+    assert revocations.positives == 1
+    assert revocations.false_positives == 1
+
+
+def test_expired_revocation_is_not_reported(store):
+    revocations = RevocationList(store)
+    revocations.revoke('old', time.time() - 1)
+
+    assert not revocations.is_revoked('old')
+    assert revocations.false_positives == 1
+
+
+def test_async_check_matches_sync(store):
+    revocations = RevocationList(store)
+    revocations.revoke('jti-1', time.time() + 60)
+    revocations.bloom.add('ghost')
+
+    async def check():
+        return [await revocations.ais_revoked(jti) for jti in ('jti-1', 'ghost', 'other', None)]
+
+    assert asyncio.run(check()) == [True, False, False, False]
+
+
+def test_rebuild_drops_expired_entries(store):
+    revocations = RevocationList(store)
+    revocations.revoke('old', time.time() - 1)
+    revocations.revoke('new', time.time() + 60)
+    revocations.rebuild()
+
+    assert 'new' in revocations.bloom
+    assert store.count() == 1
+
+
+def test_last_detach_unlinks_shared_memory(store, shm_name):
+    first = RevocationList(store, shm_name=shm_name)
+    second = RevocationList(store, shm_name=shm_name)
+    first.revoke('jti-1', time.time() + 60)
+
+    first.close()
+    assert shm_exists(shm_name)
+    assert attached(second) == 1
+    # 닫은 뒤에도 필터 복사본으로 계속 확인할 수 있음
+    assert first.is_revoked('jti-1')
+
+    second.close()
+    assert not shm_exists(shm_name)
+    second.close()  # 두 번 닫아도 됨
+
+
+def test_reattach_after_unlink_rebuilds_from_store(store, shm_name):
+    first = RevocationList(store, shm_name=shm_name)
+    first.revoke('jti-1', time.time() + 60)
+    first.close()
+
+    again = RevocationList(store, shm_name=shm_name)
+    try:
+        assert again.is_revoked('jti-1')
+    finally:
+        again.close()
+
+
+def test_filter_for_other_store_is_rebuilt(tmp_path, shm_name):
+    store_a = RevocationStore(tmp_path / 'a.sqlite3')
+    store_b = RevocationStore(tmp_path / 'b.sqlite3')
+    store_a.add('only-in-a', time.time() + 60)
+
+    first = RevocationList(store_a, shm_name=shm_name)
+    second = RevocationList(store_b, shm_name=shm_name)
+    try:
+        assert 'only-in-a' not in second.bloom
+        assert attached(second) == 1
+    finally:
+        second.close(unlink=True)
+        # 이미 삭제된 공유 메모리도 문제없이 닫힘
+        first.close()
+    assert not shm_exists(shm_name)
+
+
+def test_remove_shared_memory(store, shm_name):
+    revocations = RevocationList(store, shm_name=shm_name)
+    revocations.stop()
+
+    assert not remove_shared_memory('jwt_revocation_missing_' + secrets.token_hex(4))
+    assert shm_exists(shm_name)
+    revocations.close(unlink=True)
+    assert not shm_exists(shm_name)
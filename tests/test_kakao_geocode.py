@@ -0,0 +1,78 @@
+import asyncio
+import threading
+
+import pytest
+
+import kakao_geocode
+from kakao_geocode import BulkGeocoder, normalize_address
+from response_cache import ResponseCache
+
+
+@pytest.mark.parametrize('address, expected', [
+    ('서울특별시 강남구 테헤란로 152', '서울 강남구 테헤란로 152'),
+    ('서울시  강남구 테헤란로 152 (역삼동)', '서울 강남구 테헤란로 152'),
+    ('서울 강남구 역삼동 737 번지', '서울 강남구 역삼동 737'),
+    ('서울 강남구 역삼동 737 - 4', '서울 강남구 역삼동 737-4'),
+    ('서울 강남구 테헤란로 152, 101동 1001호', '서울 강남구 테헤란로 152'),
+    ('광주시 오포읍', '광주시 오포읍'),
+    ('광주광역시 북구', '광주 북구'),
+    ('', ''),
+    (None, ''),
+])
+def test_normalize_address(address, expected):
+    assert normalize_address(address) == expected
+
+
+@pytest.fixture
+def geocoder(tmp_path, monkeypatch):
+    monkeypatch.setenv('KAKAO_REST_API_KEY', 'test')
+    monkeypatch.setattr(kakao_geocode, 'CACHE_WRITE_BATCH', 3)
+    return BulkGeocoder(qps=1000, concurrency=4, cache=ResponseCache(tmp_path / 'geo.sqlite3'))
+
+
+def test_geocode_batches_cache_writes_off_the_loop(geocoder, monkeypatch):
+    loop_thread = []
+    write_threads = []
+    batches = []
+    set_many = geocoder.cache.set_many
+
+    def recording_set_many(namespace, items):
+        write_threads.append(threading.get_ident())
+        batches.append(len(items))
+        set_many(namespace, items)
+
+    monkeypatch.setattr(geocoder.cache, 'set_many', recording_set_many)
+
+    async def fetch(query, api_key):
+        await asyncio.sleep(0)
+        if query == 'missing':
+            return {}
+        if query == 'broken':
+            return None
+        return {'x': '1', 'y': '2', 'address_name': query, 'road_address_name': None}
+
+    geocoder.fetch = fetch
+    queries = {f'addr {i}' for i in range(7)} | {'missing', 'broken'}
+
+    async def run():
+        loop_thread.append(threading.get_ident())
+        return await geocoder.geocode(queries)
+
+    results = asyncio.run(run())
+
+    assert len(results) == 8 and results['missing'] == {}
+    assert 'broken' not in results
+    assert sum(batches) == 8 and max(batches) <= 3
+    assert loop_thread[0] not in write_threads
+    assert geocoder.stats()['failed'] == 1
+
+    # 두 번째 실행은 캐시만 사용 (실패한 주소만 다시 요청)
+    requested = []
+
+    async def fetch_again(query, api_key):
+        requested.append(query)
+        return None
+
+    geocoder.fetch = fetch_again
+    asyncio.run(geocoder.geocode(queries))
+    assert requested == ['broken']
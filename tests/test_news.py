@@ -0,0 +1,57 @@
+import asyncio
+import threading
+
+import pytest
+
+from news import AsyncNewsAnalyzer, NewsAnalyzer
+
+
+def page_data(page):
+    return {
+        'totalResults': 1000,
+        'articles': [{'url': f'https://example.com/{page}', 'title': f'기사 {page}', 'description': ''}],
+    }
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv('NEWS_API_KEY', 'test')
+
+
+@pytest.mark.parametrize('max_pages, max_workers', [(10, 4), (10, 1), (3, 8), (1, 4)])
+def test_harvest_news_requests_every_page(monkeypatch, max_pages, max_workers):
+    requested = []
+    lock = threading.Lock()
+
+    def search_news(self, query, language='ko', page_size=100, page=1):
+        with lock:
+            requested.append(page)
+        return page_data(page)
+
+    monkeypatch.setattr(NewsAnalyzer, 'search_news', search_news)
+    analyzer = NewsAnalyzer(use_cache=False)
+    articles = list(analyzer.harvest_news('q', max_pages=max_pages, max_workers=max_workers))
+
+    assert sorted(requested) == list(range(1, max_pages + 1))
+    assert len(articles) == max_pages
+
+
+@pytest.mark.parametrize('max_pages, concurrency', [(10, 4), (10, 1), (3, 8)])
+def test_async_harvest_news_requests_every_page(monkeypatch, max_pages, concurrency):
+    requested = []
+
+    async def search_news(self, query, language='ko', page_size=100, page=1):
+        requested.append(page)
+        await asyncio.sleep(0)
+        return page_data(page)
+
+    monkeypatch.setattr(AsyncNewsAnalyzer, 'search_news', search_news)
+    analyzer = AsyncNewsAnalyzer(concurrency=concurrency, use_cache=False)
+
+    async def collect():
+        return [article async for article in analyzer.harvest_news('q', max_pages=max_pages)]
+
+    articles = asyncio.run(collect())
+
+    assert sorted(requested) == list(range(1, max_pages + 1))
+    assert len(articles) == max_pages
@@ -0,0 +1,98 @@
+import contextlib
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from openai_batch import BatchPipeline
+
+
+class FakeBatchClient:
+    """업로드한 요청마다 '입력을 그대로 돌려주는' 답변을 만드는 Batch API 대역
+
+    실제 API처럼 custom_id가 중복된 입력 파일은 배치 전체를 거절합니다.
+    fail_once에 든 입력은 첫 제출에서 500으로 실패합니다.
+    """
+
+    def __init__(self, fail_once=()):
+        self.fail_once = set(fail_once)
+        self.file_contents = {}
+        self.batch_store = {}
+        self.submitted = []
+        self.files = SimpleNamespace(
+            create=self.create_file,
+            with_streaming_response=SimpleNamespace(content=self.content),
+        )
+        self.batches = SimpleNamespace(create=self.create_batch, retrieve=self.batch_store.__getitem__)
+
+    def create_file(self, file, purpose):
+        file_id = f'file-{len(self.file_contents)}'
+        self.file_contents[file_id] = file.read().decode('utf-8').splitlines()
+        return SimpleNamespace(id=file_id)
+
+    def create_batch(self, input_file_id, endpoint, completion_window):
+        requests = [json.loads(line) for line in self.file_contents[input_file_id]]
+        self.submitted.append(requests)
+        batch_id = f'batch-{len(self.batch_store)}'
+        custom_ids = [request['custom_id'] for request in requests]
+        if len(set(custom_ids)) != len(custom_ids):
+            error = SimpleNamespace(code='duplicate_custom_id', message='custom_id must be unique')
+            self.batch_store[batch_id] = SimpleNamespace(
+                id=batch_id, status='failed', request_counts=None,
+                output_file_id=None, error_file_id=None, errors=SimpleNamespace(data=[error]),
+            )
+            return SimpleNamespace(id=batch_id)
+
+        lines = []
+        for request in requests:
+            text = request['body']['input']
+            if text in self.fail_once:
+                self.fail_once.discard(text)
+                response = {'status_code': 500, 'body': {'error': {'message': 'server error'}}}
+            else:
+                body = {'output': [{'type': 'message', 'content': [{'type': 'output_text', 'text': text}]}]}
+                response = {'status_code': 200, 'body': body}
+            lines.append(json.dumps({'custom_id': request['custom_id'], 'response': response}))
+        output_file_id = f'file-{len(self.file_contents)}'
+        self.file_contents[output_file_id] = lines
+        self.batch_store[batch_id] = SimpleNamespace(
+            id=batch_id, status='completed', request_counts=None,
+            output_file_id=output_file_id, error_file_id=None, errors=None,
+        )
+        return SimpleNamespace(id=batch_id)
+
+    @contextlib.contextmanager
+    def content(self, file_id):
+        yield SimpleNamespace(iter_lines=lambda: iter(self.file_contents[file_id]))
+
+
+@pytest.fixture
+def client():
+    return FakeBatchClient(fail_once={'b'})
+
+
+def run(client, inputs, tmp_path, **kwargs):
+    pipeline = BatchPipeline(tmp_path / 'work', poll_interval=0, client=client, **kwargs)
+    output = io.StringIO()
+    ok, failed = pipeline.run(inputs, output)
+    return (ok, failed), [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_duplicate_ids_are_submitted_with_unique_custom_ids(client, tmp_path):
+    inputs = [{'id': 'user-1', 'input': 'a'}, {'id': 'user-1', 'input': 'b'}, 'c']
+    counts, records = run(client, inputs, tmp_path)
+
+    custom_ids = [request['custom_id'] for request in client.submitted[0]]
+    assert len(set(custom_ids)) == 3
+    assert counts == (3, 0)
+    assert [(r['index'], r['id'], r['output_text']) for r in records] == [
+        (0, 'user-1', 'a'),
+        (1, 'user-1', 'b'),  # 두 번째 라운드에서 다시 제출해서 성공
+        (2, None, 'c'),
+    ]
+
+
+def test_retry_round_only_resubmits_failed_requests(client, tmp_path):
+    run(client, ['a', 'b', 'c'], tmp_path)
+    assert [request['body']['input'] for request in client.submitted[1]] == ['b']
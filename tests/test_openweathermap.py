@@ -0,0 +1,82 @@
+import pytest
+
+from openweathermap import WEATHER_CACHE_TTL, WeatherDashboard
+from response_cache import ResponseCache
+
+
+def weather(city_id, temp):
+    return {'id': city_id, 'main': {'temp': temp}}
+
+
+class FakeDashboard(WeatherDashboard):
+    """API 호출을 기록하고 정해진 값을 돌려주는 대시보드"""
+
+    def __init__(self, cache, geocoder='openweathermap', ids=None):
+        super().__init__(response_cache=cache, geocoder=geocoder)
+        self.ids = ids or {}
+        self.calls = []
+
+    def fetch_location(self, city):
+        self.calls.append(('geo', self.geocoder, city))
+        offset = 0 if self.geocoder == 'openweathermap' else 100
+        return {'lat': offset + len(city), 'lon': 0.0}
+
+    def fetch_weather(self, params):
+        self.calls.append(('weather', params['q']))
+        data = weather(self.ids.get(params['q']), 1)
+        self.get_cache().set('weather', params, data, WEATHER_CACHE_TTL)
+        return data
+
+    def get_weather_group(self, city_ids):
+        self.calls.append(('group', tuple(city_ids)))
+        return {city_id: weather(city_id, 2) for city_id in city_ids}
+
+    def get_weather_by_location(self, city, location):
+        self.calls.append(('location', city))
+        city_id = self.ids.get(city)
+        self.save_location(city, {**location, 'id': city_id})
+        return weather(city_id, 3)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(tmp_path / 'responses.sqlite3')
+
+
+def test_geocode_cache_is_per_geocoder(cache):
+    owm = FakeDashboard(cache, geocoder='openweathermap')
+    kakao = FakeDashboard(cache, geocoder='kakao')
+
+    assert owm.geocode('Seoul') == {'lat': 5, 'lon': 0.0}
+    assert kakao.geocode('Seoul') == {'lat': 105, 'lon': 0.0}
+    assert FakeDashboard(cache, geocoder='openweathermap').geocode('Seoul') == {'lat': 5, 'lon': 0.0}
+    assert [call for call in owm.calls + kakao.calls if call[0] == 'geo'] == [
+        ('geo', 'openweathermap', 'Seoul'), ('geo', 'kakao', 'Seoul'),
+    ]
+
+
+def test_bulk_results_populate_weather_cache(cache):
+    dashboard = FakeDashboard(cache, ids={'Seoul': 1, 'Busan': 2})
+    results = dashboard.get_weather_bulk(['Seoul', 'Busan'])
+    assert [data['main']['temp'] for data in results] == [3, 3]
+
+    # 단건 조회는 bulk가 저장한 캐시를 사용
+    dashboard.calls.clear()
+    assert dashboard.get_weather('Seoul') == results[0]
+    assert dashboard.calls == []
+
+
+def test_bulk_uses_cached_weather_and_groups_known_ids(cache):
+    dashboard = FakeDashboard(cache, ids={'Seoul': 1, 'Busan': 2, 'Jeju': 3})
+    dashboard.get_weather_bulk(['Busan'])  # Busan의 도시 ID를 기록
+    cache.clear('weather')
+    dashboard.get_weather('Seoul')  # 단건 조회 결과가 캐시에 있음
+
+    dashboard.calls.clear()
+    results = dashboard.get_weather_bulk(['Seoul', 'Busan', 'Jeju'])
+
+    assert results[0]['main']['temp'] == 1  # 캐시
+    assert results[1]['main']['temp'] == 2  # group
+    assert results[2]['main']['temp'] == 3  # 좌표
+    assert ('weather', 'Seoul') not in dashboard.calls
+    assert ('group', (2,)) in dashboard.calls
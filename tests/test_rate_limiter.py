@@ -0,0 +1,153 @@
+import asyncio
+import email.utils
+from types import SimpleNamespace
+
+import pytest
+
+import rate_limiter
+from rate_limiter import RateLimiter, retry_after_seconds
+
+
+class FakeClock:
+    """time.monotonic/time/sleep를 대신하는 가짜 시계 (sleep하면 시간이 흐름)"""
+
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, 'time', clock)
+    return clock
+
+
+def response(status_code=200, **headers):
+    return SimpleNamespace(status_code=status_code, headers={k.replace('_', '-'): v for k, v in headers.items()})
+
+
+def test_burst_then_refill_at_rate(clock):
+    limiter = RateLimiter(limit=10, window=1, burst=2)
+
+    assert limiter.try_acquire() == 0
+    assert limiter.try_acquire() == 0
+    assert limiter.try_acquire() == pytest.approx(0.1)
+
+    clock.advance(0.11)
+    assert limiter.try_acquire() == 0
+
+
+def test_acquire_sleeps_until_token_is_available(clock):
+    limiter = RateLimiter(limit=2, window=1, burst=1)
+    limiter.acquire()
+    limiter.acquire()
+
+    assert sum(clock.slept) == pytest.approx(0.5)
+    assert limiter.stats()['waits'] == 1
+
+
+def test_cost_is_capped_at_burst_and_refund(clock):
+    limiter = RateLimiter(limit=10, window=1, burst=5)
+
+    assert limiter.try_acquire(cost=100) == 0
+    assert limiter.tokens == 0
+    limiter.refund(3)
+    assert limiter.tokens == 3
+
+
+def test_headers_spread_remaining_until_reset(clock):
+    limiter = RateLimiter(limit=5000, window=3600, burst=20)
+    limiter.update(response(X_RateLimit_Remaining='100', X_RateLimit_Reset=str(int(clock.now) + 200)))
+
+    assert limiter.rate == pytest.approx(0.5)
+    assert limiter.remaining == 100
+
+
+def test_exhausted_limit_blocks_until_reset(clock):
+    limiter = RateLimiter(limit=5000, window=3600, burst=20)
+    reset = int(clock.now) + 30
+    limiter.update(response(403, X_RateLimit_Remaining='0', X_RateLimit_Reset=str(reset)))
+
+    assert limiter.try_acquire() == pytest.approx(30)
+    clock.advance(30)
+    # 초기화 시각이 지나면 기본 속도로 다시 시작
+    assert limiter.rate == 0
+    limiter._refill(clock.now + 1)
+    assert limiter.rate == limiter.default_rate
+
+
+def test_retry_after_seconds_blocks(clock):
+    limiter = RateLimiter(limit=100, window=1, burst=5)
+    rejected = response(429, Retry_After='7')
+    limiter.update(rejected)
+
+    assert limiter.should_retry(rejected)
+    assert limiter.try_acquire() == pytest.approx(7)
+
+
+def test_retry_after_http_date_blocks(clock):
+    limiter = RateLimiter(limit=100, window=1, burst=5)
+    retry_at = email.utils.formatdate(clock.now + 12, usegmt=True)
+    limiter.update(response(429, Retry_After=retry_at))
+
+    assert limiter.try_acquire() == pytest.approx(12, abs=1)
+
+
+def test_unparseable_retry_after_falls_back_to_reset(clock):
+    limiter = RateLimiter(limit=100, window=1, burst=5)
+    reset = int(clock.now) + 40
+    limiter.update(response(403, Retry_After='soon', X_RateLimit_Remaining='3', X_RateLimit_Reset=str(reset)))
+
+    assert limiter.try_acquire() == pytest.approx(40)
+
+
+def test_retry_after_ignored_on_success(clock):
+    limiter = RateLimiter(limit=100, window=1, burst=5)
+    ok = response(200, Retry_After='60')
+    limiter.update(ok)
+
+    assert not limiter.should_retry(ok)
+    assert limiter.try_acquire() == 0
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('5', 5.0),
+    ('0.5', 0.5),
+    ('-3', 0.0),
+    ('Wed, 21 Oct 2015 07:28:00 GMT', 10.0),
+    ('Wed, 21 Oct 2015 07:28:00 -0000', 10.0),
+    ('not a date', None),
+    ('', None),
+])
+def test_retry_after_seconds(value, expected):
+    now = email.utils.parsedate_to_datetime('Wed, 21 Oct 2015 07:27:50 GMT').timestamp()
+    assert retry_after_seconds(value, now) == expected
+
+
+def test_acquire_async_waits(clock, monkeypatch):
+    async def fake_sleep(seconds):
+        clock.advance(seconds)
+
+    monkeypatch.setattr(rate_limiter.asyncio, 'sleep', fake_sleep)
+    limiter = RateLimiter(limit=4, window=1, burst=1)
+
+    async def run():
+        await limiter.acquire_async()
+        await limiter.acquire_async()
+
+    asyncio.run(run())
+    assert clock.now == pytest.approx(1_700_000_000.25)
@@ -0,0 +1,70 @@
+import pytest
+
+import response_cache
+from response_cache import ResponseCache, make_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(tmp_path / 'responses.sqlite3', max_entries=5)
+
+
+def test_make_key_ignores_order_whitespace_and_api_key():
+    assert make_key('weather', {'q': ' Seoul ', 'units': 'metric', 'appid': 'a'}) == \
+        make_key('weather', {'units': 'metric', 'q': 'seoul', 'appid': 'b'})
+
+
+def test_make_key_keeps_case_of_case_sensitive_params():
+    assert make_key('geocode', {'query': 'ABC'}) != make_key('geocode', {'query': 'abc'})
+    assert make_key('weather', {'id': 'Ab'}) != make_key('weather', {'id': 'ab'})
+    assert make_key('weather', {'q': 'SEOUL'}) == make_key('weather', {'q': 'seoul'})
+
+
+def test_set_get_and_expiry(cache, monkeypatch):
+    cache.set('weather', {'q': 'Seoul'}, {'temp': 1}, ttl=60)
+    assert cache.get('weather', {'q': 'seoul'}) == {'temp': 1}
+
+    now = response_cache.time.time()
+    monkeypatch.setattr(response_cache.time, 'time', lambda: now + 61)
+    assert cache.get('weather', {'q': 'seoul'}) is None
+
+
+def test_evict_keeps_most_recent_entries(cache):
+    for i in range(12):
+        cache.set('n', {'i': i}, i, ttl=60)
+    cache.evict()
+
+    kept = [i for i in range(12) if cache.get('n', {'i': i}) is not None]
+    assert kept == list(range(7, 12))
+
+
+def test_replaced_entry_counts_as_recent(cache):
+    for i in range(5):
+        cache.set('n', {'i': i}, i, ttl=60)
+    cache.set('n', {'i': 0}, 'again', ttl=60)
+    cache.set('n', {'i': 5}, 5, ttl=60)
+    cache.evict()
+
+    assert cache.get('n', {'i': 0}) == 'again'
+    assert cache.get('n', {'i': 1}) is None
+    assert cache.stats()['entries'] == 5
+
+
+def test_evict_drops_expired_entries(cache):
+    cache.set('n', {'i': 1}, 1, ttl=-1)
+    cache.set('n', {'i': 2}, 2, ttl=60)
+    cache.evict()
+
+    assert cache.stats()['entries'] == 1
+
+
+def test_evict_does_not_count_rows(cache):
+    for i in range(10):
+        cache.set('n', {'i': i}, i, ttl=60)
+    statements = []
+    conn = cache._connect()
+    conn.set_trace_callback(statements.append)
+    cache.evict()
+    conn.set_trace_callback(None)
+
+    assert not any('COUNT' in statement.upper() for statement in statements)
@@ -0,0 +1,51 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import gemini_chat
+import stream_server
+
+
+@pytest.fixture
+def client():
+    return TestClient(stream_server.app)
+
+
+@pytest.mark.parametrize('body', [
+    {'messages': [{'role': 'user'}]},
+    {'messages': [{'content': '안녕!'}]},
+    {'messages': ['안녕!']},
+    {'messages': '안녕!'},
+    {},
+])
+def test_malformed_messages_are_rejected(client, body):
+    response = client.post('/chat/gemini/stream', json=body)
+    assert response.status_code == 422
+
+
+def test_empty_messages(client):
+    response = client.post('/chat/gemini/stream', json={'messages': []})
+    assert response.status_code == 400
+
+
+def test_gemini_chat_stream(client, monkeypatch):
+    created = []
+
+    def create_chat(history):
+        created.append(history)
+        return object()
+
+    monkeypatch.setattr(gemini_chat, 'create_chat', create_chat)
+    monkeypatch.setattr(gemini_chat, 'stream_message', lambda chat, message: iter([f'reply to {message}']))
+
+    response = client.post('/chat/gemini/stream', json={'messages': [
+        {'role': 'user', 'content': '나는 파이썬 개발자야.'},
+        {'role': 'assistant', 'content': '반가워요!'},
+        {'role': 'user', 'content': '내가 누구라고 했지?'},
+    ]})
+
+    assert response.status_code == 200
+    assert 'reply to 내가 누구라고 했지?' in response.text
+    assert created == [[
+        {'role': 'user', 'content': '나는 파이썬 개발자야.'},
+        {'role': 'assistant', 'content': '반가워요!'},
+    ]]
@@ -0,0 +1,182 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import ttl_cache
+from ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def wait_for_refresh(cache, timeout=5):
+    """백그라운드 갱신 스레드가 끝날 때까지 대기"""
+    deadline = time.monotonic() + timeout
+    while cache._refreshing and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert not cache._refreshing
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ttl_cache, 'time', clock)
+    return clock
+
+
+def test_entry_is_fresh_until_ttl_then_stale(clock):
+    cache = TTLCache(default_ttl=10, max_stale=100)
+    cache.set('a', 1)
+
+    assert cache.lookup('a') == (1, True)
+    clock.advance(11)
+    assert cache.lookup('a') == (1, False)
+
+
+def test_expires_at_overrides_default_ttl(clock):
+    cache = TTLCache(default_ttl=10, max_stale=0)
+    cache.set('a', 1, expires_at=clock.now + 100)
+
+    clock.advance(50)
+    assert cache.lookup('a') == (1, True)
+
+
+def test_max_stale_cutoff_drops_entry(clock):
+    cache = TTLCache(default_ttl=10, max_stale=5)
+    cache.set('a', 1)
+
+    clock.advance(15)
+    assert cache.lookup('a') == (1, False)
+    clock.advance(1)
+    assert cache.lookup('a') == (None, False)
+    assert len(cache) == 0
+
+
+def test_max_stale_cutoff_loads_synchronously(clock):
+    cache = TTLCache(default_ttl=10, max_stale=5)
+    cache.set('a', 'old')
+    clock.advance(16)
+
+    assert cache.get_or_load('a', lambda: ('new', None)) == 'new'
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['stale_hits'] == 0
+
+
+def test_lru_eviction_at_maxsize(clock):
+    cache = TTLCache(maxsize=2, default_ttl=10)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.lookup('a')  # a를 최근 사용으로
+    cache.set('c', 3)
+
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+    assert len(cache) == 2
+
+
+def test_miss_calls_loader_and_none_is_not_cached(clock):
+    cache = TTLCache(default_ttl=10)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return None, None
+
+    assert cache.get_or_load('a', load) is None
+    assert cache.get_or_load('a', load) is None
+    assert len(calls) == 2
+
+
+def test_stale_hit_starts_exactly_one_background_refresh(clock):
+    cache = TTLCache(default_ttl=10, max_stale=100)
+    cache.set('a', 'old')
+    clock.advance(11)
+
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        release.wait(5)
+        return 'new', clock.now + 10
+
+    results = [cache.get_or_load('a', load) for _ in range(5)]
+    assert results == ['old'] * 5
+
+    release.set()
+    wait_for_refresh(cache)
+
+    assert len(calls) == 1
+    assert cache.lookup('a') == ('new', True)
+    assert cache.stats()['stale_hits'] == 5
+    assert cache.stats()['refreshes'] == 1
+
+
+def test_refresh_failure_keeps_stale_value(clock, capsys):
+    cache = TTLCache(default_ttl=10, max_stale=100)
+    cache.set('a', 'old')
+    clock.advance(11)
+
+    def load():
+        raise RuntimeError('upstream down')
+
+    assert cache.get_or_load('a', load) == 'old'
+    wait_for_refresh(cache)
+
+    assert cache.lookup('a') == ('old', False)
+    assert cache.stats()['refresh_failures'] == 1
+    assert 'upstream down' in capsys.readouterr().out
+    # 실패한 뒤에는 다음 stale 조회에서 다시 갱신할 수 있어야 함
+    assert cache._start_refresh('a')
+
+
+def test_async_stale_hit_refreshes_once(clock):
+    cache = TTLCache(default_ttl=10, max_stale=100)
+    cache.set('a', 'old')
+    clock.advance(11)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return 'new', clock.now + 10
+
+    async def run():
+        results = await asyncio.gather(*(cache.aget_or_load('a', load) for _ in range(5)))
+        await asyncio.gather(*cache._tasks)
+        return results
+
+    assert asyncio.run(run()) == ['old'] * 5
+    assert len(calls) == 1
+    assert cache.lookup('a') == ('new', True)
+
+
+def test_async_refresh_failure_is_handled(clock, capsys):
+    cache = TTLCache(default_ttl=10, max_stale=100)
+    cache.set('a', 'old')
+    clock.advance(11)
+
+    async def load():
+        raise RuntimeError('upstream down')
+
+    async def run():
+        value = await cache.aget_or_load('a', load)
+        results = await asyncio.gather(*cache._tasks, return_exceptions=True)
+        return value, results
+
+    value, results = asyncio.run(run())
+    assert value == 'old'
+    assert results == [None]
+    assert cache.stats()['refresh_failures'] == 1
+    assert cache.lookup('a') == ('old', False)